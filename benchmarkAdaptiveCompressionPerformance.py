@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+import Tee_Logger
+import os
+import shutil
+import tempfile
+import time
+
+RECORDS = 200000
+LEVEL = 6
+
+logDir = tempfile.mkdtemp(prefix='adaptive_compression_benchmark_')
+results = []
+for compression in ('xz', 'gzip'):
+	for budget in (0, 0.5, 0.25, 0.1):
+		tl = Tee_Logger.teeLogger(programName=f'adaptive_{compression}_{budget}', systemLogFileDir=logDir,
+			suppressPrintout=True, in_place_compression=compression, compression_level=LEVEL,
+			compression_cpu_budget=budget, flush_every_n_records=1000, frame_every_n_bytes=256 * 1024)
+		fileHandler = tl.logHandler
+		startTime = time.perf_counter()
+		for i in range(RECORDS):
+			tl.info(f'adaptive compression benchmark record {i} status=ok latency={i % 97}ms')
+		elapsedTime = time.perf_counter() - startTime
+		finalLevel = getattr(fileHandler, fileHandler.level_attr)
+		tl.close()
+		results.append([compression, budget or 'fixed', f'{RECORDS / elapsedTime:.0f}',
+			f'{os.path.getsize(tl.logFileName) / RECORDS:.2f}', finalLevel])
+
+print(Tee_Logger.pretty_format_table(results, header=['compression', 'cpu budget', 'records/s', 'bytes/record', 'final level']))
+shutil.rmtree(logDir, ignore_errors=True)
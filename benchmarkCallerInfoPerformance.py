@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+import Tee_Logger
+import inspect
+import os
+import time
+
+CALLS = 200000
+
+def legacy_getCallerInfo(i=-1):
+	# getCallerInfo as it was before the per-code-object cache
+	frame = None
+	try:
+		if i < 0:
+			frame = inspect.currentframe()
+			if frame is not None:
+				frame = frame.f_back
+			while frame and os.path.abspath(frame.f_code.co_filename) == Tee_Logger._TEE_LOGGER_FILE:
+				frame = frame.f_back
+		else:
+			frame = inspect.currentframe()
+			for _ in range(i):
+				if frame is None or frame.f_back is None:
+					break
+				frame = frame.f_back
+		if frame is None:
+			return 'unknown', 0
+		filename = os.path.basename(frame.f_code.co_filename)
+		lineno = frame.f_lineno
+	finally:
+		del frame
+	return filename, lineno
+
+def legacy_label(i):
+	filename, lineno = legacy_getCallerInfo(i)
+	return Tee_Logger.abbreviate_filename(filename, lineno, target_length=15)
+
+def new_label(i):
+	return Tee_Logger.getCallerFileLocation(i, target_length=15)
+
+def nested(depth, func, i):
+	if depth > 0:
+		return nested(depth - 1, func, i)
+	startTime = time.perf_counter_ns()
+	for _ in range(CALLS):
+		func(i)
+	return (time.perf_counter_ns() - startTime) / CALLS
+
+results = []
+for depth in (1, 2, 4, 8, 16):
+	for mode, i in (('auto', -1), ('explicit', depth)):
+		legacy_ns = nested(depth, legacy_label, i)
+		new_ns = nested(depth, new_label, i)
+		results.append([depth, mode, f'{legacy_ns:.0f}', f'{new_ns:.0f}', f'{legacy_ns / new_ns:.2f}x'])
+
+print(Tee_Logger.pretty_format_table(results, header=['call depth', 'mode', 'legacy ns/call', 'new ns/call', 'speedup']))
+
+tl = Tee_Logger.teeLogger(programName="caller_info_benchmark", suppressPrintout=True)
+startTime = time.perf_counter_ns()
+for _ in range(CALLS):
+	tl.info('caller resolution benchmark')
+elapsedTime = time.perf_counter_ns() - startTime
+print(f"teeLogger.info: {elapsedTime / CALLS:.0f} ns/call")
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+import Tee_Logger
+import io
+import os
+import sys
+import time
+
+CALLS = 100000
+
+def run(console_refresh_ms, repeated):
+	tl = Tee_Logger.teeLogger(programName='console_benchmark', noLog=True, suppressPrintout=False,
+		console_refresh_ms=console_refresh_ms)
+	startTime = time.perf_counter_ns()
+	for i in range(CALLS):
+		tl.teeprint('progress update' if repeated else f'progress update {i}')
+	tl.close()
+	return (time.perf_counter_ns() - startTime) / CALLS
+
+# a line-buffered stdout, as on a TTY, that discards what it is given
+realStdout = sys.stdout
+sys.stdout = io.TextIOWrapper(open(os.devnull, 'wb'), encoding='utf-8', line_buffering=True)
+results = []
+for repeated in (False, True):
+	printNs = run(0, repeated)
+	sinkNs = run(100, repeated)
+	results.append(['repeated' if repeated else 'unique', f'{printNs:.0f}', f'{sinkNs:.0f}', f'{printNs / sinkNs:.2f}x'])
+sys.stdout.close()
+sys.stdout = realStdout
+
+print(Tee_Logger.pretty_format_table(results, header=['lines', 'print ns/call', 'console_refresh_ms=100 ns/call', 'speedup']))
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+import Tee_Logger
+import os
+import shutil
+import tempfile
+import time
+
+CALLS = 200000
+
+logDir = tempfile.mkdtemp(prefix='fast_path_benchmark_')
+configs = {
+	'plain': {},
+	'gzip': {'in_place_compression': 'gzip', 'flush_every_n_records': 1000},
+	'async': {'async_mode': True},
+}
+
+results = []
+for configName, config in configs.items():
+	row = [configName]
+	for fast_path in (False, True):
+		tl = Tee_Logger.teeLogger(programName=f'fast_path_{configName}_{fast_path}', systemLogFileDir=logDir,
+			suppressPrintout=True, fast_path=fast_path, **config)
+		startTime = time.perf_counter_ns()
+		for i in range(CALLS):
+			tl.info('fast path benchmark message')
+		elapsedTime = time.perf_counter_ns() - startTime
+		tl.close()
+		row.append(f'{elapsedTime / CALLS:.0f}')
+	row.append(f'{float(row[1]) / float(row[2]):.2f}x')
+	results.append(row)
+
+print(Tee_Logger.pretty_format_table(results, header=['config', 'logging ns/call', 'fast_path ns/call', 'speedup']))
+shutil.rmtree(logDir, ignore_errors=True)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import Tee_Logger
+import logging
+import os
+import random
+import time
+
+RECORD_COUNT = 100000
+
+def almost_urandom(n):
+	try:
+		return random.getrandbits(8 * n).to_bytes(n, 'big')
+	except OverflowError:
+		return almost_urandom(n // 2) + almost_urandom(n - n // 2)
+
+random_datas = [almost_urandom(100) for _ in range(1000)]
+
+backends = [None, 'gzip', 'bz2', 'xz']
+try:
+	from compression import zstd
+	backends.append('zstd')
+except ImportError:
+	pass
+
+policies = {
+	'per_record': {'flush_every_n_records': 1},
+	'every_1000': {'flush_every_n_records': 1000},
+	'interval_1000ms': {'flush_every_n_records': 0, 'flush_interval_ms': 1000},
+	'on_warning_only': {'flush_every_n_records': 0, 'flush_on_level': logging.WARNING},
+}
+
+def benchmark(tl):
+	startTime = time.monotonic_ns()
+	for i in range(RECORD_COUNT):
+		tl.info(random.choice(random_datas))
+	tl.close()
+	return time.monotonic_ns() - startTime
+
+results = []
+for backend in backends:
+	for policyName, policy in policies.items():
+		programName = f"flush_{backend or 'plain'}_{policyName}"
+		tl = Tee_Logger.teeLogger(programName=programName, in_place_compression=backend, suppressPrintout=True, **policy)
+		elapsedTime = benchmark(tl)
+		fileSize = os.path.getsize(tl.logFileName)
+		results.append([backend or 'none', policyName, f'{elapsedTime / 1_000_000_000:.2f}', f'{elapsedTime / RECORD_COUNT:.0f}', fileSize])
+		print(f"{backend or 'none'} / {policyName}: {elapsedTime / 1_000_000_000:.2f} seconds")
+
+print(Tee_Logger.pretty_format_table(results, header=['backend', 'policy', 'seconds', 'ns/record', 'file bytes']))
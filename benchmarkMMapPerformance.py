@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+import Tee_Logger
+import os
+import shutil
+import tempfile
+import time
+
+RECORD_COUNT = 200000
+MESSAGE = 'mmap benchmark record ' + 'x' * 150
+
+logDir = tempfile.mkdtemp(prefix='mmap_benchmark_')
+configs = {
+	'buffered': {},
+	'buffered_every_1000': {'flush_every_n_records': 1000},
+	'mmap_16MiB': {'mmap_extent_bytes': 16 * 1024 * 1024},
+	'mmap_64MiB': {'mmap_extent_bytes': 64 * 1024 * 1024},
+}
+
+batch = [MESSAGE] * 1000
+
+results = []
+for configName, config in configs.items():
+	for mode in ('info', 'info_many'):
+		tl = Tee_Logger.teeLogger(programName=f'mmap_{configName}_{mode}', systemLogFileDir=logDir, suppressPrintout=True,
+			fast_path=True, **config)
+		startTime = time.perf_counter()
+		if mode == 'info':
+			for _ in range(RECORD_COUNT):
+				tl.info(MESSAGE)
+		else:
+			for _ in range(RECORD_COUNT // len(batch)):
+				tl.info_many(batch)
+		tl.close()
+		elapsedTime = time.perf_counter() - startTime
+		size = os.path.getsize(tl.logFileName)
+		results.append([configName, mode, f'{elapsedTime:.2f}', f'{size / elapsedTime / 1024 / 1024:.1f}', f'{elapsedTime / RECORD_COUNT * 1e9:.0f}'])
+
+print(Tee_Logger.pretty_format_table(results, header=['writer', 'api', 'seconds', 'MiB/s', 'ns/record']))
+shutil.rmtree(logDir, ignore_errors=True)
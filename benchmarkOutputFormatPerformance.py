@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+import Tee_Logger
+import os
+import shutil
+import tempfile
+import time
+
+CALLS = 200000
+
+logDir = tempfile.mkdtemp(prefix='output_format_benchmark_')
+results = []
+for output_format in ('text', 'jsonl', 'binary'):
+	row = [output_format]
+	for fast_path in (False, True):
+		tl = Tee_Logger.teeLogger(programName=f'output_format_{output_format}_{fast_path}', systemLogFileDir=logDir,
+			suppressPrintout=True, output_format=output_format, fast_path=fast_path)
+		startTime = time.perf_counter_ns()
+		for i in range(CALLS):
+			tl.info('output format benchmark message')
+		elapsedTime = time.perf_counter_ns() - startTime
+		tl.close()
+		row.append(f'{elapsedTime / CALLS:.0f}')
+	row.append(f'{os.path.getsize(tl.logFileName) / CALLS:.1f}')
+	results.append(row)
+
+print(Tee_Logger.pretty_format_table(results, header=['output_format', 'logging ns/call', 'fast_path ns/call', 'bytes/record']))
+shutil.rmtree(logDir, ignore_errors=True)
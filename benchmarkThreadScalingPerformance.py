@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+import Tee_Logger
+import shutil
+import tempfile
+import threading
+import time
+
+RECORDS = 64000
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32)
+
+def run(logDir, compression, threads, thread_buffer_records):
+	tl = Tee_Logger.teeLogger(programName=f'thread_scaling_{compression}_{threads}_{thread_buffer_records}', systemLogFileDir=logDir,
+		suppressPrintout=True, in_place_compression=compression, thread_buffer_records=thread_buffer_records)
+	perThread = RECORDS // threads
+	def worker():
+		for i in range(perThread):
+			tl.info('thread scaling benchmark message')
+	workers = [threading.Thread(target=worker) for _ in range(threads)]
+	startTime = time.perf_counter()
+	for t in workers:
+		t.start()
+	for t in workers:
+		t.join()
+	tl.close()
+	return perThread * threads / (time.perf_counter() - startTime)
+
+backends = [None, 'gzip', 'bz2', 'xz']
+try:
+	from compression import zstd
+	backends.append('zstd')
+except ImportError:
+	pass
+
+logDir = tempfile.mkdtemp(prefix='thread_scaling_benchmark_')
+results = []
+for compression in backends:
+	for threads in THREAD_COUNTS:
+		locked = run(logDir, compression, threads, 0)
+		buffered = run(logDir, compression, threads, 256)
+		results.append([compression or 'none', threads, f'{locked:.0f}', f'{buffered:.0f}', f'{buffered / locked:.2f}x'])
+
+print(Tee_Logger.pretty_format_table(results, header=['compression', 'threads', 'handler lock records/s', 'thread_buffer records/s', 'speedup']))
+shutil.rmtree(logDir, ignore_errors=True)
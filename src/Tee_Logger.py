@@ -22,22 +22,42 @@ Run doctests::
 See Also:
     README.md for installation, log layout, and maintenance policy.
 """
+import asyncio
+import atexit
 import datetime
 import os
 import logging
-import inspect
 import re
 import base64
+import json
+import io
+import codecs
+import contextlib
 import math
-import functools
+import mmap
+import collections
 import shutil
 import tarfile
 import subprocess
 import sys
+import time
+import queue
+import threading
+import socket
+import struct
+import hashlib
+import inspect
+import itertools
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 try:
     import dateutil.parser
 except ImportError:
     pass
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 version = '6.40'
 __version__ = version
@@ -62,7 +82,81 @@ class bcolors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
-@functools.lru_cache(maxsize=128)
+# printWithColor level -> color; unknown levels use bcolors.info
+_LEVEL_COLORS = {
+    'info': bcolors.info,
+    'debug': bcolors.debug,
+    'warning': bcolors.warning,
+    'error': bcolors.warning,
+    'critical': bcolors.critical,
+    'ok': bcolors.OKGREEN,
+    'okgreen': bcolors.OKGREEN,
+    'okblue': bcolors.OKBLUE,
+    'okcyan': bcolors.OKCYAN,
+}
+
+_CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+_ABBREVIATED_NAME_CACHE = {}
+_ABBREVIATED_NAME_CACHE_MAXSIZE = 65536
+_abbreviated_name_cache_stats = [0, 0]  # hits, misses
+
+def _abbreviate_last_word(name):
+    # Split the filename into parts by delimiters and camel case
+    parts = re.split(r'([A-Z][a-z]*|[_\- ])', name)
+    # Filter out empty parts and captialize the first letter of each part
+    parts = [part.capitalize()  for part in parts if part and part not in '_- ']
+    # Find the last non-abbreviated word
+    for i in range(len(parts) - 1, -1, -1):
+        if parts[i].isalnum() and not parts[i].isupper():
+            parts[i] = parts[i][0].upper()
+            return ''.join(parts)
+    # If no non-abbreviated word is found, we remove the last part
+    return ''.join(parts[:-1])
+
+def _int_to_base64(n):
+    # Determine the number of bytes needed to represent the integer
+    num_bytes = (n.bit_length() + 7) // 8
+    # Convert the integer to bytes
+    byte_array = n.to_bytes(num_bytes, byteorder='big')
+    # Encode the bytes using base64
+    b64_encoded = base64.b64encode(byte_array)
+    # Convert the base64 bytes to a string and return it
+    return b64_encoded.decode('ascii')
+
+def _shorten_line_number(lineNumber,target_length=5):
+    lineNumberStr = str(lineNumber)
+    if len(lineNumberStr) <= target_length:
+        return lineNumberStr
+    # we will try to use hex number to represent the line number first
+    newLineNumber = hex(lineNumber)
+    if len(newLineNumber) <= target_length:
+        return newLineNumber
+    newLineNumber = newLineNumber[1:] # remove the 0
+    if len(newLineNumber) <= target_length:
+        return newLineNumber
+    newLineNumber = _int_to_base64(lineNumber)
+    if len(newLineNumber) <= target_length:
+        return newLineNumber
+    # if all else fails, we will use scientific notation
+    # find the exponent
+    exp = math.floor(math.log10(lineNumber))
+    # produce the scientific notation with highest precision available for the target length
+    availble_mantissa_length = target_length - 4 - len(str(exp))
+    if availble_mantissa_length >= 0:
+        return f'{lineNumber:.{availble_mantissa_length}e}'
+    else:
+        # return the exponent with the maximum availble length
+        return f'e{exp}'[:target_length]
+
+def _abbreviate_name(filename, fileNameMaxLen):
+    # Remove all extensions from the filename
+    filename = re.sub(r'\.[^.]*$', '', filename)
+    # Continue abbreviating until the filename is under the max length
+    while len(filename) > fileNameMaxLen:
+        filename = _abbreviate_last_word(filename)
+    # Truncate the filename if it is still too long
+    return filename[:fileNameMaxLen]
+
 def abbreviate_filename(filename,lineNumber, target_length=15):
     """Return a fixed-width ``filename:line`` label for log records.
 
@@ -70,6 +164,13 @@ def abbreviate_filename(filename,lineNumber, target_length=15):
     characters using camel-case abbreviation, hex, base64, or scientific
     notation as needed.
 
+    The expensive file name abbreviation is cached per ``(filename, width)``
+    so the cost after warm-up does not grow with the number of call sites;
+    only the cheap line-number suffix is formatted per call. The cache holds
+    up to ``_ABBREVIATED_NAME_CACHE_MAXSIZE`` names and is reset when full.
+    ``abbreviate_filename.cache_info()`` reports hits and misses and
+    ``abbreviate_filename.cache_clear()`` resets it.
+
     Args:
         filename: Source file name (extension is stripped).
         lineNumber: Line number in that file.
@@ -83,65 +184,39 @@ def abbreviate_filename(filename,lineNumber, target_length=15):
         'MyLongMN:42    '
         >>> abbreviate_filename('Tee_Logger.py', 357, 15)
         'Tee_Logger:357 '
+        >>> abbreviate_filename.cache_info().currsize > 0
+        True
     """
-    # Remove all extensions from the filename
-    filename = re.sub(r'\.[^.]*$', '', filename)
-    def abbreviate_last_word(name):
-        # Split the filename into parts by delimiters and camel case
-        parts = re.split(r'([A-Z][a-z]*|[_\- ])', name)
-        # Filter out empty parts and captialize the first letter of each part
-        parts = [part.capitalize()  for part in parts if part and part not in '_- ']
-        # Find the last non-abbreviated word
-        for i in range(len(parts) - 1, -1, -1):
-            if parts[i].isalnum() and not parts[i].isupper():
-                parts[i] = parts[i][0].upper()
-                return ''.join(parts)
-        # If no non-abbreviated word is found, we remove the last part
-        return ''.join(parts[:-1])
-    def shorten_line_number(lineNumber,target_length=5):
-        if len(str(lineNumber)) <= target_length:
-            return str(lineNumber)
-        # we will try to use hex number to represent the line number first
-        newLineNumber = hex(lineNumber)
-        if len(newLineNumber) <= target_length:
-            return newLineNumber
-        newLineNumber = newLineNumber[1:] # remove the 0
-        if len(newLineNumber) <= target_length:
-            return newLineNumber
-        newLineNumber = int_to_base64(lineNumber)
-        if len(newLineNumber) <= target_length:
-            return newLineNumber
-        # if all else fails, we will use scientific notation
-        # find the exponent
-        exp = math.floor(math.log10(lineNumber))
-        # produce the scientific notation with highest precision available for the target length
-        availble_mantissa_length = target_length - 4 - len(str(exp))
-        if availble_mantissa_length >= 0:
-            return f'{lineNumber:.{availble_mantissa_length}e}'
-        else:
-            # return the exponent with the maximum availble length
-            return f'e{exp}'[:target_length]
-    def int_to_base64(n):
-        # Determine the number of bytes needed to represent the integer
-        num_bytes = (n.bit_length() + 7) // 8
-        # Convert the integer to bytes
-        byte_array = n.to_bytes(num_bytes, byteorder='big')
-        # Encode the bytes using base64
-        b64_encoded = base64.b64encode(byte_array)
-        # Convert the base64 bytes to a string and return it
-        return b64_encoded.decode('ascii')
+    lineNumber = int(lineNumber)
     # if the lineNumber length is greater than half of the max_length, we shorten the line number as well
-    lineNumberStr = shorten_line_number(int(lineNumber), target_length=target_length//2)
-    fileNameMaxLen = target_length - len(lineNumberStr) - 1
-    # Continue abbreviating until the filename is under the max length
-    while len(filename) > fileNameMaxLen:
-        filename = abbreviate_last_word(filename)
-    # Truncate the filename if it is still too long
-    filename = filename[:fileNameMaxLen]
-    lineNumberStr = shorten_line_number(int(lineNumber), target_length=target_length - len(filename) -1)
-    strOut = f"{filename}:{lineNumberStr}".ljust(target_length)
+    fileNameMaxLen = target_length - len(_shorten_line_number(lineNumber, target_length=target_length//2)) - 1
+    key = (filename, fileNameMaxLen)
+    name = _ABBREVIATED_NAME_CACHE.get(key)
+    if name is None:
+        _abbreviated_name_cache_stats[1] += 1
+        name = _abbreviate_name(filename, fileNameMaxLen)
+        if len(_ABBREVIATED_NAME_CACHE) >= _ABBREVIATED_NAME_CACHE_MAXSIZE:
+            _ABBREVIATED_NAME_CACHE.clear()
+        _ABBREVIATED_NAME_CACHE[key] = name
+    else:
+        _abbreviated_name_cache_stats[0] += 1
+    lineNumberStr = _shorten_line_number(lineNumber, target_length=target_length - len(name) -1)
+    strOut = f"{name}:{lineNumberStr}".ljust(target_length)
     return strOut
 
+def _abbreviate_filename_cache_info():
+    """Return ``CacheInfo(hits, misses, maxsize, currsize)`` for file name abbreviations."""
+    hits, misses = _abbreviated_name_cache_stats
+    return _CacheInfo(hits, misses, _ABBREVIATED_NAME_CACHE_MAXSIZE, len(_ABBREVIATED_NAME_CACHE))
+
+def _abbreviate_filename_cache_clear():
+    """Clear cached file name abbreviations and reset statistics."""
+    _ABBREVIATED_NAME_CACHE.clear()
+    _abbreviated_name_cache_stats[:] = [0, 0]
+
+abbreviate_filename.cache_info = _abbreviate_filename_cache_info
+abbreviate_filename.cache_clear = _abbreviate_filename_cache_clear
+
 def printWithColor(msg, level = 'info',disable_colors=False):
     """Print ``msg`` to stdout using ANSI colors for ``level``.
 
@@ -164,24 +239,112 @@ def printWithColor(msg, level = 'info',disable_colors=False):
     """
     if disable_colors:
         print(f'[{level.upper()}] {msg}')
-    elif level == 'info':
-        print(f'{bcolors.info}{msg}{bcolors.ENDC}')
-    elif level == 'debug':
-        print(f'{bcolors.debug}{msg}{bcolors.ENDC}')
-    elif level == 'warning':
-        print(f'{bcolors.warning}{msg}{bcolors.ENDC}')
-    elif level == 'error':
-        print(f'{bcolors.warning}{msg}{bcolors.ENDC}')
-    elif level == 'critical':
-        print(f'{bcolors.critical}{msg}{bcolors.ENDC}')
-    elif level == 'ok' or level == 'okgreen':
-        print(f'{bcolors.OKGREEN}{msg}{bcolors.ENDC}')
-    elif level == 'okblue':
-        print(f'{bcolors.OKBLUE}{msg}{bcolors.ENDC}')
-    elif level == 'okcyan':
-        print(f'{bcolors.OKCYAN}{msg}{bcolors.ENDC}')
     else:
-        print(f'{bcolors.info}{msg}{bcolors.ENDC}')
+        print(f'{_LEVEL_COLORS.get(level, bcolors.info)}{msg}{bcolors.ENDC}')
+
+class _ConsoleSink:
+    """Buffered stdout writer behind teeLogger's ``tee*`` methods.
+
+    Lines get the same colors as ``printWithColor`` from per-level
+    prefix/suffix strings computed once. They are collected and written to
+    ``sys.stdout.buffer`` with one encode and one write at most every
+    ``refresh_ms`` (sooner once ``MAX_PENDING`` characters are waiting).
+    With ``coalesce``, a line equal to the previous one at the same level is
+    only counted. The count is printed as ``(repeated N times)`` when a
+    different line arrives or the buffer is written.
+
+    Args:
+        refresh_ms: Longest time a line waits in the buffer.
+        coalesce: Collapse runs of identical lines.
+        disable_colors: Prefix lines with ``[LEVEL]`` instead of colors.
+    """
+    MAX_PENDING = 65536
+
+    def __init__(self, refresh_ms=100, coalesce=True, disable_colors=False):
+        self.refresh_ms = refresh_ms
+        self.coalesce = coalesce
+        self.disable_colors = disable_colors
+        self._affixes = {}
+        self._parts = []
+        self._pending = 0
+        self._last = None
+        self._repeats = 0
+        self._lock = threading.Lock()
+        self._timer = None
+        atexit.register(self.flush)
+
+    def _affix(self, level):
+        affix = self._affixes.get(level)
+        if affix is None:
+            if self.disable_colors:
+                affix = (f'[{level.upper()}] ', '\n')
+            else:
+                affix = (_LEVEL_COLORS.get(level, bcolors.info), bcolors.ENDC + '\n')
+            self._affixes[level] = affix
+        return affix
+
+    def write(self, msg, level='info'):
+        """Queue ``msg`` for the console at ``level`` styling."""
+        msg = msg if type(msg) is str else str(msg)
+        with self._lock:
+            if self.coalesce and self._last is not None and self._last[0] == level and self._last[1] == msg:
+                self._repeats += 1
+            else:
+                self._add_repeats()
+                self._last = (level, msg)
+                prefix, suffix = self._affix(level)
+                self._parts += (prefix, msg, suffix)
+                self._pending += len(msg)
+                if self._pending >= self.MAX_PENDING:
+                    self._write_out()
+                    return
+            if self._timer is None:
+                self._timer = threading.Timer(self.refresh_ms / 1000, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _add_repeats(self):
+        if self._repeats:
+            prefix, suffix = self._affix(self._last[0])
+            self._parts += (prefix, f'(repeated {self._repeats} times)', suffix)
+            self._repeats = 0
+
+    def _write_out(self):
+        # the caller holds self._lock
+        data = ''.join(self._parts)
+        self._parts = []
+        self._pending = 0
+        stream = sys.stdout
+        if not data or stream is None:
+            return
+        binary = getattr(stream, 'buffer', None)
+        if binary is not None:
+            # anything print() left in the text layer goes first
+            stream.flush()
+            binary.write(data.encode(getattr(stream, 'encoding', None) or 'utf-8', errors='replace'))
+            binary.flush()
+        else:
+            stream.write(data)
+            stream.flush()
+
+    def flush(self):
+        """Write everything buffered, including a pending repeat count."""
+        with self._lock:
+            timer = self._timer
+            self._timer = None
+            if timer is not None and timer is not threading.current_thread():
+                timer.cancel()
+            self._add_repeats()
+            try:
+                self._write_out()
+            except (OSError, ValueError):
+                # stdout was closed or its reader went away
+                pass
+
+    def close(self):
+        """Flush and stop flushing at interpreter exit."""
+        self.flush()
+        atexit.unregister(self.flush)
 
 def pretty_format_table(data, delimiter = '\t',header = None):
     """Format rows as an aligned text table.
@@ -273,12 +436,74 @@ def pretty_format_table(data, delimiter = '\t',header = None):
     return '\n'.join(outTable) + '\n'
 
 
+_CODE_INFO_CACHE = {}
+_CODE_INFO_CACHE_MAXSIZE = 4096
+def _legacy_getframe(depth=0):
+    """``sys._getframe`` stand-in for interpreters that do not provide it.
+
+    Starts from ``inspect.currentframe()``, or from the frame of a caught
+    exception when that returns None too, and walks ``f_back`` links.
+    """
+    frame = inspect.currentframe()
+    if frame is None:
+        try:
+            raise RuntimeError
+        except RuntimeError:
+            frame = sys.exc_info()[2].tb_frame
+    for _ in range(depth + 1):
+        frame = frame.f_back
+        if frame is None:
+            raise ValueError('call stack is not deep enough')
+    return frame
+
+_getframe = getattr(sys, '_getframe', None) or _legacy_getframe
+
+def _code_info(code):
+    """Return cached ``(code, is_internal, basename)`` for a code object.
+
+    Code objects compare by value (not by file), so entries are keyed by
+    ``id(code)`` and hold a reference to the code object to keep the id valid.
+    The cache is cleared when it reaches ``_CODE_INFO_CACHE_MAXSIZE`` entries.
+    """
+    info = _CODE_INFO_CACHE.get(id(code))
+    if info is None or info[0] is not code:
+        filename = code.co_filename
+        try:
+            internal = os.path.abspath(filename) == _TEE_LOGGER_FILE
+        except Exception:
+            internal = False
+        info = (code, internal, os.path.basename(filename))
+        if len(_CODE_INFO_CACHE) >= _CODE_INFO_CACHE_MAXSIZE:
+            _CODE_INFO_CACHE.clear()
+        _CODE_INFO_CACHE[id(code)] = info
+    return info
+
 def _is_tee_logger_frame(frame):
     try:
-        return os.path.abspath(frame.f_code.co_filename) == _TEE_LOGGER_FILE
+        return _code_info(frame.f_code)[1]
     except Exception:
         return False
 
+def _resolve_caller(i):
+    # Frame 0 is the public resolver (getCallerInfo / getCallerFileLocation)
+    # that called us, matching the historical getCallerInfo offsets.
+    if i < 0:
+        frame = _getframe(2)
+        while frame is not None:
+            info = _code_info(frame.f_code)
+            if not info[1]:
+                return info[2], frame.f_lineno
+            frame = frame.f_back
+        return None, 0
+    try:
+        frame = _getframe(1 + i)
+    except ValueError:
+        # deeper than the stack: use the outermost frame
+        frame = _getframe(1)
+        while frame.f_back is not None:
+            frame = frame.f_back
+    return _code_info(frame.f_code)[2], frame.f_lineno
+
 def getCallerInfo(i=-1):
     """Return ``(filename, lineno)`` for a stack frame.
 
@@ -293,110 +518,1849 @@ def getCallerInfo(i=-1):
     Returns:
         Tuple of base file name and line number. On failure, ``('TLError ...', 0)``.
     """
-    frame = None
     try:
-        if i < 0:
-            frame = inspect.currentframe()
-            if frame is not None:
-                frame = frame.f_back
-            while frame and _is_tee_logger_frame(frame):
-                frame = frame.f_back
-        else:
-            frame = inspect.currentframe()
-            for _ in range(i):
-                if frame is None or frame.f_back is None:
-                    break
-                frame = frame.f_back
-        if frame is None:
-            return 'unknown', 0
-        filename = os.path.basename(frame.f_code.co_filename)
-        lineno = frame.f_lineno
+        filename, lineno = _resolve_caller(i)
     except Exception as e:
-        filename = f'TLError {e}'
-        lineno = 0
-    finally:
-        if frame is not None:
-            del frame
+        return f'TLError {e}', 0
+    if filename is None:
+        return 'unknown', 0
     return filename, lineno
 
+class _CallerFileLocation:
+    """Caller ``filename:line`` stored on log records, abbreviated on first use.
+
+    ``str()`` yields the same label as ``abbreviate_filename`` so the
+    ``%(callerFileLocation)s`` format field works unchanged, but the
+    abbreviation only runs for records that are actually formatted.
+    """
+    __slots__ = ('filename', 'lineno', 'target_length', '_label')
+
+    def __init__(self, filename, lineno, target_length=15):
+        self.filename = filename
+        self.lineno = lineno
+        self.target_length = target_length
+        self._label = None
+
+    def __str__(self):
+        label = self._label
+        if label is None:
+            label = self._label = abbreviate_filename(self.filename, self.lineno, target_length=self.target_length)
+        return label
+
+    def __repr__(self):
+        return f'_CallerFileLocation({self.filename!r}, {self.lineno!r}, {self.target_length!r})'
+
+def _lazy_caller_location(i=-1, target_length=15):
+    # Same frame offsets as getCallerFileLocation; abbreviation is deferred.
+    try:
+        filename, lineno = _resolve_caller(i)
+    except Exception as e:
+        filename, lineno = f'TLError {e}', 0
+    if filename is None:
+        filename, lineno = 'unknown', 0
+    return _CallerFileLocation(filename, lineno, target_length)
+
+_LOG_LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+    'critical': logging.CRITICAL,
+}
+
+def getCallerFileLocation(i=-1, target_length=15):
+    """Return the abbreviated ``filename:line`` label for a stack frame.
+
+    Same frame selection as ``getCallerInfo``, but returns the fixed-width
+    label used in log records. The internal-frame verdict and base name are
+    cached per code object, so resolution costs a few dictionary lookups.
+
+    Args:
+        i: Stack index, or ``-1`` for automatic caller resolution.
+        target_length: Total width of the returned label.
+
+    Returns:
+        Label as produced by ``abbreviate_filename``.
+
+    Examples:
+        >>> getCallerFileLocation(0, 20).startswith('Tee_Logger:')
+        True
+    """
+    try:
+        filename, lineno = _resolve_caller(i)
+    except Exception as e:
+        filename, lineno = f'TLError {e}', 0
+    if filename is None:
+        filename, lineno = 'unknown', 0
+    return abbreviate_filename(filename, lineno, target_length=target_length)
+
+_ARCHIVE_SUFFIXES = {
+    'xz': '.tar.xz',
+    'zst': '.tar.zst',
+    'gz': '.tar.gz',
+    'bz2': '.tar.bz2',
+}
+_ARCHIVE_FORMAT_ALIASES = {'lzma': 'xz', 'zstd': 'zst', 'gzip': 'gz', 'bzip2': 'bz2'}
+
+def _normalize_archive_format(archive_format):
+    """Return the canonical archive format key, or None if unsupported.
+
+    Examples:
+        >>> _normalize_archive_format('zstd')
+        'zst'
+        >>> _normalize_archive_format('rar') is None
+        True
+    """
+    archive_format = _ARCHIVE_FORMAT_ALIASES.get(archive_format, archive_format)
+    return archive_format if archive_format in _ARCHIVE_SUFFIXES else None
+
+def _import_zstd():
+    try:
+        from compression import zstd
+        return zstd
+    except ImportError:
+        return None
+
 def _log_dir_date_key(dirName):
     """Extract ``YYYY-MM-DD`` key from a log directory name.
 
+    Any archive suffix in ``_ARCHIVE_SUFFIXES`` is stripped.
+
     Examples:
         >>> _log_dir_date_key('2020-01-01')
         '2020-01-01'
         >>> _log_dir_date_key('2020-01-01.tar.xz')
         '2020-01-01'
+        >>> _log_dir_date_key('2020-01-01.tar.zst')
+        '2020-01-01'
         >>> _log_dir_date_key('2020-01-01.txt')
         '2020-01-01.txt'
     """
-    if dirName.endswith('.tar.xz'):
-        return dirName[:-7]
+    for suffix in _ARCHIVE_SUFFIXES.values():
+        if dirName.endswith(suffix):
+            return dirName[:-len(suffix)]
     return dirName
 
-def compress_folder(folderPath, disable_colors=False):
-    """Compress a log day-folder to ``folderPath.tar.xz`` and remove the original.
+class _ParallelXZWriter:
+    """Write-only file object that xz-compresses fixed-size chunks in parallel.
+
+    Each chunk becomes an independent ``.xz`` stream; the concatenation is a
+    valid multi-stream ``.xz`` file readable by ``xz``, ``lzma`` and
+    ``tarfile``. ``lzma.compress`` releases the GIL, so a thread pool scales
+    across cores.
+    """
+
+    def __init__(self, fileobj, preset=6, threads=0, chunk_size=16 << 20):
+        # lzma presets need ~100 MiB per compressor, keep the default bounded
+        threads = threads or min(os.cpu_count() or 1, 8)
+        self.fileobj = fileobj
+        self.preset = preset
+        self.chunk_size = chunk_size
+        self.max_pending = 2 * threads
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        self.pending = collections.deque()
+        self.buffer = bytearray()
+
+    def _submit(self, chunk):
+        import lzma
+        self.pending.append(self.executor.submit(lzma.compress, chunk, preset=self.preset))
+        while len(self.pending) > self.max_pending:
+            self.fileobj.write(self.pending.popleft().result())
 
-    Uses ``tar`` and ``xz`` when available on the PATH; otherwise falls back to
-    Python's ``tarfile`` module.
+    def write(self, data):
+        self.buffer += data
+        while len(self.buffer) >= self.chunk_size:
+            chunk = bytes(self.buffer[:self.chunk_size])
+            del self.buffer[:self.chunk_size]
+            self._submit(chunk)
+        return len(data)
+
+    def close(self):
+        try:
+            if self.buffer:
+                self._submit(bytes(self.buffer))
+                self.buffer = bytearray()
+            while self.pending:
+                self.fileobj.write(self.pending.popleft().result())
+        finally:
+            self.executor.shutdown()
+
+# tar and compressor processes of running archive jobs, stopped at interpreter exit
+_ARCHIVE_PROCESSES = set()
+_ARCHIVE_EXITING = threading.Event()
+
+@atexit.register
+def _stop_archive_processes():
+    # A maintenance thread abandoned at exit must not leave tar | xz running on.
+    _ARCHIVE_EXITING.set()
+    for process in list(_ARCHIVE_PROCESSES):
+        with contextlib.suppress(OSError):
+            process.kill()
+        with contextlib.suppress(Exception):
+            process.wait(5)
+
+def _archive_with_tools(folderPath, partPath, compressCommand):
+    # tar -cf - folder | compressor > partPath
+    processes = []
+    try:
+        with open(partPath, 'wb') as out:
+            tar = subprocess.Popen(
+                ['tar', '-cf', '-', os.path.basename(folderPath)],
+                cwd=os.path.dirname(folderPath), stdout=subprocess.PIPE,
+            )
+            processes.append(tar)
+            _ARCHIVE_PROCESSES.add(tar)
+            compressor = subprocess.Popen(compressCommand, stdin=tar.stdout, stdout=out)
+            processes.append(compressor)
+            _ARCHIVE_PROCESSES.add(compressor)
+            tar.stdout.close()
+            compressorReturnCode = compressor.wait()
+            tarReturnCode = tar.wait()
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            _ARCHIVE_PROCESSES.discard(process)
+    if _ARCHIVE_EXITING.is_set():
+        raise RuntimeError('interrupted by interpreter exit')
+    if tarReturnCode or compressorReturnCode:
+        raise RuntimeError(f'tar exited with {tarReturnCode}, {compressCommand[0]} exited with {compressorReturnCode}')
+
+def _archive_command(archive_format, level=None, threads=0):
+    """Return the compressor command line for ``archive_format``, or None if no tool is found."""
+    levelArgs = [f'-{level}'] if level is not None else []
+    if archive_format == 'xz':
+        if shutil.which('xz'):
+            return ['xz', f'-T{threads}'] + levelArgs + ['-c']
+    elif archive_format == 'zst':
+        if shutil.which('zstd'):
+            if level is not None and level > 19:
+                levelArgs = ['--ultra'] + levelArgs
+            return ['zstd', f'-T{threads}', '-q'] + levelArgs + ['-c']
+    elif archive_format == 'gz':
+        if shutil.which('pigz'):
+            return ['pigz'] + ([f'-p{threads}'] if threads else []) + levelArgs + ['-c']
+        if shutil.which('gzip'):
+            return ['gzip'] + levelArgs + ['-c']
+    elif archive_format == 'bz2':
+        if shutil.which('pbzip2'):
+            return ['pbzip2'] + ([f'-p{threads}'] if threads else []) + levelArgs + ['-c']
+        if shutil.which('bzip2'):
+            return ['bzip2'] + levelArgs + ['-c']
+    return None
+
+def _add_folder(tar, folderPath, arcname):
+    # add the files in the order readers want them, so reading takes one pass
+    tar.add(folderPath, arcname=arcname, recursive=False)
+    for name in sorted(os.listdir(folderPath), key=_natural_key):
+        tar.add(os.path.join(folderPath, name), arcname=f'{arcname}/{name}')
+
+def _archive_with_python(folderPath, partPath, threads=0, archive_format='xz', level=None):
+    arcname = os.path.basename(folderPath)
+    if archive_format in ('gz', 'bz2'):
+        with tarfile.open(partPath, 'w:' + archive_format, compresslevel=9 if level is None else level) as tar:
+            _add_folder(tar, folderPath, arcname)
+        return
+    with open(partPath, 'wb') as out:
+        if archive_format == 'zst':
+            zstd = _import_zstd()
+            options = {zstd.CompressionParameter.nb_workers: threads or os.cpu_count() or 1}
+            if level is not None:
+                options[zstd.CompressionParameter.compression_level] = level
+            writer = zstd.ZstdFile(out, 'w', options=options)
+        else:
+            writer = _ParallelXZWriter(out, preset=6 if level is None else level, threads=threads)
+        try:
+            with tarfile.open(fileobj=writer, mode='w|') as tar:
+                _add_folder(tar, folderPath, arcname)
+        finally:
+            writer.close()
+
+def compress_folder(folderPath, disable_colors=False, threads=0, archive_format='xz', level=None):
+    """Archive a log day-folder to ``folderPath.tar.<format>`` and remove the original.
+
+    Pipes ``tar`` into a multi-threaded compressor (``xz -T``, ``zstd -T``,
+    ``pigz``, ``pbzip2``, or plain ``gzip``/``bzip2``) when available;
+    otherwise tars with Python's ``tarfile`` and compresses in-process
+    (parallel chunks for ``xz``, ``compression.zstd`` workers for ``zst``).
+    The archive is written to a ``.part`` file and renamed into place, so an
+    interrupted run never leaves a truncated archive. A folder that already
+    has an archive is what such a run left behind, so it is only removed.
+    Compressor processes still running at interpreter exit are killed.
 
     Args:
         folderPath: Path to the directory to archive.
         disable_colors: Passed through to status messages on failure.
+        threads: Compression threads for this archive (``0`` = all cores).
+        archive_format: ``xz`` (default), ``zst``, ``gz`` or ``bz2``.
+        level: Compression level/preset (``None`` = compressor default).
 
     Returns:
         True if compression succeeded, False otherwise.
     """
-    if os.name != 'nt' and shutil.which('tar') and shutil.which('xz'):
+    archive_format = _normalize_archive_format(archive_format)
+    if archive_format is None:
+        printWithColor('Invalid archive format, using xz instead', 'warning', disable_colors=disable_colors)
+        archive_format = 'xz'
+    compressCommand = _archive_command(archive_format, level=level, threads=threads) if os.name != 'nt' and shutil.which('tar') else None
+    if archive_format == 'zst' and compressCommand is None and _import_zstd() is None:
+        printWithColor('Neither zstd nor compression.zstd is available, archiving with xz instead', 'warning', disable_colors=disable_colors)
+        archive_format = 'xz'
+        level = None
+        compressCommand = _archive_command(archive_format, threads=threads) if os.name != 'nt' and shutil.which('tar') else None
+    archivePath = folderPath + _ARCHIVE_SUFFIXES[archive_format]
+    partPath = archivePath + '.part'
+    if any(os.path.exists(folderPath + suffix) for suffix in _ARCHIVE_SUFFIXES.values()):
+        # an earlier run renamed the archive into place but was cut short while
+        # removing the folder; archiving what is left would replace the full archive
         try:
-            relativePath = os.path.basename(folderPath)
-            subprocess.run(
-                ['tar', '-caf', folderPath + '.tar.xz', '--remove-files', relativePath],
-                cwd=os.path.dirname(folderPath),
-            )
+            shutil.rmtree(folderPath)
             return True
         except Exception as e:
+            printWithColor(f'Failed to remove archived folder {os.path.basename(folderPath)} due to {e}', 'error', disable_colors=disable_colors)
+            return False
+    if compressCommand:
+        try:
+            _archive_with_tools(folderPath, partPath, compressCommand)
+            os.replace(partPath, archivePath)
+            shutil.rmtree(folderPath)
+            return True
+        except Exception as e:
+            if _ARCHIVE_EXITING.is_set():
+                with contextlib.suppress(OSError):
+                    os.remove(partPath)
+                return False
             printWithColor(
-                f'Failed to compress folder {relativePath} with tar due to {e}',
+                f'Failed to compress folder {os.path.basename(folderPath)} with tar due to {e}',
                 'error',
                 disable_colors=disable_colors,
             )
             printWithColor('Falling back to python implementation', 'warning', disable_colors=disable_colors)
     try:
-        with tarfile.open(folderPath + '.tar.xz', 'w:xz') as tar:
-            tar.add(folderPath, arcname=os.path.basename(folderPath))
+        _archive_with_python(folderPath, partPath, threads=threads, archive_format=archive_format, level=level)
+        os.replace(partPath, archivePath)
         shutil.rmtree(folderPath)
         return True
     except Exception as e:
         printWithColor(f'Failed to compress folder due to {e}', 'error', disable_colors=disable_colors)
+        try:
+            os.remove(partPath)
+        except OSError:
+            pass
         return False
 
-def _handler_emit(self, record):
+def compress_folders(folderPaths, max_workers=None, threads=0, disable_colors=False, archive_format='xz', level=None):
+    """Archive several log day-folders concurrently with ``compress_folder``.
+
+    Args:
+        folderPaths: Directories to archive.
+        max_workers: Folders compressed at the same time (default: up to 4,
+            bounded by the CPU count).
+        threads: Compression threads per archive (``0`` = all cores).
+        disable_colors: Passed through to status messages on failure.
+        archive_format: ``xz`` (default), ``zst``, ``gz`` or ``bz2``.
+        level: Compression level/preset (``None`` = compressor default).
+
+    Returns:
+        Dict mapping each folder path to the ``compress_folder`` result.
+    """
+    folderPaths = list(folderPaths)
+    if not folderPaths:
+        return {}
+    if not max_workers:
+        max_workers = min(4, os.cpu_count() or 1)
+    # the heavy lifting happens in compressor subprocesses or GIL-releasing calls
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(folderPaths))) as executor:
+        results = executor.map(
+            lambda folderPath: compress_folder(
+                folderPath, disable_colors=disable_colors, threads=threads,
+                archive_format=archive_format, level=level,
+            ),
+            folderPaths,
+        )
+        return dict(zip(folderPaths, results))
+
+_LOG_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+_LOG_TIMESTAMP_LENGTH = len('2020-01-01 00:00:00,000')
+_LOG_TIMESTAMP_PATTERN = re.compile(r'\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}')
+
+_ZSTD_DICTIONARY_CACHE = {}
+
+def _zstd_dictionaries(zstd, directories):
+    # {dict_id: ZstdDict} of the trained dictionaries (``*.zdict``) in ``directories``
+    dictionaries = {}
+    for directory in directories:
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        for name in names:
+            if not name.endswith('.zdict'):
+                continue
+            path = os.path.join(directory, name)
+            zstdDict = _ZSTD_DICTIONARY_CACHE.get(path)
+            if zstdDict is None:
+                try:
+                    with open(path, 'rb') as fh:
+                        zstdDict = _ZSTD_DICTIONARY_CACHE[path] = zstd.ZstdDict(fh.read())
+                except (OSError, zstd.ZstdError):
+                    continue
+            dictionaries[zstdDict.dict_id] = zstdDict
+    return dictionaries
+
+def _read_dict_ids(path):
+    # dictionary IDs listed in a ``.dictid`` sidecar, one per line
+    try:
+        with open(path, encoding='utf-8') as fh:
+            return [int(line) for line in fh if line.strip().isdigit()]
+    except OSError:
+        return []
+
+class _ZstdFrameDecompressor:
+    """One-frame zstd decompressor using the dictionary named in the frame header."""
+    # ZSTD_FRAMEHEADERSIZE_MAX
+    HEADER_SIZE = 18
+
+    def __init__(self, zstd, dictionaries):
+        self._zstd = zstd
+        self._dictionaries = dictionaries
+        self._decompressor = None
+        self._head = b''
+
+    def decompress(self, data):
+        if self._decompressor is None:
+            data = self._head + data
+            zstd = self._zstd
+            try:
+                dictId = zstd.get_frame_info(data).dictionary_id
+            except zstd.ZstdError:
+                if len(data) < self.HEADER_SIZE:
+                    # wait for the rest of the frame header
+                    self._head = data
+                    return b''
+                dictId = 0
+            self._decompressor = zstd.ZstdDecompressor(zstd_dict=self._dictionaries.get(dictId) if dictId else None)
+        return self._decompressor.decompress(data)
+
+    @property
+    def eof(self):
+        return self._decompressor is not None and self._decompressor.eof
+
+    @property
+    def unused_data(self):
+        return self._decompressor.unused_data if self._decompressor is not None else b''
+
+def _decompressor_factory(path, dictionaryDirs=None):
+    # Return a callable creating a one-frame decompressor for ``path``, or None if uncompressed.
+    # Trained zstd dictionaries are looked up in ``dictionaryDirs`` (default: the
+    # log's folder and its parent, where train_zstd_dictionary saves them).
+    if path.endswith('.gz'):
+        import zlib
+        return lambda: zlib.decompressobj(wbits=31)
+    if path.endswith('.bz2'):
+        import bz2
+        return bz2.BZ2Decompressor
+    if path.endswith('.xz'):
+        import lzma
+        return lzma.LZMADecompressor
+    if path.endswith('.zst'):
+        zstd = _import_zstd()
+        if zstd is None:
+            raise RuntimeError('Reading .zst logs needs the compression.zstd module')
+        if dictionaryDirs is None:
+            parent = os.path.dirname(os.path.abspath(path))
+            dictionaryDirs = (parent, os.path.dirname(parent))
+        dictionaries = _zstd_dictionaries(zstd, dictionaryDirs)
+        for dictId in _read_dict_ids(path + '.dictid'):
+            if dictId not in dictionaries:
+                raise RuntimeError(f'Reading {os.path.basename(path)} needs the zstd dictionary {dictId} (.zdict file)')
+        if not dictionaries:
+            return zstd.ZstdDecompressor
+        return lambda: _ZstdFrameDecompressor(zstd, dictionaries)
+    return None
+
+def _iter_frame_data(fh, make_decompressor, stop=None, chunk_size=1 << 20):
+    # Yield decompressed bytes from consecutive frames until ``stop`` or a damaged tail.
+    remaining = stop - fh.tell() if stop is not None else None
+    decompressor = make_decompressor()
+    pending = b''
+    while True:
+        if not pending:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            pending = fh.read(size) if size > 0 else b''
+            if remaining is not None:
+                remaining -= len(pending)
+            if not pending:
+                return
+        try:
+            data = decompressor.decompress(pending)
+        except Exception:
+            # a frame cut short by a crash, followed by whatever was appended later
+            return
+        if data:
+            yield data
+        if decompressor.eof:
+            pending = decompressor.unused_data
+            decompressor = make_decompressor()
+        else:
+            pending = b''
+
+def _iter_lines(chunks, encoding):
+    # Split decoded byte chunks into lines without their newline.
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    tail = ''
+    for chunk in chunks:
+        lines = (tail + decoder.decode(chunk)).split('\n')
+        tail = lines.pop()
+        yield from lines
+    tail += decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+def _read_index(indexPath):
+    entries = []
+    try:
+        with open(indexPath, encoding='utf-8') as fh:
+            for line in fh:
+                offset, _, timestamp = line.rstrip('\n').partition('\t')
+                try:
+                    entries.append((int(offset), float(timestamp)))
+                except ValueError:
+                    # an index line torn by a crash
+                    continue
+    except OSError:
+        return []
+    return entries
+
+def _to_epoch(value, end=False):
+    """Convert a range bound to epoch seconds.
+
+    Strings may be ``YYYY-MM-DD``, ``YYYY-MM-DD HH:MM`` or
+    ``YYYY-MM-DD HH:MM:SS``; with ``end=True`` a bare date covers the whole day.
+
+    Examples:
+        >>> _to_epoch('2020-01-02', end=True) - _to_epoch('2020-01-02') > 86399
+        True
+    """
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        for fmt in (_LOG_TIMESTAMP_FORMAT, '%Y-%m-%d %H:%M', '%Y-%m-%d'):
+            try:
+                parsed = datetime.datetime.strptime(value[:19].replace('T', ' '), fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f'Unrecognized time {value!r}, expected YYYY-MM-DD[ HH:MM[:SS]]')
+        if end and fmt == '%Y-%m-%d':
+            parsed += datetime.timedelta(days=1, milliseconds=-1)
+        value = parsed
+    elif isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time.max if end else datetime.time.min)
+    return value.timestamp()
+
+def _epoch_to_log_timestamp(epoch):
+    return time.strftime(_LOG_TIMESTAMP_FORMAT, time.localtime(epoch)) + ',%03d' % int((epoch - int(epoch)) * 1000)
+
+def read_log_range(path, start=None, end=None, encoding='utf-8'):
+    """Yield the lines of a teeLogger log file logged between ``start`` and ``end``.
+
+    Compressed files with a ``.idx`` sidecar (``seekable_index=True``) are
+    read from the last frame starting at or before ``start`` up to the first
+    frame starting after ``end``, so only those frames are decompressed.
+    Without an index the whole file is scanned. Continuation lines of a
+    multi-line record follow the record they belong to. A frame damaged by
+    a crash ends the read. Logs written with ``output_format='jsonl'`` or
+    ``'binary'`` are detected automatically and yielded as JSON lines.
+
+    Args:
+        path: Log file (plain, ``.gz``, ``.bz2``, ``.xz`` or ``.zst``).
+        start: Earliest time to include: ``datetime``, epoch seconds, or a
+            ``YYYY-MM-DD HH:MM:SS`` string. ``None`` means the beginning.
+        end: Latest time to include, in the same forms. ``None`` means the end.
+        encoding: Encoding of the log records.
+
+    Yields:
+        Log lines without their trailing newline.
+    """
+    startEpoch = _to_epoch(start)
+    endEpoch = _to_epoch(end, end=True)
+    outputFormat, chunks = _detect_output_format(_iter_file_chunks(path, startEpoch, endEpoch))
+    if outputFormat == 'text':
+        yield from _lines_in_range(_iter_lines(chunks, encoding), startEpoch, endEpoch)
+    else:
+        for line, _ in _iter_structured_records(outputFormat, chunks, encoding, startEpoch, endEpoch):
+            yield line
+
+def _detect_output_format(chunks):
+    # Return (output_format, chunks) judging by the first decoded byte.
+    chunks = iter(chunks)
+    for first in chunks:
+        if first:
+            break
+    else:
+        return 'text', iter(())
+    if first[0] == _BINARY_RECORD_MAGIC:
+        outputFormat = 'binary'
+    elif first[:1] == b'{':
+        outputFormat = 'jsonl'
+    else:
+        outputFormat = 'text'
+    return outputFormat, itertools.chain((first,), chunks)
+
+def _iter_binary_records(chunks):
+    # Yield record dicts from binary records, skipping damaged bytes.
+    header = _BINARY_RECORD_HEADER
+    buf = bytearray()
+    for chunk in chunks:
+        buf += chunk
+        offset = 0
+        while len(buf) - offset >= header.size:
+            magic, length, ts, levelno, lineno, pid, threadLength, fileLength = header.unpack_from(buf, offset)
+            if magic != _BINARY_RECORD_MAGIC or threadLength + fileLength > length:
+                nextMagic = buf.find(_BINARY_RECORD_MAGIC, offset + 1)
+                offset = len(buf) if nextMagic < 0 else nextMagic
+                continue
+            end = offset + header.size + length
+            if len(buf) < end:
+                break
+            body = offset + header.size
+            yield {
+                'ts': ts,
+                'level': logging.getLevelName(levelno),
+                'file': buf[body + threadLength:body + threadLength + fileLength].decode('utf-8', errors='replace'),
+                'line': lineno,
+                'pid': pid,
+                'thread': buf[body:body + threadLength].decode('utf-8', errors='replace'),
+                'msg': buf[body + threadLength + fileLength:end].decode('utf-8', errors='replace'),
+            }
+            offset = end
+        del buf[:offset]
+
+def _iter_structured_records(outputFormat, chunks, encoding, startEpoch, endEpoch):
+    # Yield (JSON line, record dict) for jsonl or binary logs within the time range.
+    startUs = None if startEpoch is None else startEpoch * 1000000
+    endUs = None if endEpoch is None else endEpoch * 1000000
+    if outputFormat == 'binary':
+        records = ((None, record) for record in _iter_binary_records(chunks))
+    else:
+        records = _iter_json_lines(_iter_lines(chunks, encoding))
+    for line, record in records:
+        ts = record.get('ts', 0)
+        if (startUs is not None and ts < startUs) or (endUs is not None and ts > endUs):
+            continue
+        yield (json.dumps(record, ensure_ascii=False) if line is None else line), record
+
+def _iter_json_lines(lines):
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # a line torn by a crash
+            continue
+        if isinstance(record, dict):
+            yield line, record
+
+def _lines_in_range(lines, startEpoch, endEpoch):
+    # Keep records (with their continuation lines) whose timestamp is in range.
+    if startEpoch is None and endEpoch is None:
+        yield from lines
+        return
+    startKey = _epoch_to_log_timestamp(startEpoch) if startEpoch is not None else None
+    endKey = _epoch_to_log_timestamp(endEpoch) if endEpoch is not None else None
+    include = False
+    for line in lines:
+        if _LOG_TIMESTAMP_PATTERN.match(line):
+            key = line[:_LOG_TIMESTAMP_LENGTH]
+            include = (startKey is None or key >= startKey) and (endKey is None or key <= endKey)
+        if include:
+            yield line
+
+_RECORD_HEADER_PATTERN = re.compile(r'\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3} \[(\S+) *\] \[([^\]]*)\] ')
+def _natural_key(name):
+    """Sort key comparing the digit runs in ``name`` as numbers.
+
+    Keeps size-rollover parts in the order they were written.
+
+    Examples:
+        >>> sorted(['app_2020-01-02_10.log', 'app_2020-01-02_2.log', 'app_2020-01-02.log'], key=_natural_key)
+        ['app_2020-01-02.log', 'app_2020-01-02_2.log', 'app_2020-01-02_10.log']
+    """
+    return [int(part) if i % 2 else part for i, part in enumerate(re.split(r'(\d+)', name))]
+
+_LOG_FILE_PATTERN = re.compile(r'\.log(?:\.(?:gz|bz2|xz|zst))?$')
+
+def _iter_records(lines):
+    # Group lines into records: a timestamped line plus its continuation lines.
+    record = []
+    for line in lines:
+        if record and _LOG_TIMESTAMP_PATTERN.match(line):
+            yield record
+            record = []
+        record.append(line)
+    if record:
+        yield record
+
+def _iter_log_records(chunks, encoding, startEpoch, endEpoch):
+    # Yield (text, levelname, caller label) for each record in range, whatever the output format.
+    outputFormat, chunks = _detect_output_format(chunks)
+    if outputFormat != 'text':
+        for line, record in _iter_structured_records(outputFormat, chunks, encoding, startEpoch, endEpoch):
+            yield line, record.get('level'), f"{record.get('file')}:{record.get('line')}"
+        return
+    for record in _iter_records(_lines_in_range(_iter_lines(chunks, encoding), startEpoch, endEpoch)):
+        header = _RECORD_HEADER_PATTERN.match(record[0])
+        if header is None:
+            yield '\n'.join(record), None, None
+        else:
+            yield '\n'.join(record), header.group(1), header.group(2)
+
+def _iter_file_chunks(path, startEpoch=None, endEpoch=None):
+    # Decompressed chunks of a log file, seeking with its frame index when there is one.
+    make_decompressor = _decompressor_factory(path)
+    with open(path, 'rb') as fh:
+        if make_decompressor is None:
+            yield from iter(lambda: fh.read(1 << 20), b'')
+            return
+        stop = None
+        index = _read_index(path + '.idx')
+        if index:
+            # records written before the index was started precede its first entry,
+            # so only seek when an indexed frame starts at or before ``startEpoch``
+            first = None
+            for i, (offset, timestamp) in enumerate(index):
+                if startEpoch is not None and timestamp <= startEpoch:
+                    first = i
+                if endEpoch is not None and timestamp > endEpoch:
+                    stop = offset
+                    break
+            if first is not None:
+                fh.seek(index[first][0])
+        yield from _iter_frame_data(fh, make_decompressor, stop=stop)
+
+@contextlib.contextmanager
+def _open_archive_stream(path):
+    # A day-folder archive opened as a forward-only tar stream.
+    process = None
+    if path.endswith('.tar.zst'):
+        zstd = _import_zstd()
+        if zstd is not None:
+            fileobj = zstd.ZstdFile(path)
+        elif shutil.which('zstd'):
+            process = subprocess.Popen(['zstd', '-dcq', path], stdout=subprocess.PIPE)
+            fileobj = process.stdout
+        else:
+            raise RuntimeError(f'Reading {os.path.basename(path)} needs zstd or compression.zstd')
+        tar = tarfile.open(fileobj=fileobj, mode='r|')
+    else:
+        fileobj = None
+        tar = tarfile.open(path, 'r|*')
+    try:
+        yield tar
+    finally:
+        tar.close()
+        if fileobj is not None:
+            fileobj.close()
+        if process is not None:
+            process.kill()
+            process.wait()
+
+def _iter_archive_members(path):
+    # Yield the decompressed chunks of every log file inside a day-folder archive, in name order.
+    # Each member is streamed from the archive and must be consumed before the next one is taken.
+    with _open_archive_stream(path) as tar:
+        names = sorted((member.name for member in tar if member.isfile() and _LOG_FILE_PATTERN.search(member.name)),
+                       key=_natural_key)
+    dictionaryDirs = (os.path.dirname(os.path.abspath(path)),)
+    position = 0
+    # archives written by _archive_with_python list files in this order; for others
+    # (system tar reads the directory unsorted) later passes pick up skipped members
+    while position < len(names):
+        with _open_archive_stream(path) as tar:
+            for member in tar:
+                if position < len(names) and member.name == names[position] and member.isfile():
+                    position += 1
+                    fh = tar.extractfile(member)
+                    make_decompressor = _decompressor_factory(member.name, dictionaryDirs=dictionaryDirs)
+                    if make_decompressor is None:
+                        yield iter(lambda: fh.read(1 << 20), b'')
+                    else:
+                        yield _iter_frame_data(fh, make_decompressor)
+
+def _query_source(source, criteria):
+    # Yield the matching records of one log file or archive as strings.
+    kind, path = source
+    startEpoch, endEpoch, minLevel, callerPattern, pattern, encoding = criteria
+    callerRegex = re.compile(callerPattern) if callerPattern else None
+    regex = re.compile(pattern) if pattern else None
+    if kind == 'archive':
+        members = _iter_archive_members(path)
+    else:
+        members = [_iter_file_chunks(path, startEpoch, endEpoch)]
+    for chunks in members:
+        for text, levelname, callerLabel in _iter_log_records(chunks, encoding, startEpoch, endEpoch):
+            if minLevel:
+                levelno = logging.getLevelName(levelname) if levelname else None
+                if not isinstance(levelno, int) or levelno < minLevel:
+                    continue
+            if callerRegex and (callerLabel is None or not callerRegex.search(callerLabel)):
+                continue
+            if regex and not regex.search(text):
+                continue
+            yield text
+
+def _spool_query_source(source, criteria, spoolDir):
+    # Worker process: write the matches of one source to a file in ``spoolDir``, one JSON string per line.
+    fd, spoolPath = tempfile.mkstemp(suffix='.jsonl', dir=spoolDir)
+    with open(fd, 'w', encoding='utf-8') as fh:
+        for text in _query_source(source, criteria):
+            fh.write(json.dumps(text, ensure_ascii=False))
+            fh.write('\n')
+    return spoolPath
+
+def _read_spooled_matches(spoolPath):
+    try:
+        with open(spoolPath, encoding='utf-8') as fh:
+            for line in fh:
+                yield json.loads(line)
+    finally:
+        os.remove(spoolPath)
+
+def _query_sources(logsDir, startDay=None, endDay=None):
+    # List (kind, path) sources under ``logsDir`` in date order, pruned by day.
+    sources = []
+    try:
+        names = sorted(os.listdir(logsDir))
+    except OSError:
+        return sources
+    for name in names:
+        day = _log_dir_date_key(name)
+        if not re.match(r'^\d{4}-\d{2}-\d{2}$', day):
+            continue
+        if (startDay and day < startDay) or (endDay and day > endDay):
+            continue
+        path = os.path.join(logsDir, name)
+        if day != name:
+            sources.append((day, 'archive', path))
+        elif os.path.isdir(path):
+            for fileName in sorted(os.listdir(path), key=_natural_key):
+                if _LOG_FILE_PATTERN.search(fileName):
+                    sources.append((day, 'file', os.path.join(path, fileName)))
+    return [(kind, path) for _, kind, path in sorted(sources, key=lambda source: source[0])]
+
+def train_zstd_dictionary(programName, systemLogFileDir='.', dict_size=112640, max_samples=100000):
+    """Train a zstd dictionary on the records teeLogger already wrote for a program.
+
+    Log lines are sampled from the newest day files and archives under
+    ``{systemLogFileDir}/{programName}_log`` first. The dictionary is saved
+    there as ``{programName}_{dict_id}.zdict``, where ``read_log_range`` and
+    ``query_logs`` find it again. Use it with
+    ``teeLogger(in_place_compression='zstd', zstd_dictionary=True)``. Short,
+    repetitive records flushed in small frames compress much better with a
+    dictionary, because every frame starts with the common timestamp, level
+    and caller patterns already known.
+
+    Args:
+        programName: ``programName`` the logs were written with.
+        systemLogFileDir: ``systemLogFileDir`` the logs were written to.
+        dict_size: Maximum dictionary size in bytes.
+        max_samples: Maximum number of log lines to train on.
+
+    Returns:
+        Path of the saved ``.zdict`` file.
+
+    Raises:
+        RuntimeError: ``compression.zstd`` is not available.
+        ValueError: No log records were found.
+    """
+    zstd = _import_zstd()
+    if zstd is None:
+        raise RuntimeError('Training a zstd dictionary needs the compression.zstd module')
+    logsDir = os.path.join(os.path.abspath(systemLogFileDir), programName + '_log')
+    samples = []
+    for kind, path in reversed(_query_sources(logsDir)):
+        members = _iter_archive_members(path) if kind == 'archive' else [_iter_file_chunks(path)]
+        for chunks in members:
+            tail = b''
+            for chunk in chunks:
+                lines = (tail + chunk).split(b'\n')
+                tail = lines.pop()
+                samples.extend(line + b'\n' for line in lines if line)
+                if len(samples) >= max_samples:
+                    break
+            if len(samples) >= max_samples:
+                break
+        if len(samples) >= max_samples:
+            break
+    if not samples:
+        raise ValueError(f'No log records found under {logsDir}')
+    zstdDict = zstd.train_dict(samples[:max_samples], dict_size)
+    path = os.path.join(logsDir, f'{programName}_{zstdDict.dict_id}.zdict')
+    with open(path, 'wb') as fh:
+        fh.write(zstdDict.dict_content)
+    return path
+
+def query_logs(programName, systemLogFileDir='.', start=None, end=None, level=None, caller=None,
+               pattern=None, max_workers=None, encoding='utf-8'):
+    """Search every log teeLogger wrote for ``programName`` and yield matching records.
+
+    Covers plain and compressed log files in ``YYYY-MM-DD`` day-folders as
+    well as day-folders archived by log maintenance. Day-folders outside
+    ``start``/``end`` are skipped by their date key, indexed compressed logs
+    only decode the frames in range, and the remaining files and archives
+    are searched in parallel worker processes. Records are yielded in day
+    order; multi-line records are yielded whole.
+
+    Args:
+        programName: ``programName`` the logs were written with.
+        systemLogFileDir: ``systemLogFileDir`` the logs were written to.
+        start: Earliest record time (``datetime``, epoch seconds, or a
+            ``YYYY-MM-DD[ HH:MM[:SS]]`` string).
+        end: Latest record time, in the same forms. A bare date includes
+            that whole day.
+        level: Minimum level, as a number or name (``'WARNING'``).
+        caller: Regex searched in the ``[file:line]`` caller label.
+        pattern: Regex searched in the record text.
+        max_workers: Worker processes (default: CPU count; ``1`` searches
+            in this process).
+        encoding: Encoding of the log records.
+
+    Yields:
+        Matching records as strings, continuation lines joined by ``\\n``.
+        Records from ``jsonl`` or ``binary`` logs are yielded as JSON lines.
+    """
+    startEpoch = _to_epoch(start)
+    endEpoch = _to_epoch(end, end=True)
+    startDay = datetime.datetime.fromtimestamp(startEpoch).strftime('%Y-%m-%d') if startEpoch is not None else None
+    endDay = datetime.datetime.fromtimestamp(endEpoch).strftime('%Y-%m-%d') if endEpoch is not None else None
+    if isinstance(level, str):
+        level = _LOG_LEVELS.get(level.lower(), logging.getLevelName(level.upper()))
+        if not isinstance(level, int):
+            raise ValueError(f'Unknown log level {level!r}')
+    criteria = (startEpoch, endEpoch, level or 0, caller, pattern, encoding)
+    sources = _query_sources(os.path.join(systemLogFileDir, programName + '_log'), startDay, endDay)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(sources))
+    if max_workers <= 1:
+        for source in sources:
+            yield from _query_source(source, criteria)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    # workers spool their matches to disk, so neither they nor this process hold a whole result
+    with tempfile.TemporaryDirectory(prefix='teeLogger_query_') as spoolDir, \
+            ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_spool_query_source, source, criteria, spoolDir) for source in sources]
+        try:
+            for future in futures:
+                yield from _read_spooled_matches(future.result())
+        finally:
+            for future in futures:
+                future.cancel()
+
+def _try_lock_file(path):
+    """Return an fd holding an exclusive ``flock`` on ``path``, or None if it is taken.
+
+    Without ``fcntl`` (Windows) the file is opened but not locked.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    if fcntl is None:
+        return fd
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+_TEE_LOG_FORMAT = '%(asctime)s [%(levelname)-8s] [%(callerFileLocation)s] %(message)s'
+_ASCII_COMPATIBLE_ENCODINGS = frozenset(('utf-8', 'ascii', 'latin-1', 'iso8859-1', 'cp1252'))
+
+class _TeeFormatter(logging.Formatter):
+    """Formatter specialised for teeLogger's fixed record layout.
+
+    Produces exactly what ``logging.Formatter(_TEE_LOG_FORMAT)`` would, but
+    renders the ``asctime`` prefix only once per second (appending the
+    milliseconds per record), looks up pre-padded level names, and skips the
+    generic ``%``-style interpolation. ``format_bytes`` additionally caches the
+    encoded prefix so binary handlers only encode the variable part of a record.
+    Records carrying ``exc_info`` or ``stack_info`` are handed to
+    ``logging.Formatter.format``.
+    """
+
+    def __init__(self):
+        super().__init__(_TEE_LOG_FORMAT)
+        # (second, 'YYYY-mm-dd HH:MM:SS', encoding, encoded seconds prefix)
+        self._second_cache = (None, None, None, None)
+        self._padded_levels = {}
+        self._encoded_levels = {}
+        self._piecewise_encodings = {}
+
+    def _timestamp(self, created):
+        second = int(created)
+        cached = self._second_cache
+        if cached[0] != second:
+            cached = self._second_cache = (second, time.strftime(self.default_time_format, self.converter(created)), None, None)
+        return cached
+
+    def _padded_level(self, levelname):
+        padded = self._padded_levels.get(levelname)
+        if padded is None:
+            padded = self._padded_levels[levelname] = f' [{levelname:<8}] ['
+        return padded
+
+    def _piecewise(self, encoding):
+        # whether pieces can be encoded separately and concatenated
+        piecewise = self._piecewise_encodings.get(encoding)
+        if piecewise is None:
+            try:
+                piecewise = codecs.lookup(encoding).name in _ASCII_COMPATIBLE_ENCODINGS
+            except LookupError:
+                piecewise = False
+            self._piecewise_encodings[encoding] = piecewise
+        return piecewise
+
+    def _fast_path_applies(self, record):
+        return not (record.exc_info or record.exc_text or record.stack_info) and hasattr(record, 'callerFileLocation')
+
+    def format(self, record):
+        if not self._fast_path_applies(record):
+            return super().format(record)
+        record.message = record.getMessage()
+        return self.format_fields(record.created, record.msecs, record.levelname, record.callerFileLocation, record.message)
+
+    def format_fields(self, created, msecs, levelname, location, message):
+        """Format one line from its fields, without a ``LogRecord``."""
+        return '%s,%03d%s%s] %s' % (self._timestamp(created)[1], msecs, self._padded_level(levelname), location, message)
+
+    def format_bytes(self, record, encoding='utf-8', errors='namereplace'):
+        """Return the formatted record encoded with ``encoding``."""
+        if not self._piecewise(encoding) or not self._fast_path_applies(record):
+            return self.format(record).encode(encoding, errors=errors)
+        record.message = record.getMessage()
+        return self._format_fields_bytes(
+            record.created, record.msecs, record.levelname, record.callerFileLocation, record.message, encoding, errors,
+        )
+
+    def format_fields_bytes(self, created, msecs, levelname, location, message, encoding='utf-8', errors='namereplace'):
+        """Encoded counterpart of ``format_fields``."""
+        if not self._piecewise(encoding):
+            return self.format_fields(created, msecs, levelname, location, message).encode(encoding, errors=errors)
+        return self._format_fields_bytes(created, msecs, levelname, location, message, encoding, errors)
+
+    def _format_fields_bytes(self, created, msecs, levelname, location, message, encoding, errors):
+        cached = self._timestamp(created)
+        if cached[2] != encoding:
+            cached = self._second_cache = (cached[0], cached[1], encoding, cached[1].encode(encoding))
+        level = self._encoded_levels.get((levelname, encoding))
+        if level is None:
+            level = self._encoded_levels[(levelname, encoding)] = self._padded_level(levelname).encode(encoding, errors=errors)
+        tail = '%s] %s' % (location, message)
+        return b'%s,%03d%s%s' % (cached[3], msecs, level, tail.encode(encoding, errors=errors))
+
+    def format_entry(self, entry):
+        """Format a fast-path entry (see ``_TeeFileHandler.emit_fast``)."""
+        created = entry[1]
+        return self.format_fields(created, _entry_msecs(created), logging.getLevelName(entry[2]), entry[3], entry[4])
+
+    def format_entry_bytes(self, entry, encoding='utf-8', errors='namereplace'):
+        """Encoded counterpart of ``format_entry``."""
+        created = entry[1]
+        return self.format_fields_bytes(
+            created, _entry_msecs(created), logging.getLevelName(entry[2]), entry[3], entry[4], encoding, errors,
+        )
+
+_json_string = json.encoder.encode_basestring
+
+def _caller_fields(location, record=None):
+    # (filename, lineno) of a caller label, falling back to the record's own location
+    filename = getattr(location, 'filename', None)
+    if filename is not None:
+        return filename, location.lineno
+    if location is None and record is not None:
+        return record.filename, record.lineno
+    return str(location), 0
+
+def _exception_text(formatter, record):
+    # Same exception/stack text logging.Formatter appends, or None.
+    if record.exc_info and not record.exc_text:
+        record.exc_text = formatter.formatException(record.exc_info)
+    parts = [record.exc_text] if record.exc_text else []
+    if record.stack_info:
+        parts.append(formatter.formatStack(record.stack_info))
+    return '\n'.join(parts) or None
+
+class _TeeJsonFormatter(_TeeFormatter):
+    """Render records as one JSON object per line.
+
+    Keys are ``ts`` (epoch microseconds), ``level``, ``file``, ``line``,
+    ``pid``, ``thread`` and ``msg``, plus ``exc`` when an exception or stack
+    is attached. Newlines in messages are escaped, so every record is one
+    line. Values are escaped with the C string encoder from ``json`` and
+    repeated file and thread names are escaped once.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._escaped = {}
+
+    def _escape(self, value):
+        escaped = self._escaped.get(value)
+        if escaped is None:
+            escaped = _json_string(value)
+            if len(self._escaped) < 4096:
+                self._escaped[value] = escaped
+        return escaped
+
+    def _format_json(self, created, levelname, location, message, process, threadName, exc=None, record=None):
+        filename, lineno = _caller_fields(location, record)
+        text = '{"ts":%d,"level":%s,"file":%s,"line":%d,"pid":%s,"thread":%s,"msg":%s' % (
+            created * 1000000, self._escape(levelname), self._escape(filename), lineno,
+            'null' if process is None else process, 'null' if threadName is None else self._escape(threadName),
+            _json_string(message if type(message) is str else str(message)),
+        )
+        if exc is not None:
+            return text + ',"exc":' + _json_string(exc) + '}'
+        return text + '}'
+
+    def format(self, record):
+        record.message = record.getMessage()
+        return self._format_json(
+            record.created, record.levelname, getattr(record, 'callerFileLocation', None), record.message,
+            record.process, record.threadName, _exception_text(self, record), record,
+        )
+
+    def format_bytes(self, record, encoding='utf-8', errors='namereplace'):
+        return self.format(record).encode(encoding, errors=errors)
+
+    def format_entry(self, entry):
+        return self._format_json(entry[1], logging.getLevelName(entry[2]), entry[3], entry[4], entry[5], entry[6])
+
+    def format_entry_bytes(self, entry, encoding='utf-8', errors='namereplace'):
+        return self.format_entry(entry).encode(encoding, errors=errors)
+
+# magic, body length, ts (epoch microseconds), levelno, line, pid, thread name length, file name length;
+# the body is the UTF-8 thread name, file name and message
+_BINARY_RECORD_HEADER = struct.Struct('<BIqHIIHH')
+_BINARY_RECORD_MAGIC = 0x1e
+
+class _TeeBinaryFormatter(_TeeFormatter):
+    """Encode records in a compact length-prefixed binary layout.
+
+    Each record is a ``_BINARY_RECORD_HEADER`` followed by the UTF-8 thread
+    name, caller file name and message; attached exceptions are appended to
+    the message. Records start with the ``0x1e`` magic byte so readers can
+    resynchronise after damage. Only ``format_bytes``/``format_entry_bytes``
+    produce the binary layout; ``format`` still renders the text line.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._encoded_names = {}
+
+    def _encode_name(self, value):
+        encoded = self._encoded_names.get(value)
+        if encoded is None:
+            encoded = value.encode('utf-8', errors='namereplace')[:0xffff]
+            if len(self._encoded_names) < 4096:
+                self._encoded_names[value] = encoded
+        return encoded
+
+    def _pack(self, created, levelno, location, message, process, threadName, exc=None, record=None):
+        filename, lineno = _caller_fields(location, record)
+        thread = self._encode_name(threadName or '')
+        file = self._encode_name(filename)
+        if exc is not None:
+            message = f'{message}\n{exc}'
+        msg = (message if type(message) is str else str(message)).encode('utf-8', errors='namereplace')
+        return _BINARY_RECORD_HEADER.pack(
+            _BINARY_RECORD_MAGIC, len(thread) + len(file) + len(msg), int(created * 1000000), levelno,
+            lineno, process or 0, len(thread), len(file),
+        ) + thread + file + msg
+
+    def format_bytes(self, record, encoding='utf-8', errors='namereplace'):
+        return self._pack(
+            record.created, record.levelno, getattr(record, 'callerFileLocation', None), record.getMessage(),
+            record.process, record.threadName, _exception_text(self, record), record,
+        )
+
+    def format_entry_bytes(self, entry, encoding='utf-8', errors='namereplace'):
+        return self._pack(entry[1], entry[2], entry[3], entry[4], entry[5], entry[6])
+
+_OUTPUT_FORMATTERS = {'text': _TeeFormatter, 'jsonl': _TeeJsonFormatter, 'binary': _TeeBinaryFormatter}
+
+def _entry_record(entry):
+    # Build the LogRecord the standard path would have produced for a fast-path entry.
+    name, created, levelno, location, msg, process, threadName = entry
+    record = logging.makeLogRecord({
+        'name': name, 'msg': msg, 'levelno': levelno, 'levelname': logging.getLevelName(levelno),
+        'callerFileLocation': location,
+    })
+    record.created = created
+    record.msecs = _entry_msecs(created)
+    if process is not None:
+        record.process = process
+        record.threadName = threadName
+    return record
+
+def _entry_msecs(created):
+    return int((created - int(created)) * 1000) + 0.0
+
+# CPU time of the writing thread for compression_cpu_budget; Python < 3.7 only
+# has the process-wide clock, which also counts the other threads
+_thread_time = getattr(time, 'thread_time', time.process_time)
+
+def _handler_write(self, msg, levelno, count=1, created=None):
+    # Write one formatted message (``count`` newline-joined records, the first
+    # created at ``created``) plus newline; the caller holds the handler lock.
+    if self.rollover_callback is not None and (
+        (self.rollover_at and time.time() >= self.rollover_at)
+        or (self.max_bytes and self.bytes_written >= self.max_bytes)
+    ):
+        self.do_rollover()
     if self.stream is None:
         if self.mode != 'w' or not self._closed:
+            if self.index_path is not None:
+                self._write_index_entry(created)
+            if self.cpu_budget:
+                self._adapt_level()
             self.stream = self._open()
+    if self.max_bytes and self._sized_file != self.baseFilename and self.stream:
+        # an appended file counts what it already held
+        self._sized_file = self.baseFilename
+        self.bytes_written = self._existing_size()
     if self.stream:
-        try:
-            msg = self.format(record)
-            # encode msg
-            if 'b' in self.mode:
-                if not isinstance(msg,bytes):
-                    if not isinstance(msg, str):
-                        msg = str(msg)
-                    msg = msg.encode(self.encoding,errors='namereplace')
-                msg += b'\n'
-            else:
+        cpu = _thread_time() if self.cpu_budget else 0.0
+        # encode msg
+        if 'b' in self.mode:
+            if not isinstance(msg,bytes):
                 if not isinstance(msg, str):
                     msg = str(msg)
-                msg += '\n'
-            stream = self.stream
-            # issue 35046: merged two stream.writes into one.
-            stream.write(msg)
+                msg = msg.encode(self.encoding,errors='namereplace')
+            msg += b'\n' if self.terminator == '\n' else self.terminator.encode(self.encoding or 'utf-8')
+        else:
+            if not isinstance(msg, str):
+                msg = str(msg)
+            msg += self.terminator
+        stream = self.stream
+        # issue 35046: merged two stream.writes into one.
+        stream.write(msg)
+        self.bytes_written += len(msg)
+        if self._framed and self._frame_due(count, len(msg)):
+            self.end_frame()
+        else:
+            self._flush_if_due(levelno, count)
+        if self.cpu_budget:
+            self._compress_cpu += _thread_time() - cpu
+
+def _handler_emit(self, record):
+    try:
+        formatter = self.formatter
+        if 'b' in self.mode and isinstance(formatter, _TeeFormatter):
+            msg = formatter.format_bytes(record, self.encoding or 'utf-8')
+        else:
+            msg = self.format(record)
+        _handler_write(self, msg, record.levelno, created=record.created)
+    except RecursionError:  # See issue 36272
+        raise
+    except Exception:
+        self.handleError(record)
+
+class _MMapStream:
+    """Append-only binary stream that writes through a sliding ``mmap`` window.
+
+    The file is grown in ``extent_size`` steps (``posix_fallocate`` where
+    available) and records are copied into the mapped window, so writing a
+    line costs no system call. ``flush()`` is a no-op: written bytes already
+    live in the page cache. ``close()`` truncates the file to the bytes
+    actually written; a file left padded with NULs by a crash is trimmed to
+    its last non-NUL byte when reopened.
+
+    The stream needs the file to itself: it holds an exclusive ``flock``
+    and raises ``BlockingIOError`` when another writer has one. Should a
+    writer without the lock append past the preallocated extent anyway,
+    the unused padding is filled with newlines and the stream continues
+    with plain appends, so neither side's records are overwritten.
+
+    Args:
+        path: File to append to.
+        extent_size: Bytes to preallocate and map at a time.
+    """
+
+    def __init__(self, path, extent_size=64 * 1024 * 1024):
+        granularity = mmap.ALLOCATIONGRANULARITY
+        self.extent_size = max(granularity, extent_size // granularity * granularity)
+        self.name = path
+        self._pid = os.getpid()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._map = None
+        self._window_start = self._window_end = 0
+        self._append_fd = None
+        self.closed = False
+        try:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    raise BlockingIOError(f'{path} is already written through another mmap stream') from None
+            self._pos = self._data_length()
+            self._allocated = os.fstat(self._fd).st_size
+            self._map_window()
+        except Exception:
+            os.close(self._fd)
+            raise
+
+    def _data_length(self):
+        # skip the NUL padding of an extent that was never truncated
+        end = os.fstat(self._fd).st_size
+        while end > 0:
+            start = max(0, end - (1 << 20))
+            block = os.pread(self._fd, end - start, start).rstrip(b'\0')
+            if block:
+                return start + len(block)
+            end = start
+        return 0
+
+    def _map_window(self):
+        if self._map is not None:
+            self._map.close()
+        self._window_start = self._pos - self._pos % mmap.ALLOCATIONGRANULARITY
+        self._window_end = self._window_start + self.extent_size
+        if self._allocated < self._window_end:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(self._fd, self._window_start, self.extent_size)
+            else:
+                os.ftruncate(self._fd, self._window_end)
+            self._allocated = self._window_end
+        self._map = mmap.mmap(self._fd, self.extent_size, offset=self._window_start)
+
+    def _foreign_appends(self):
+        # Another writer appended past our extent: pad our unused bytes with
+        # newlines and append from now on instead of mapping over its records.
+        if self._append_fd is None and os.fstat(self._fd).st_size <= self._allocated:
+            return False
+        if self._append_fd is None:
+            os.pwrite(self._fd, b'\n' * (self._allocated - self._pos), self._pos)
+            self._append_fd = os.open(self.name, os.O_WRONLY | os.O_APPEND)
+        return True
+
+    def write(self, data):
+        view = memoryview(data)
+        size = len(view)
+        # check before a record crosses into unmapped space, so it is never split
+        if self._append_fd is not None or (self._pos + size > self._window_end and self._foreign_appends()):
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            return os.write(self._append_fd, data)
+        written = 0
+        while written < size:
+            if self._pos >= self._window_end:
+                self._map_window()
+            offset = self._pos - self._window_start
+            n = min(size - written, self.extent_size - offset)
+            self._map[offset:offset + n] = view[written:written + n]
+            self._pos += n
+            written += n
+        return size
+
+    def tell(self):
+        return self._pos
+
+    def fileno(self):
+        return self._fd
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        try:
+            if self._pid == os.getpid() and not self._foreign_appends():
+                os.ftruncate(self._fd, self._pos)
+        finally:
+            if self._append_fd is not None:
+                os.close(self._append_fd)
+            os.close(self._fd)
+
+class _TeeFileHandler(logging.FileHandler):
+    """Base class for teeLogger file handlers with a shared flush policy.
+
+    By default every record is flushed as soon as it is written. A batched
+    policy buffers records until ``flush_every_n_records`` have accumulated or
+    ``flush_interval_ms`` has elapsed, while records at or above
+    ``flush_on_level`` are always flushed immediately. A value of ``0`` (or
+    ``None`` for the level) disables that trigger.
+
+    When ``rollover_callback`` is set, the handler switches files once
+    ``time.time()`` reaches ``rollover_at`` or ``bytes_written`` (the size
+    the current file had when it was opened plus the uncompressed bytes
+    written to it since) reaches ``max_bytes``. The callback receives the
+    handler and returns the new file name. If it raises, the error is
+    reported once, records keep going to the current file, and the rollover
+    is retried a minute later.
+    """
+    rollover_callback = None
+    rollover_at = 0
+    max_bytes = 0
+    bytes_written = 0
+    _sized_file = None
+    _rollover_retry_at = 0.0
+    flush_every_n_records = 1
+    flush_interval_ms = 0
+    flush_on_level = logging.WARNING
+    _pending_records = 0
+    _last_flush = 0.0
+    _flush_timer = None
+    frame_every_n_records = 0
+    frame_every_n_bytes = 0
+    frame_interval_ms = 0
+    _framed = False
+    _frame_records = 0
+    _frame_bytes = 0
+    _frame_started = 0.0
+    index_path = None
+    _index_file = None
+    # compressed handlers name their level attribute and its lowest value
+    level_attr = None
+    min_level = 0
+    max_level = 0
+    cpu_budget = 0
+    backlog = None
+    backlog_limit = 64
+    _compress_cpu = 0.0
+    _adapt_started = 0.0
+
+    def set_flush_policy(self, flush_every_n_records=1, flush_interval_ms=0, flush_on_level=logging.WARNING):
+        """Configure when buffered records are flushed to disk."""
+        self.flush_every_n_records = flush_every_n_records
+        self.flush_interval_ms = flush_interval_ms
+        self.flush_on_level = flush_on_level
+        self._last_flush = time.monotonic()
+
+    def set_frame_policy(self, frame_every_n_records=0, frame_every_n_bytes=0, frame_interval_ms=0):
+        """Configure when the current compressed frame is finished and a new one started."""
+        self.frame_every_n_records = frame_every_n_records
+        self.frame_every_n_bytes = frame_every_n_bytes
+        self.frame_interval_ms = frame_interval_ms
+        self._framed = bool(frame_every_n_records or frame_every_n_bytes or frame_interval_ms)
+        self._frame_started = time.monotonic()
+
+    def _frame_due(self, count, size):
+        self._frame_records += count
+        self._frame_bytes += size
+        return (
+            (self.frame_every_n_records and self._frame_records >= self.frame_every_n_records)
+            or (self.frame_every_n_bytes and self._frame_bytes >= self.frame_every_n_bytes)
+            or (self.frame_interval_ms and (time.monotonic() - self._frame_started) * 1000 >= self.frame_interval_ms)
+        )
+
+    def end_frame(self):
+        """Close the compressed stream so the next record starts an independent frame.
+
+        Closing writes the stream trailer, so everything up to here decodes
+        on its own even if the process dies before the next frame is
+        finished. The caller holds the handler lock.
+        """
+        self._frame_records = 0
+        self._frame_bytes = 0
+        self._frame_started = time.monotonic()
+        stream = self.stream
+        if stream is None:
+            return
+        self.stream = None
+        self._cancel_flush_timer()
+        self._pending_records = 0
+        self._last_flush = time.monotonic()
+        stream.close()
+
+    def set_adaptive_level(self, cpu_budget, backlog=None, backlog_limit=64):
+        """Adjust the compression level at frame boundaries to stay within a CPU budget.
+
+        ``cpu_budget`` is the share of one core that writing and compressing
+        may use (``0`` disables). Before each new frame is opened, the CPU
+        time spent in writes since the previous one is compared with the
+        wall time that passed. Above the budget, or with more than
+        ``backlog_limit`` items waiting according to the ``backlog``
+        callable, the frame is compressed one level lower. Below half the
+        budget with nothing waiting, one level higher, but never above the
+        level set when adaptation was enabled. Needs a frame policy.
+        """
+        if self.level_attr is None:
+            return
+        self.cpu_budget = cpu_budget
+        self.max_level = getattr(self, self.level_attr)
+        self.backlog = backlog
+        self.backlog_limit = backlog_limit
+        self._compress_cpu = 0.0
+        self._adapt_started = time.monotonic()
+
+    def _adapt_level(self):
+        # called just before a new frame is opened
+        now = time.monotonic()
+        elapsed = now - self._adapt_started
+        if elapsed <= 0:
+            return
+        share = self._compress_cpu / elapsed
+        self._compress_cpu = 0.0
+        self._adapt_started = now
+        waiting = self.backlog() if self.backlog is not None else 0
+        level = getattr(self, self.level_attr)
+        if share > self.cpu_budget or waiting > self.backlog_limit:
+            level = max(level - 1, self.min_level)
+        elif share < self.cpu_budget / 2 and not waiting:
+            level = min(level + 1, self.max_level)
+        setattr(self, self.level_attr, level)
+
+    def enable_index(self):
+        """Record where every compressed frame starts in a ``.idx`` sidecar file.
+
+        Each frame adds one ``compressed_offset<TAB>first_timestamp`` line to
+        ``{baseFilename}.idx``, which ``read_log_range`` uses to decode only
+        the frames covering a time range. The handler must be created with
+        ``delay=True`` so the first frame is indexed too.
+        """
+        self.index_path = self.baseFilename + '.idx'
+
+    def _write_index_entry(self, created):
+        # called just before a new frame is opened
+        indexPath = self.baseFilename + '.idx'
+        if self._index_file is None or self.index_path != indexPath:
+            if self._index_file is not None:
+                self._index_file.close()
+            self.index_path = indexPath
+            self._index_file = open(indexPath, 'a', encoding='utf-8')
+        try:
+            offset = os.path.getsize(self.baseFilename)
+        except OSError:
+            offset = 0
+        self._index_file.write(f'{offset}\t{time.time() if created is None else created:.3f}\n')
+        self._index_file.flush()
+
+    def _flush_if_due(self, levelno, count=1):
+        self._pending_records += count
+        if self.flush_every_n_records and self._pending_records >= self.flush_every_n_records:
             self.flush()
-        except RecursionError:  # See issue 36272
+        elif self.flush_on_level is not None and levelno >= self.flush_on_level:
+            self.flush()
+        elif self.flush_interval_ms:
+            if (time.monotonic() - self._last_flush) * 1000 >= self.flush_interval_ms:
+                self.flush()
+            elif self._flush_timer is None:
+                # make sure buffered records reach disk even if logging goes quiet
+                self._flush_timer = threading.Timer(self.flush_interval_ms / 1000, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def _cancel_flush_timer(self):
+        timer = self._flush_timer
+        self._flush_timer = None
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+
+    def flush(self):
+        self.acquire()
+        try:
+            self._cancel_flush_timer()
+            self._pending_records = 0
+            self._last_flush = time.monotonic()
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self):
+        self._cancel_flush_timer()
+        super().close()
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+
+    def _detach_stream(self):
+        """Drop a stream inherited from the parent process without writing to it.
+
+        Our copy of the descriptor is pointed at ``/dev/null`` first, so data
+        flushed or a trailer written while the stream is finalized cannot
+        corrupt the parent's file. The file is reopened on the next write.
+        """
+        stream = self.stream
+        self.stream = None
+        if stream is not None:
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            try:
+                os.dup2(devnull, stream.fileno())
+            finally:
+                os.close(devnull)
+            with contextlib.suppress(Exception):
+                stream.close()
+        if self._index_file is not None:
+            # index lines are flushed as they are written
+            self._index_file.close()
+            self._index_file = None
+
+    def do_rollover(self):
+        """Close the current file and continue in the one named by ``rollover_callback``."""
+        now = time.time()
+        if now < self._rollover_retry_at:
+            return
+        try:
+            newFilename = self.rollover_callback(self)
+        except Exception as e:
+            # keep writing to the current file and retry in a minute
+            if not self._rollover_retry_at:
+                printWithColor(f'Log rollover of {self.baseFilename} failed due to {e}, retrying every minute', 'error')
+            self._rollover_retry_at = now + 60
+            return
+        self._rollover_retry_at = 0.0
+        self.end_frame()
+        self.bytes_written = 0
+        self.baseFilename = os.path.abspath(newFilename)
+
+    def _existing_size(self):
+        # bytes the file held when opened: the data length for plain streams
+        # (excluding mmap padding), the file size for compressed ones
+        if self.level_attr is None:
+            try:
+                return self.stream.tell()
+            except (AttributeError, OSError, ValueError):
+                pass
+        try:
+            return os.path.getsize(self.baseFilename)
+        except OSError:
+            return 0
+
+    def emit(self, record):
+        _handler_emit(self, record)
+
+    def emit_fast(self, entry):
+        """Write a fast-path ``(name, created, levelno, location, msg, process, threadName)`` entry.
+
+        ``process`` and ``threadName`` are only filled in (otherwise
+        ``None``) when a structured ``output_format`` needs them.
+
+        Skips ``LogRecord`` creation and handler filters; handlers with a
+        formatter other than ``_TeeFormatter`` get an equivalent record.
+        """
+        formatter = self.formatter
+        if not isinstance(formatter, _TeeFormatter):
+            self.handle(_entry_record(entry))
+            return
+        try:
+            data = self._format_entry(formatter, entry)
+            self.acquire()
+            try:
+                _handler_write(self, data, entry[2], created=entry[1])
+            finally:
+                self.release()
+        except RecursionError:
             raise
         except Exception:
-            self.handleError(record)
+            self.handleError(_entry_record(entry))
+
+    def emit_entries(self, entries):
+        """Write a batch of fast-path entries with one lock, one write and one flush check."""
+        if not entries:
+            return
+        formatter = self.formatter
+        if not isinstance(formatter, _TeeFormatter):
+            for entry in entries:
+                self.handle(_entry_record(entry))
+            return
+        try:
+            lines = [self._format_entry(formatter, entry) for entry in entries]
+            data = self._separator().join(lines)
+            levelno = max(entry[2] for entry in entries)
+            self.acquire()
+            try:
+                _handler_write(self, data, levelno, len(lines), created=entries[0][1])
+            finally:
+                self.release()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(_entry_record(entries[0]))
+
+    def _format_entry(self, formatter, entry):
+        if 'b' in self.mode:
+            return formatter.format_entry_bytes(entry, self.encoding or 'utf-8')
+        return formatter.format_entry(entry)
+
+    def _separator(self):
+        # the record terminator, as written between the records of a batch
+        if 'b' in self.mode:
+            return self.terminator.encode(self.encoding or 'utf-8')
+        return self.terminator
+
+    def _format_payload(self, record):
+        # the record as bytes in this handler's encoding, for the shared writer
+        formatter = self.formatter
+        if 'b' in self.mode and isinstance(formatter, _TeeFormatter):
+            return formatter.format_bytes(record, self.encoding or 'utf-8')
+        return self.format(record).encode(self.encoding or 'utf-8', errors='namereplace')
+
+    def _entry_payload(self, entry):
+        data = self._format_entry(self.formatter, entry)
+        if isinstance(data, str):
+            return data.encode(self.encoding or 'utf-8', errors='namereplace')
+        return data
+
+    def _payload_message(self, payload):
+        # bytes received from a shared-writer client, as write_message expects them
+        if 'b' in self.mode:
+            return payload
+        return payload.decode(self.encoding or 'utf-8', errors='replace')
+
+    def write_message(self, msg, levelno=logging.INFO, count=1, created=None):
+        """Write an already formatted message under the handler lock.
+
+        ``msg`` may hold ``count`` records joined by the terminator, the first
+        one created at ``created``; they count as that many records for the
+        flush and frame policies.
+        """
+        self.acquire()
+        try:
+            _handler_write(self, msg, levelno, count, created=created)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(logging.makeLogRecord({'msg': msg, 'levelno': levelno}))
+        finally:
+            self.release()
+
+class _TeeHandlerWrapper(logging.Handler):
+    """Base class for handlers that forward records to a ``target`` handler."""
+
+    def __init__(self, target):
+        super().__init__()
+        self.target = target
+        self._pid = os.getpid()
+
+    def _forked(self):
+        # True in a child forked after this handler was created, until the child
+        # resets the state it inherited (see ``_after_fork``)
+        return self._pid != os.getpid()
+
+    def _after_fork(self):
+        # Forget records the parent had pending; it writes them itself.
+        self._pid = os.getpid()
+
+    def emit_fast(self, entry):
+        """Handle a fast-path entry; see ``_TeeFileHandler.emit_fast``."""
+        self.handle(_entry_record(entry))
+
+    def emit_entries(self, entries):
+        """Handle a batch of fast-path entries one by one."""
+        for entry in entries:
+            self.emit_fast(entry)
+
+    def flush(self):
+        self.target.flush()
+
+    def close(self):
+        self.target.close()
+        super().close()
+
+class _CallSiteLimiter:
+    """Per-call-site sampling and token-bucket rate limits.
+
+    Call sites are keyed by the caller ``(filename, lineno)`` that
+    ``getCallerInfo`` resolves. Sampling is deterministic: a site keeps
+    every ``round(1 / sample_rate)``-th record, starting with its first, so
+    ``sample_rate`` 0.01 keeps records 0, 100, 200, ... The
+    token bucket refills at ``rate_limit`` records per second up to
+    ``burst`` tokens. Records either mechanism drops are counted per site
+    until ``take_summaries`` collects the counts.
+
+    Args:
+        sample_rate: Default fraction of records kept per site.
+        rate_limit: Default records per second per site (``0`` = unlimited).
+        burst: Token bucket size (``0`` = ``rate_limit``, at least 1).
+        summary_interval_ms: Interval between ``take_summaries`` results.
+    """
+
+    def __init__(self, sample_rate=1.0, rate_limit=0, burst=0, summary_interval_ms=60000):
+        self.sample_rate = sample_rate
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.summary_interval_ms = summary_interval_ms
+        # key -> [records seen, tokens, last refill, suppressed, highest suppressed level]
+        self._sites = {}
+        self._lock = threading.Lock()
+        self._last_summary = time.monotonic()
+        self._next_summary = self._last_summary + summary_interval_ms / 1000
+
+    def allow(self, key, levelno, sample_rate=..., rate_limit=...):
+        """Return whether a record from call site ``key`` should be written."""
+        if sample_rate is ...:
+            sample_rate = self.sample_rate
+        if rate_limit is ...:
+            rate_limit = self.rate_limit
+        if sample_rate >= 1 and not rate_limit:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites[key] = [0, None, now, 0, 0]
+            allowed = True
+            if sample_rate < 1:
+                seen = site[0]
+                site[0] = seen + 1
+                allowed = sample_rate > 0 and seen % max(round(1 / sample_rate), 1) == 0
+            if allowed and rate_limit:
+                burst = self.burst or max(rate_limit, 1)
+                tokens = burst if site[1] is None else min(burst, site[1] + (now - site[2]) * rate_limit)
+                site[2] = now
+                if tokens >= 1:
+                    tokens -= 1
+                else:
+                    allowed = False
+                site[1] = tokens
+            if not allowed:
+                site[3] += 1
+                if levelno > site[4]:
+                    site[4] = levelno
+            return allowed
+
+    def take_summaries(self, force=False):
+        """Collect and reset the suppressed counts once the summary interval has passed.
+
+        Returns:
+            ``None`` when nothing is due, otherwise ``(elapsed_seconds,
+            [((filename, lineno), suppressed, levelno), ...])``.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_summary:
+            return None
+        with self._lock:
+            if not force and now < self._next_summary:
+                return None
+            elapsed = now - self._last_summary
+            self._last_summary = now
+            self._next_summary = now + self.summary_interval_ms / 1000
+            sites = []
+            for key, site in self._sites.items():
+                if site[3]:
+                    sites.append((key, site[3], site[4]))
+                    site[3] = site[4] = 0
+        return (elapsed, sites) if sites else None
+
+class _ThreadBuffer:
+    # records formatted by one thread and not yet handed to the writer
+    __slots__ = ('lock', 'items', 'levelno', 'created', 'thread')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.items = []
+        self.levelno = 0
+        self.created = None
+        self.thread = threading.current_thread()
 
 class teeLogger:
     """Logger that tees messages to a file and optionally to stdout.
@@ -430,6 +2394,106 @@ class teeLogger:
             ``in_place_compression`` is set.
         compression_level: Backend-specific level/preset (optional).
         binary_mode: Open log files in binary append mode (default ``True``).
+        level: Minimum level written to the log file (``logging`` level number
+            or name, default ``DEBUG``). Calls below it return before any
+            caller resolution; console output of ``tee*`` methods is unaffected.
+        async_mode: Hand records to a background writer thread so formatting,
+            encoding, compression, and file I/O happen off the caller's thread.
+            Pending records are drained on ``close()`` and at interpreter exit.
+        async_queue_size: Maximum number of pending records in async mode.
+        async_overflow: What to do when the async queue is full: ``block``
+            (default) waits for space, ``drop_oldest`` discards the oldest
+            pending record, ``drop_newest`` discards the new record. Dropped
+            records are counted in ``AsyncQueueHandler.dropped``.
+        flush_every_n_records: Flush the log file after this many records
+            (default ``1``, i.e. every record; ``0`` disables the count trigger).
+        flush_interval_ms: Also flush once this many milliseconds have passed
+            since the last flush (``0`` disables).
+        flush_on_level: Always flush records at or above this level
+            immediately (default ``logging.WARNING``; ``None`` disables).
+        shared_writer: Let several processes logging under the same
+            ``programName`` share one writer. The first process owns the log
+            file and the others send records to it over a Unix domain socket,
+            so pre-fork workers produce a single well-compressed daily file.
+        rollover_at_midnight: Switch to a file in the new ``YYYY-MM-DD``
+            folder at local midnight (default ``True``) so long-running
+            processes do not keep writing into the start-day folder.
+        max_log_bytes: Also switch to a new file once this many uncompressed
+            bytes were written to the current one (``0`` disables).
+        archive_workers: Old day-folders archived concurrently during
+            maintenance (default: up to 4, bounded by the CPU count).
+        archive_threads: Compression threads per archive, passed to
+            ``xz -T`` (``0`` = all cores).
+        archive_format: Format for archived day-folders: ``xz`` (default),
+            ``zst``, ``gz`` or ``bz2``. Archives in any of these formats are
+            recognised by retention regardless of the current setting.
+        archive_level: Compression level/preset for archives (``None`` uses
+            the compressor default).
+        fast_path: Write records straight to the teeLogger file handler
+            without creating ``LogRecord`` objects. Handlers and filters added
+            to ``logger`` by the caller are bypassed.
+        mmap_extent_bytes: For uncompressed logs, write through an ``mmap``
+            window over a file preallocated in extents of this many bytes
+            instead of a buffered file (``0`` disables). The file is truncated
+            to its real length on close and rollover. The file must have a
+            single writer, so this cannot be combined with
+            ``collapse_single_day_logs`` or ``shared_writer``.
+        frame_every_n_records: With ``in_place_compression``, finish the
+            compressed stream and start a new independent frame (gzip member,
+            xz/bz2 stream, zstd frame) every this many records (``0``
+            disables). A crash then loses at most the unfinished frame.
+        frame_every_n_bytes: Start a new frame after this many uncompressed
+            bytes (``0`` disables).
+        frame_interval_ms: Start a new frame once the current one is this old
+            when the next record is written (``0`` disables).
+        seekable_index: With ``in_place_compression``, write a ``.idx``
+            sidecar mapping each frame's compressed offset to its first
+            timestamp so ``read_log_range`` can seek to a time range. Frames
+            default to 1 MiB of uncompressed log when no frame trigger is set.
+        output_format: ``text`` (default) for ``asctime [LEVEL] [file:line] msg``
+            lines, ``jsonl`` for one JSON object per record, or ``binary`` for
+            length-prefixed binary records (implies ``binary_mode``). The
+            structured formats keep the timestamp as an integer, the raw
+            caller file and line, pid and thread, and are understood by
+            ``read_log_range`` and ``query_logs``.
+        thread_buffer_records: Let each thread format up to this many records
+            into a buffer of its own before a single writer thread writes them
+            as one batch (``0`` disables). Logging threads then no longer
+            contend for the handler lock or wait for compression. Takes the
+            place of ``async_mode``'s queue; not combined with
+            ``shared_writer``.
+        console_refresh_ms: Buffer the console output of ``tee*`` methods and
+            write it to ``sys.stdout.buffer`` at most every this many
+            milliseconds (``0``, the default, prints each line immediately).
+        console_coalesce: With ``console_refresh_ms``, print runs of identical
+            lines once, followed by ``(repeated N times)``.
+        sample_rate: Fraction of the records from each call site (caller
+            ``filename:line``) that is written, e.g. ``0.01`` keeps every
+            100th (default ``1.0``, keep all). Overridable per call.
+        rate_limit: Records per second each call site may write, enforced
+            with a token bucket (``0``, the default, disables). Overridable
+            per call.
+        rate_limit_burst: Bucket size, i.e. records a call site may write in
+            a burst (``0`` means ``rate_limit``, at least 1).
+        limit_summary_interval_ms: How often a summary record with the number
+            of suppressed records is written for each limited call site.
+            Summaries are written by the next log call after the interval and
+            on ``close()``.
+        dedup_window: Collapse repeats of the same level, caller and message
+            among the last this many distinct messages into one record
+            followed by ``last message repeated N times`` (``0``, the
+            default, disables; ``1`` collapses consecutive repeats).
+        compression_cpu_budget: With ``in_place_compression``, the share of
+            one core that writing and compressing may use, e.g. ``0.25``
+            (``0``, the default, keeps ``compression_level`` fixed). At frame
+            boundaries the level steps down while the budget is exceeded or
+            records queue up, and back up towards ``compression_level`` when
+            there is headroom. Frames default to 1 MiB when no frame trigger
+            is set.
+        zstd_dictionary: With ``in_place_compression='zstd'``, compress with a
+            trained dictionary: a ``.zdict`` path, or ``True`` for the newest
+            one ``train_zstd_dictionary`` saved for this program. The
+            dictionary ID is written to ``{logfile}.dictid``.
 
     Examples:
         >>> tl = teeLogger(noLog=True, suppressPrintout=True, programName='doctest')
@@ -438,8 +2502,11 @@ class teeLogger:
         >>> tl.info('silent example')  # doctest: +ELLIPSIS
     """
 
-    class GZipFileHandler(logging.FileHandler):
+    class GZipFileHandler(_TeeFileHandler):
         """Write log records directly to a gzip-compressed file."""
+        level_attr = 'compresslevel'
+        min_level = 1
+
         def __init__(self, filename, mode='a', encoding=None, delay=False, compresslevel=1):
             self.compresslevel = compresslevel
             if 'b' not in mode:
@@ -452,11 +2519,11 @@ class teeLogger:
                 return gzip.open(self.baseFilename, self.mode, compresslevel=self.compresslevel)
             return gzip.open(self.baseFilename, self.mode, compresslevel=self.compresslevel, encoding=self.encoding)
 
-        def emit(self, record):
-            _handler_emit(self, record)
-
-    class BZ2FileHandler(logging.FileHandler):
+    class BZ2FileHandler(_TeeFileHandler):
         """Write log records directly to a bzip2-compressed file."""
+        level_attr = 'compresslevel'
+        min_level = 1
+
         def __init__(self, filename, mode='a', encoding=None, delay=False, compresslevel=1):
             self.compresslevel = compresslevel
             if 'b' not in mode:
@@ -467,13 +2534,13 @@ class teeLogger:
             import bz2
             if 'b' in self.mode:
                 return bz2.open(self.baseFilename, self.mode, compresslevel=self.compresslevel)
-            return bz2.open(self.baseFilename, self.mode, compresslevel=self.compresslevel, encoding=self.encoding)
-        
-        def emit(self, record):
-            _handler_emit(self, record)
-        
-    class XZFileHandler(logging.FileHandler):
+            return bz2.open(self.baseFilename, self.mode, compresslevel=self.compresslevel, encoding=self.encoding)
+                
+    class XZFileHandler(_TeeFileHandler):
         """Write log records directly to an lzma/xz-compressed file."""
+        level_attr = 'preset'
+        min_level = 0
+
         def __init__(self, filename, mode='a', encoding=None, delay=False, preset=1):
             self.preset = preset
             if 'b' not in mode:
@@ -495,27 +2562,46 @@ class teeLogger:
                 encoding=self.encoding
             )
         
-        def emit(self, record):
-            _handler_emit(self, record)
+    class ZSTDFileHandler(_TeeFileHandler):
+        """Write log records directly to a zstd-compressed file.
+
+        With ``zstd_dict`` (a ``compression.zstd.ZstdDict``, see
+        ``train_zstd_dictionary``) every frame is compressed with that
+        dictionary and its ID is listed in ``{baseFilename}.dictid``.
+        """
+        level_attr = 'level'
+        min_level = 1
+        _recorded_dict_id = None
 
-    class ZSTDFileHandler(logging.FileHandler):
-        """Write log records directly to a zstd-compressed file."""
-        def __init__(self, filename, mode='a', encoding=None, delay=False, level=3):
+        def __init__(self, filename, mode='a', encoding=None, delay=False, level=3, zstd_dict=None):
             self.level = level
+            self.zstd_dict = zstd_dict
             if 'b' not in mode:
                 mode += 't'
             super().__init__(filename, mode, encoding, delay)
 
         def _open(self):
             from compression import zstd
+            if self.zstd_dict is not None:
+                self._record_dict_id()
             if 'b' in self.mode:
-                return zstd.open(self.baseFilename, self.mode, level=self.level)
-            return zstd.open(self.baseFilename, self.mode, level=self.level, encoding=self.encoding)
+                return zstd.open(self.baseFilename, self.mode, level=self.level, zstd_dict=self.zstd_dict)
+            return zstd.open(
+                self.baseFilename, self.mode, level=self.level, zstd_dict=self.zstd_dict, encoding=self.encoding,
+            )
 
-        def emit(self, record):
-            _handler_emit(self, record)
+        def _record_dict_id(self):
+            # list the dictionary in ``{baseFilename}.dictid`` so readers know which one to load
+            dictIdPath = self.baseFilename + '.dictid'
+            dictId = self.zstd_dict.dict_id
+            if self._recorded_dict_id == (dictIdPath, dictId):
+                return
+            self._recorded_dict_id = (dictIdPath, dictId)
+            if dictId not in _read_dict_ids(dictIdPath):
+                with open(dictIdPath, 'a', encoding='utf-8') as fh:
+                    fh.write(f'{dictId}\n')
     
-    class BinFileHandler(logging.FileHandler):
+    class BinFileHandler(_TeeFileHandler):
         """Write log records to a plain file with optional binary mode."""
         def __init__(self, filename, mode='a', encoding=None, delay=False):
             if 'b' in mode:
@@ -523,15 +2609,825 @@ class teeLogger:
             else:
                 super().__init__(filename, mode, encoding=encoding, delay=delay)
             self.encoding = encoding
+
+        def _open(self):
+            if 'b' in self.mode:
+                # self.encoding is only used to encode records in binary mode
+                return open(self.baseFilename, self.mode)
+            return super()._open()
         
+    class MMapFileHandler(_TeeFileHandler):
+        """Write log records to a plain file through a preallocated ``mmap`` window.
+
+        Records are always written as bytes encoded with ``encoding``. See
+        ``_MMapStream`` for how the file is grown and truncated.
+        """
+        def __init__(self, filename, mode='ab', encoding=None, delay=False, extent_size=64 * 1024 * 1024):
+            self.extent_size = extent_size
+            super().__init__(filename, 'ab', encoding=None, delay=delay)
+            self.encoding = encoding
+
+        def _open(self):
+            try:
+                return _MMapStream(self.baseFilename, self.extent_size)
+            except BlockingIOError:
+                printWithColor(f'{self.baseFilename} is open in another mmap writer, appending through a buffered file instead', 'warning')
+                return open(self.baseFilename, 'ab')
+
+    class AsyncQueueHandler(_TeeHandlerWrapper):
+        """Queue records for a background thread that writes them to ``target``.
+
+        The calling thread only enqueues the record; formatting, encoding,
+        compression, and I/O run on the writer thread. ``close()`` drains the
+        queue before closing ``target``; ``logging.shutdown`` does the same at
+        interpreter exit.
+
+        Args:
+            target: Handler that performs the actual write.
+            maxsize: Maximum number of pending records.
+            overflow: ``block``, ``drop_oldest``, or ``drop_newest``.
+        """
+        OVERFLOW_POLICIES = ('block', 'drop_oldest', 'drop_newest')
+
+        def __init__(self, target, maxsize=10000, overflow='block'):
+            if overflow not in self.OVERFLOW_POLICIES:
+                raise ValueError(f'Invalid async overflow policy {overflow!r}')
+            super().__init__(target)
+            self.overflow = overflow
+            self.dropped = 0
+            self.queue = queue.Queue(maxsize=maxsize)
+            self._closed = False
+            self._start_writer()
+
+        def _start_writer(self):
+            self._thread = threading.Thread(
+                target=self._run, name=f'teeLogger-writer-{id(self):x}', daemon=True,
+            )
+            self._thread.start()
+
+        def _after_fork(self):
+            # the writer thread did not survive the fork
+            super()._after_fork()
+            self.queue = queue.Queue(maxsize=self.queue.maxsize)
+            self._start_writer()
+
+        def _run(self):
+            q = self.queue
+            target = self.target
+            while True:
+                record = q.get()
+                try:
+                    if record is None:
+                        return
+                    if type(record) is tuple:
+                        target.emit_fast(record)
+                    elif type(record) is list:
+                        target.emit_entries(record)
+                    else:
+                        target.handle(record)
+                except Exception:
+                    if type(record) is list:
+                        record = record[0]
+                    target.handleError(_entry_record(record) if type(record) is tuple else record)
+                finally:
+                    q.task_done()
+
         def emit(self, record):
-            _handler_emit(self, record)
-        
+            if self._closed:
+                self.target.handle(record)
+                return
+            self._enqueue(record)
+
+        def emit_fast(self, entry):
+            """Queue a fast-path entry for the writer thread."""
+            self.acquire()
+            try:
+                if self._closed:
+                    self.target.emit_fast(entry)
+                else:
+                    self._enqueue(entry)
+            finally:
+                self.release()
+
+        def emit_entries(self, entries):
+            """Queue a batch of fast-path entries as a single item."""
+            if not entries:
+                return
+            self.acquire()
+            try:
+                if self._closed:
+                    self.target.emit_entries(entries)
+                else:
+                    self._enqueue(list(entries))
+            finally:
+                self.release()
+
+        def _enqueue(self, record):
+            if self._forked():
+                self.acquire()
+                try:
+                    if self._forked():
+                        self._after_fork()
+                finally:
+                    self.release()
+            if self.overflow == 'block':
+                self.queue.put(record)
+                return
+            # callers hold the handler lock, so only the writer thread
+            # can change the queue between the checks below.
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                if self.overflow == 'drop_newest':
+                    self.dropped += self._record_count(record)
+                    return
+            try:
+                self.dropped += self._record_count(self.queue.get_nowait())
+                self.queue.task_done()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += self._record_count(record)
+
+        @staticmethod
+        def _record_count(item):
+            # a queued batch of fast-path entries counts as its records
+            return len(item) if type(item) is list else 1
+
+        def flush(self):
+            """Block until every queued record has been written and flushed."""
+            if self._thread.is_alive():
+                self.queue.join()
+            self.target.flush()
+
+        def close(self):
+            """Drain pending records, stop the writer thread, and close ``target``."""
+            self.acquire()
+            try:
+                if self._closed:
+                    return
+                self._closed = True
+            finally:
+                self.release()
+            if self._forked():
+                # records queued before the fork belong to the parent
+                super().close()
+                return
+            if self._thread.is_alive():
+                self.queue.put(None)
+                self._thread.join()
+            super().close()
+
+    class ThreadBufferHandler(_TeeHandlerWrapper):
+        """Format records on the logging thread and write them to ``target`` in batches.
+
+        Each thread formats and encodes its records into a buffer of its own,
+        guarded by a lock no other logging thread takes. A full buffer, or a
+        record at or above ``target.flush_on_level``, is handed to a single
+        writer thread, which writes the buffered records to ``target`` with one
+        lock acquisition and one compressor call. Such a record also hands
+        over the buffers of all other threads, so what they logged before it
+        is written and flushed with it. The writer also collects partly
+        filled buffers every ``interval_ms``. Records of one thread keep their
+        order; records of different threads are interleaved by batch.
+        ``close()`` writes every buffered record before closing ``target``.
+
+        Args:
+            target: teeLogger file handler that performs the actual write.
+            buffer_records: Records a thread buffers before handing them over.
+            interval_ms: How often partly filled buffers are written.
+        """
+
+        def __init__(self, target, buffer_records=256, interval_ms=100):
+            super().__init__(target)
+            self.buffer_records = max(int(buffer_records), 1)
+            self.interval_ms = interval_ms
+            self._local = threading.local()
+            self._buffers = []
+            self._buffers_lock = threading.Lock()
+            self.queue = queue.Queue()
+            self._closed = False
+            self._start_writer()
+
+        def _start_writer(self):
+            self._thread = threading.Thread(
+                target=self._run, name=f'teeLogger-buffer-writer-{id(self):x}', daemon=True,
+            )
+            self._thread.start()
+
+        def _after_fork(self):
+            # the writer thread did not survive the fork, and the buffers hold the parent's records
+            super()._after_fork()
+            self._local = threading.local()
+            self._buffers = []
+            self._buffers_lock = threading.Lock()
+            self.queue = queue.Queue()
+            self._start_writer()
+
+        def _run(self):
+            q = self.queue
+            interval = max(self.interval_ms, 1) / 1000
+            nextSweep = time.monotonic() + interval
+            while True:
+                try:
+                    chunk = q.get(timeout=max(nextSweep - time.monotonic(), 0))
+                except queue.Empty:
+                    pass
+                else:
+                    try:
+                        if chunk is None:
+                            return
+                        self._write(chunk)
+                    finally:
+                        q.task_done()
+                if time.monotonic() >= nextSweep:
+                    self._sweep()
+                    nextSweep = time.monotonic() + interval
+
+        def _write(self, chunk):
+            data, levelno, count, created = chunk
+            target = self.target
+            try:
+                target.write_message(target._payload_message(data), levelno, count, created)
+            except Exception:
+                target.handleError(logging.makeLogRecord({'msg': data, 'levelno': levelno}))
+
+        def _buffer(self):
+            try:
+                return self._local.buffer
+            except AttributeError:
+                buffer = self._local.buffer = _ThreadBuffer()
+                with self._buffers_lock:
+                    self._buffers.append(buffer)
+                return buffer
+
+        def _join(self, payloads):
+            separator = self.target._separator()
+            if isinstance(separator, str):
+                separator = separator.encode(self.target.encoding or 'utf-8')
+            return separator.join(payloads)
+
+        def _hand_off(self, buffer):
+            # the caller holds buffer.lock, so chunks of one thread stay in order
+            items = buffer.items
+            self.queue.put((self._join(items), buffer.levelno, len(items), buffer.created))
+            buffer.items = []
+            buffer.levelno = 0
+
+        def _add(self, payloads, levelno, created):
+            if self._forked():
+                self.acquire()
+                try:
+                    if self._forked():
+                        self._after_fork()
+                finally:
+                    self.release()
+            if self._closed:
+                self._write((self._join(payloads), levelno, len(payloads), created))
+                return
+            buffer = self._buffer()
+            with buffer.lock:
+                if not buffer.items:
+                    buffer.created = created
+                buffer.items.extend(payloads)
+                if levelno > buffer.levelno:
+                    buffer.levelno = levelno
+                flushOnLevel = self.target.flush_on_level
+                urgent = flushOnLevel is not None and levelno >= flushOnLevel
+                if len(buffer.items) >= self.buffer_records and not urgent:
+                    self._hand_off(buffer)
+            if urgent:
+                # write what every thread logged before this record along with it
+                self._sweep(last=buffer)
+
+        def _sweep(self, last=None):
+            # hand over partly filled buffers, ``last`` after all others, and
+            # forget the buffers of finished threads
+            with self._buffers_lock:
+                buffers = self._buffers
+                self._buffers = [b for b in buffers if b.items or b.thread.is_alive()]
+            if last is not None:
+                buffers = [b for b in buffers if b is not last] + [last]
+            for buffer in buffers:
+                with buffer.lock:
+                    if buffer.items:
+                        self._hand_off(buffer)
+
+        def handle(self, record):
+            # unlike logging.Handler.handle, do not serialise callers on self.lock
+            rv = self.filter(record)
+            if rv:
+                self.emit(record)
+            return rv
+
+        def emit(self, record):
+            try:
+                self._add([self.target._format_payload(record)], record.levelno, record.created)
+            except RecursionError:
+                raise
+            except Exception:
+                self.handleError(record)
+
+        def emit_fast(self, entry):
+            """Format a fast-path entry into this thread's buffer."""
+            if not isinstance(self.target.formatter, _TeeFormatter):
+                self.emit(_entry_record(entry))
+                return
+            try:
+                self._add([self.target._entry_payload(entry)], entry[2], entry[1])
+            except RecursionError:
+                raise
+            except Exception:
+                self.handleError(_entry_record(entry))
+
+        def emit_entries(self, entries):
+            """Format a batch of fast-path entries into this thread's buffer."""
+            if not entries:
+                return
+            if not isinstance(self.target.formatter, _TeeFormatter):
+                for entry in entries:
+                    self.emit(_entry_record(entry))
+                return
+            try:
+                target = self.target
+                self._add(
+                    [target._entry_payload(entry) for entry in entries],
+                    max(entry[2] for entry in entries), entries[0][1],
+                )
+            except RecursionError:
+                raise
+            except Exception:
+                self.handleError(_entry_record(entries[0]))
+
+        def flush(self):
+            """Block until every buffered record has been written and flushed."""
+            self._sweep()
+            if self._thread.is_alive():
+                self.queue.join()
+            self.target.flush()
+
+        def close(self):
+            """Write every buffered record, stop the writer thread, and close ``target``."""
+            self.acquire()
+            try:
+                if self._closed:
+                    return
+                self._closed = True
+            finally:
+                self.release()
+            if self._forked():
+                # buffered records belong to the parent
+                super().close()
+                return
+            self._sweep()
+            if self._thread.is_alive():
+                self.queue.put(None)
+                self._thread.join()
+            # records added by threads that raced with close()
+            self._sweep()
+            while True:
+                try:
+                    chunk = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if chunk is not None:
+                    self._write(chunk)
+            super().close()
+
+    class DedupHandler(_TeeHandlerWrapper):
+        """Collapse repeats of recent messages before they reach ``target``.
+
+        A record whose ``(level, caller file:line, message)`` matches one of
+        the last ``window`` distinct messages is counted instead of written.
+        The count is written, with the level and caller of the repeated
+        message, as ``last message repeated N times`` when the line written
+        just before it is that message, otherwise as ``message repeated N
+        times: <message>``. Counts are written when a new message arrives, on
+        ``flush()`` and ``close()``, and when a repeat arrives while the oldest
+        unreported one is ``report_interval_ms`` old. There is no timer: a run
+        of repeats followed by silence is reported by the next message,
+        ``flush()`` or ``close()``. Records with exception or stack info, and
+        records without a teeLogger caller label, are always written.
+
+        Args:
+            target: Handler that performs the actual write.
+            window: Distinct recent messages remembered (``1`` collapses only
+                consecutive repeats).
+            report_interval_ms: Age of the oldest unreported repeat at which the
+                next repeat writes the count.
+        """
+
+        def __init__(self, target, window=1, report_interval_ms=30000):
+            super().__init__(target)
+            self.window = max(int(window), 1)
+            self.report_interval_ms = report_interval_ms
+            self.suppressed = 0
+            # key -> [unreported repeats, last repeat entry, time of first unreported repeat]
+            self._recent = collections.OrderedDict()
+            # key of the message on the last line written; None after any other line
+            self._last_written = None
+
+        @staticmethod
+        def _key(levelno, location, msg):
+            filename, lineno = _caller_fields(location)
+            return (levelno, filename, lineno, msg if type(msg) is str else str(msg))
+
+        def _repeat_entry(self, key, site):
+            # the summary record for ``site``; the caller holds the handler lock
+            name, created, levelno, location, msg, process, threadName = site[1]
+            count = site[0]
+            site[0] = 0
+            if key == self._last_written:
+                text = f'last message repeated {count} times'
+            else:
+                text = f'message repeated {count} times: {msg}'
+            self._last_written = None
+            return (name, created, levelno, location, text, process, threadName)
+
+        def _after_fork(self):
+            # the parent reports the repeats it counted
+            super()._after_fork()
+            self._recent.clear()
+            self._last_written = None
+
+        def _filter(self, key, entry, out):
+            # append what to write for ``entry`` to ``out``; False if it is a repeat
+            if self._forked():
+                self._after_fork()
+            recent = self._recent
+            site = recent.get(key)
+            if site is not None:
+                if not site[0]:
+                    site[2] = entry[1]
+                site[0] += 1
+                site[1] = entry
+                self.suppressed += 1
+                recent.move_to_end(key)
+                if (entry[1] - site[2]) * 1000 >= self.report_interval_ms:
+                    out.append(self._repeat_entry(key, site))
+                return False
+            self._report_all(out)
+            recent[key] = [0, entry, entry[1]]
+            if len(recent) > self.window:
+                recent.popitem(last=False)
+            self._last_written = key
+            return True
+
+        def _report_all(self, out):
+            for key, site in self._recent.items():
+                if site[0]:
+                    out.append(self._repeat_entry(key, site))
+
+        def emit(self, record):
+            location = getattr(record, 'callerFileLocation', None)
+            if location is None or record.exc_info or record.stack_info:
+                self.acquire()
+                try:
+                    self._last_written = None
+                    self.target.handle(record)
+                finally:
+                    self.release()
+                return
+            try:
+                msg = record.getMessage()
+                key = self._key(record.levelno, location, msg)
+                entry = (record.name, record.created, record.levelno, location, msg, record.process, record.threadName)
+            except Exception:
+                self.handleError(record)
+                return
+            out = []
+            self.acquire()
+            try:
+                write = self._filter(key, entry, out)
+                if out:
+                    self.target.emit_entries(out)
+                if write:
+                    self.target.handle(record)
+            finally:
+                self.release()
+
+        def emit_fast(self, entry):
+            """Write a fast-path entry unless it repeats a recent message."""
+            key = self._key(entry[2], entry[3], entry[4])
+            out = []
+            self.acquire()
+            try:
+                if self._filter(key, entry, out):
+                    out.append(entry)
+                if out:
+                    self.target.emit_entries(out)
+            finally:
+                self.release()
+
+        def emit_entries(self, entries):
+            """Write a batch of fast-path entries with repeats collapsed."""
+            out = []
+            self.acquire()
+            try:
+                for entry in entries:
+                    if self._filter(self._key(entry[2], entry[3], entry[4]), entry, out):
+                        out.append(entry)
+                if out:
+                    self.target.emit_entries(out)
+            finally:
+                self.release()
+
+        def _report_pending(self):
+            out = []
+            self.acquire()
+            try:
+                if self._forked():
+                    self._after_fork()
+                self._report_all(out)
+                if out:
+                    self.target.emit_entries(out)
+            finally:
+                self.release()
+
+        def flush(self):
+            """Write pending repeat counts and flush ``target``."""
+            self._report_pending()
+            self.target.flush()
+
+        def close(self):
+            """Write pending repeat counts and close ``target``."""
+            self._report_pending()
+            super().close()
+
+    class SharedWriterHandler(_TeeHandlerWrapper):
+        """Funnel records from several processes into one log file.
+
+        The first process to lock ``lockPath`` becomes the owner: it writes
+        through ``target`` and accepts records from the other processes on a
+        Unix domain socket at ``socketPath``. Other processes format records
+        locally and send each one as a single length-prefixed frame, so lines
+        are never torn and the compressed file holds one stream. When the
+        owner closes, the next process that logs takes ownership; a process
+        forked from the owner becomes a client on its first record.
+
+        Args:
+            target: File handler used while this process owns the file. It
+                should be created with ``delay=True``.
+            socketPath: Path of the Unix domain socket.
+            lockPath: Path of the lock file used to elect the owner.
+        """
+        FRAME_HEADER = struct.Struct('!IH')
+        CONNECT_ATTEMPTS = 50
+
+        def __init__(self, target, socketPath, lockPath):
+            super().__init__(target)
+            self.socketPath = socketPath
+            self.lockPath = lockPath
+            self.isOwner = False
+            self._pid = os.getpid()
+            self._lock_fd = None
+            self._server = None
+            self._server_thread = None
+            self._sock = None
+            self._readers = []
+            self._closing = False
+            self._connect()
+
+        @staticmethod
+        def available():
+            """Return True if the platform supports Unix sockets and ``flock``."""
+            return fcntl is not None and hasattr(socket, 'AF_UNIX')
+
+        def _try_become_owner(self):
+            fd = _try_lock_file(self.lockPath)
+            if fd is None:
+                return False
+            self._lock_fd = fd
+            # we hold the lock, so any socket file left behind is stale
+            try:
+                os.unlink(self.socketPath)
+            except FileNotFoundError:
+                pass
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(self.socketPath)
+            server.listen(64)
+            server.settimeout(0.2)
+            self._server = server
+            self.isOwner = True
+            self._server_thread = threading.Thread(target=self._serve, name='teeLogger-shared-writer', daemon=True)
+            self._server_thread.start()
+            return True
+
+        def _connect(self):
+            for _ in range(self.CONNECT_ATTEMPTS):
+                if self._try_become_owner():
+                    return
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                try:
+                    sock.connect(self.socketPath)
+                    self._sock = sock
+                    return
+                except OSError:
+                    # the owner holds the lock but is not listening yet, or just exited
+                    sock.close()
+                    time.sleep(0.01)
+            raise OSError(f'Unable to reach the shared log writer at {self.socketPath}')
+
+        def _serve(self):
+            server = self._server
+            while True:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    # only stop once connections queued before close() are accepted
+                    if self._closing:
+                        return
+                    continue
+                except OSError:
+                    return
+                reader = threading.Thread(target=self._read_connection, args=(conn,), daemon=True)
+                self._readers.append(reader)
+                reader.start()
+
+        def _read_connection(self, conn):
+            header = self.FRAME_HEADER
+            buf = bytearray()
+            conn.settimeout(0.2)
+            with conn:
+                while True:
+                    try:
+                        chunk = conn.recv(1 << 16)
+                    except socket.timeout:
+                        if self._closing:
+                            return
+                        continue
+                    except OSError:
+                        return
+                    if not chunk:
+                        return
+                    buf += chunk
+                    offset = 0
+                    while len(buf) - offset >= header.size:
+                        length, levelno = header.unpack_from(buf, offset)
+                        end = offset + header.size + length
+                        if len(buf) < end:
+                            break
+                        self.target.write_message(
+                            self.target._payload_message(bytes(buf[offset + header.size:end])), levelno,
+                        )
+                        offset = end
+                    del buf[:offset]
+
+        def _owner_hung_up(self):
+            # The owner never sends data, so a readable socket means it closed
+            # the connection; sending into it would silently lose the record.
+            try:
+                return self._sock.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) == b''
+            except BlockingIOError:
+                return False
+
+        def _after_fork(self):
+            # The parent keeps the lock, the sockets and the open log stream.
+            self._detach()
+            self._pid = os.getpid()
+            self.isOwner = False
+            self._readers = []
+            self._connect()
+
+        def _detach(self):
+            # Let go of what the parent owns without touching it: no socket
+            # unlink, no flush or trailer on the inherited stream.
+            for fileobj in (self._server, self._sock):
+                if fileobj is not None:
+                    fileobj.close()
+            self._server = self._sock = None
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+                self._lock_fd = None
+            self.target._detach_stream()
+
+        def emit(self, record):
+            try:
+                if self._pid != os.getpid():
+                    self._after_fork()
+                if self.isOwner:
+                    self.target.handle(record)
+                    return
+                self._send(self.target._format_payload(record), record.levelno)
+            except RecursionError:
+                raise
+            except Exception:
+                self.handleError(record)
+
+        def emit_fast(self, entry):
+            """Write or forward a fast-path entry without building a record."""
+            try:
+                if self._pid != os.getpid():
+                    self._after_fork()
+                if self.isOwner:
+                    self.target.emit_fast(entry)
+                    return
+                if not isinstance(self.target.formatter, _TeeFormatter):
+                    self.emit(_entry_record(entry))
+                    return
+                self._send(self.target._entry_payload(entry), entry[2])
+            except RecursionError:
+                raise
+            except Exception:
+                self.handleError(_entry_record(entry))
+
+        def emit_entries(self, entries):
+            """Write or forward a batch of fast-path entries as one frame."""
+            if not entries:
+                return
+            try:
+                if self._pid != os.getpid():
+                    self._after_fork()
+                if self.isOwner:
+                    self.target.emit_entries(entries)
+                    return
+                target = self.target
+                if not isinstance(target.formatter, _TeeFormatter):
+                    for entry in entries:
+                        self.emit(_entry_record(entry))
+                    return
+                separator = target._separator()
+                if isinstance(separator, str):
+                    separator = separator.encode(target.encoding or 'utf-8')
+                self._send(
+                    separator.join(target._entry_payload(entry) for entry in entries),
+                    max(entry[2] for entry in entries),
+                )
+            except RecursionError:
+                raise
+            except Exception:
+                self.handleError(_entry_record(entries[0]))
+
+        def _send(self, payload, levelno):
+            frame = self.FRAME_HEADER.pack(len(payload), levelno) + payload
+            try:
+                if self._owner_hung_up():
+                    raise ConnectionResetError('shared log writer closed the connection')
+                self._sock.sendall(frame)
+            except OSError:
+                # the owner went away: reconnect, possibly becoming the owner
+                self._sock.close()
+                self._sock = None
+                self._connect()
+                if self.isOwner:
+                    self.target.write_message(self.target._payload_message(payload), levelno)
+                else:
+                    self._sock.sendall(frame)
+
+        def close(self):
+            """Stop serving other processes, release ownership, and close ``target``.
+
+            In a process forked from the owner that never logged, only the
+            inherited descriptors are dropped; the owner keeps its socket and
+            its file.
+            """
+            self.acquire()
+            try:
+                if self._closing:
+                    return
+                self._closing = True
+            finally:
+                self.release()
+            if self._forked():
+                self._detach()
+                super().close()
+                return
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+            if self._server is not None:
+                self._server_thread.join()
+                for reader in self._readers:
+                    reader.join(1)
+                self._server.close()
+                self._server = None
+                try:
+                    os.unlink(self.socketPath)
+                except OSError:
+                    pass
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+                self._lock_fd = None
+            super().close()
+
     def __init__(self, systemLogFileDir='.', programName=None, compressLogAfterMonths=2, 
                  deleteLogAfterYears=2, suppressPrintout=..., fileDescriptorLength=15,
                  noLog=False,callerStackDepth=-1,disable_colors=False, encoding = None,
                  in_place_compression = None, collapse_single_day_logs = ...,compression_level=...,
-                 binary_mode = True):
+                 binary_mode = True, async_mode = False, async_queue_size = 10000,
+                 async_overflow = 'block', flush_every_n_records = 1, flush_interval_ms = 0,
+                 flush_on_level = logging.WARNING, level = logging.DEBUG, shared_writer = False,
+                 rollover_at_midnight = True, max_log_bytes = 0, archive_workers = None,
+                 archive_threads = 0, archive_format = 'xz', archive_level = None,
+                 fast_path = False, mmap_extent_bytes = 0, frame_every_n_records = 0,
+                 frame_every_n_bytes = 0, frame_interval_ms = 0, seekable_index = False,
+                 output_format = 'text', thread_buffer_records = 0, console_refresh_ms = 0,
+                 console_coalesce = True, sample_rate = 1.0, rate_limit = 0, rate_limit_burst = 0,
+                 limit_summary_interval_ms = 60000, dedup_window = 0, compression_cpu_budget = 0,
+                 zstd_dictionary = None):
         """Initialize handlers, log paths, and run log maintenance if needed."""
         if suppressPrintout is ...:
             # determine if we want to suppress printout by if the output is a terminal
@@ -581,9 +3477,66 @@ class teeLogger:
             else:
                 collapse_single_day_logs = False
         self.collapse_single_day_logs = collapse_single_day_logs
+        self.async_mode = async_mode
+        self.async_queue_size = async_queue_size
+        if async_overflow not in self.AsyncQueueHandler.OVERFLOW_POLICIES:
+            printWithColor(f'Invalid async_overflow {async_overflow}, using block instead', 'warning',disable_colors=self.disable_colors)
+            async_overflow = 'block'
+        self.async_overflow = async_overflow
+        self.flush_every_n_records = flush_every_n_records
+        self.flush_interval_ms = flush_interval_ms
+        self.flush_on_level = flush_on_level
+        if shared_writer and not self.SharedWriterHandler.available():
+            printWithColor('shared_writer needs Unix domain sockets and fcntl, disabling it', 'warning',disable_colors=self.disable_colors)
+            shared_writer = False
+        self.shared_writer = shared_writer
+        self.rollover_at_midnight = rollover_at_midnight
+        self.max_log_bytes = max_log_bytes
+        self.archive_workers = archive_workers
+        self.archive_threads = archive_threads
+        normalized_archive_format = _normalize_archive_format(archive_format)
+        if normalized_archive_format is None:
+            printWithColor(f'Invalid archive_format {archive_format}, using xz instead', 'warning',disable_colors=self.disable_colors)
+            normalized_archive_format = 'xz'
+        self.archive_format = normalized_archive_format
+        self.archive_level = archive_level
+        self.fast_path = fast_path
+        if mmap_extent_bytes and not in_place_compression and (collapse_single_day_logs or shared_writer):
+            printWithColor('mmap_extent_bytes needs a log file with a single writer, not supported with collapse_single_day_logs or shared_writer, disabling it', 'warning',disable_colors=self.disable_colors)
+            mmap_extent_bytes = 0
+        self.mmap_extent_bytes = mmap_extent_bytes
+        self.frame_every_n_records = frame_every_n_records
+        self.frame_every_n_bytes = frame_every_n_bytes
+        self.frame_interval_ms = frame_interval_ms
+        self.seekable_index = seekable_index
+        if output_format not in _OUTPUT_FORMATTERS:
+            printWithColor(f'Invalid output_format {output_format}, using text instead', 'warning',disable_colors=self.disable_colors)
+            output_format = 'text'
+        self.output_format = output_format
+        if output_format == 'binary':
+            binary_mode = True
+        if thread_buffer_records and shared_writer:
+            printWithColor('thread_buffer_records is not supported with shared_writer, disabling it', 'warning',disable_colors=self.disable_colors)
+            thread_buffer_records = 0
+        self.thread_buffer_records = thread_buffer_records
+        self.dedup_window = dedup_window
+        self.compression_cpu_budget = compression_cpu_budget
+        self.zstd_dictionary = zstd_dictionary
+        self._batch_local = threading.local()
+        self._aio = None
+        self._aio_lock = threading.Lock()
+        self._limiter = _CallSiteLimiter(sample_rate, rate_limit, rate_limit_burst, limit_summary_interval_ms)
+        self._limits_enabled = sample_rate < 1 or bool(rate_limit)
+        self.console_refresh_ms = console_refresh_ms
+        self.console_coalesce = console_coalesce
+        self._console = None
+        if console_refresh_ms and not suppressPrintout:
+            self._console = _ConsoleSink(console_refresh_ms, console_coalesce, disable_colors)
+        self.logHandler = None
+        self.maintenanceThread = None
         self.version = version
         self.logger = logging.getLogger(self.name)
-        self.logger.setLevel(logging.DEBUG)
+        self.setLevel(level)
         self.logger.propagate = False
         self._clear_file_handlers()
         if systemLogFileDir in ['/dev/null', '/dev/stdout', '/dev/stderr']:
@@ -640,17 +3593,51 @@ class teeLogger:
 
     def _clear_file_handlers(self):
         for handler in list(self.logger.handlers):
-            if isinstance(handler, logging.FileHandler):
+            if isinstance(handler, (logging.FileHandler, _TeeHandlerWrapper)):
                 self.logger.removeHandler(handler)
                 handler.close()
 
-    def _make_log_handler(self, binary_mode, compression_level):
+    def setLevel(self, level):
+        """Set the minimum level (number or name) written to the log file."""
+        self.logger.setLevel(level.upper() if isinstance(level, str) else level)
+        self.level = self.logger.level
+
+    def close(self):
+        """Flush pending records and close this logger's file handlers."""
+        aio = self._aio
+        if aio is not None:
+            aio.close()
+            self._aio = None
+        summaries = self._limiter.take_summaries(force=True)
+        if summaries:
+            self._log_limit_summaries(summaries)
+        if self._console is not None:
+            self._console.close()
+            self._console = None
+        self._clear_file_handlers()
+        self.logHandler = None
+
+    @property
+    def aio(self):
+        """``AsyncTeeLogger`` facade for use inside coroutines, created on first use."""
+        aio = self._aio
+        if aio is None:
+            with self._aio_lock:
+                aio = self._aio
+                if aio is None:
+                    aio = self._aio = AsyncTeeLogger(self)
+        return aio
+
+    def _make_log_handler(self, binary_mode, compression_level, delay=False):
         compressed_latest_log_name = None
+        indexed = bool(self.in_place_compression and self.seekable_index)
+        # indexed handlers open lazily so the first frame's offset is recorded
+        delay = delay or indexed
         if self.in_place_compression == 'gzip':
             self.logFileName += '.gz'
             compressed_latest_log_name = '.gz'
             handler = self.GZipFileHandler(
-                self.logFileName, encoding=self.encoding, mode='ab' if binary_mode else 'a',
+                self.logFileName, encoding=self.encoding, mode='ab' if binary_mode else 'a', delay=delay,
             )
             if compression_level is not ...:
                 handler.compresslevel = compression_level
@@ -658,7 +3645,7 @@ class teeLogger:
             self.logFileName += '.bz2'
             compressed_latest_log_name = '.bz2'
             handler = self.BZ2FileHandler(
-                self.logFileName, encoding=self.encoding, mode='ab' if binary_mode else 'a',
+                self.logFileName, encoding=self.encoding, mode='ab' if binary_mode else 'a', delay=delay,
             )
             if compression_level is not ...:
                 handler.compresslevel = compression_level
@@ -666,7 +3653,7 @@ class teeLogger:
             self.logFileName += '.xz'
             compressed_latest_log_name = '.xz'
             handler = self.XZFileHandler(
-                self.logFileName, encoding=self.encoding, mode='ab' if binary_mode else 'a',
+                self.logFileName, encoding=self.encoding, mode='ab' if binary_mode else 'a', delay=delay,
             )
             if compression_level is not ...:
                 handler.preset = compression_level
@@ -674,48 +3661,223 @@ class teeLogger:
             self.logFileName += '.zst'
             compressed_latest_log_name = '.zst'
             handler = self.ZSTDFileHandler(
-                self.logFileName, encoding=self.encoding, mode='ab' if binary_mode else 'a',
+                self.logFileName, encoding=self.encoding, mode='ab' if binary_mode else 'a', delay=delay,
             )
             if compression_level is not ...:
                 handler.level = compression_level
+            if self.zstd_dictionary:
+                handler.zstd_dict = self._load_zstd_dictionary()
+        elif self.mmap_extent_bytes:
+            handler = self.MMapFileHandler(
+                self.logFileName, encoding=self.encoding, delay=delay, extent_size=self.mmap_extent_bytes,
+            )
         else:
             handler = self.BinFileHandler(
-                self.logFileName, encoding=self.encoding, mode='ab' if binary_mode else 'a',
+                self.logFileName, encoding=self.encoding, mode='ab' if binary_mode else 'a', delay=delay,
+            )
+        handler.set_flush_policy(
+            flush_every_n_records=self.flush_every_n_records,
+            flush_interval_ms=self.flush_interval_ms,
+            flush_on_level=self.flush_on_level,
+        )
+        if self.in_place_compression:
+            frame_every_n_bytes = self.frame_every_n_bytes
+            framesNeeded = indexed or self.compression_cpu_budget
+            if framesNeeded and not (self.frame_every_n_records or frame_every_n_bytes or self.frame_interval_ms):
+                frame_every_n_bytes = 1024 * 1024
+            handler.set_frame_policy(
+                frame_every_n_records=self.frame_every_n_records,
+                frame_every_n_bytes=frame_every_n_bytes,
+                frame_interval_ms=self.frame_interval_ms,
             )
+            if indexed:
+                handler.enable_index()
+        if self.rollover_at_midnight or self.max_log_bytes:
+            handler.rollover_callback = self._rollover
+            handler.rollover_at = self._next_midnight() if self.rollover_at_midnight else 0
+            handler.max_bytes = self.max_log_bytes
         return handler, compressed_latest_log_name
 
+    def _load_zstd_dictionary(self):
+        # the ZstdDict named by ``zstd_dictionary``, or None with a warning
+        from compression import zstd
+        path = self.zstd_dictionary
+        if path is True:
+            prefix = self.name + '_'
+            try:
+                candidates = [
+                    os.path.join(self.logsDir, name) for name in os.listdir(self.logsDir)
+                    if name.startswith(prefix) and name.endswith('.zdict')
+                ]
+            except OSError:
+                candidates = []
+            if not candidates:
+                printWithColor(f'No trained zstd dictionary found in {self.logsDir}, compressing without one', 'warning',disable_colors=self.disable_colors)
+                return None
+            path = max(candidates, key=os.path.getmtime)
+        try:
+            with open(path, 'rb') as fh:
+                return zstd.ZstdDict(fh.read())
+        except (OSError, zstd.ZstdError) as e:
+            printWithColor(f'Cannot load zstd dictionary {path}: {e}, compressing without one', 'warning',disable_colors=self.disable_colors)
+            return None
+
+    def _shared_writer_paths(self):
+        lockPath = os.path.join(self.logsDir, f'.{self.name}_writer.lock')
+        socketPath = os.path.join(self.logsDir, f'.{self.name}_writer.sock')
+        if len(os.fsencode(socketPath)) > 100:
+            # Unix socket paths are limited to ~108 bytes
+            digest = hashlib.sha1(os.fsencode(socketPath)).hexdigest()[:16]
+            socketPath = os.path.join(tempfile.gettempdir(), f'teeLogger-{digest}.sock')
+        return socketPath, lockPath
+
     def _link_latest_log(self, latest_log_name, compressed_suffix=None):
         if os.name == 'nt':
             return
         if compressed_suffix:
             latest_log_name = latest_log_name + compressed_suffix
-        if os.path.islink(latest_log_name):
-            os.unlink(latest_log_name)
-        if os.path.exists(latest_log_name):
-            os.remove(latest_log_name)
-        os.symlink(os.path.relpath(self.logFileName, self.logsDir), latest_log_name)
+        # create the new link beside the old one and rename it over, so readers
+        # never see a missing or half-updated latest link
+        tmp_link_name = f'{latest_log_name}.{os.getpid()}.tmp'
+        if os.path.lexists(tmp_link_name):
+            os.unlink(tmp_link_name)
+        os.symlink(os.path.relpath(self.logFileName, self.logsDir), tmp_link_name)
+        os.replace(tmp_link_name, latest_log_name)
+
+    @staticmethod
+    def _next_midnight():
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        return datetime.datetime.combine(tomorrow, datetime.time.min).timestamp()
+
+    def _rollover(self, handler):
+        """Pick the next log file for ``handler`` and update paths and the latest link.
+
+        Called by the file handler (under its lock) at midnight or when
+        ``max_log_bytes`` is reached. A day change starts a new ``YYYY-MM-DD``
+        folder and hands the retired one to ``start_maintenance()``.
+        """
+        previousLogFileDir = self.logFileDir
+        self.currentDateTime = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        day = self.currentDateTime.partition("_")[0]
+        self.logFileDir = os.path.join(self.logsDir, day)
+        newDay = self.logFileDir != previousLogFileDir
+        os.makedirs(self.logFileDir, exist_ok=True)
+        suffix = self._compressed_suffix or ''
+        if self.collapse_single_day_logs:
+            stem = os.path.join(self.logFileDir, self.name + '_' + day)
+        else:
+            stem = os.path.join(self.logFileDir, self.name + '_' + self.currentDateTime)
+        logFileName = stem + '.log' + suffix
+        if not (newDay and self.collapse_single_day_logs):
+            # size rollover, or a same-second timestamped name: never append to an old file
+            counter = 1
+            while os.path.exists(logFileName) or logFileName == self.logFileName:
+                logFileName = f'{stem}_{counter}.log{suffix}'
+                counter += 1
+        self.logFileName = logFileName
+        self._link_latest_log(self._latest_log_name, self._compressed_suffix)
+        if self.rollover_at_midnight:
+            handler.rollover_at = self._next_midnight()
+        if newDay:
+            self.start_maintenance()
+        return logFileName
 
     def _setup_file_logging(self, programName, binary_mode, compression_level):
         latest_log_name = os.path.join(self.logsDir, programName + '_latest.log')
         if not os.path.exists(self.logFileDir):
             os.makedirs(self.logFileDir)
-        handler, compressed_suffix = self._make_log_handler(binary_mode, compression_level)
-        formatter = logging.Formatter(
-            '%(asctime)s [%(levelname)-8s] [%(callerFileLocation)s] %(message)s',
-        )
-        handler.setFormatter(formatter)
+        handler, compressed_suffix = self._make_log_handler(binary_mode, compression_level, delay=self.shared_writer)
+        self._latest_log_name = latest_log_name
+        self._compressed_suffix = compressed_suffix
+        handler.setFormatter(_OUTPUT_FORMATTERS[self.output_format]())
+        if self.output_format == 'binary':
+            # binary records carry their own length prefix
+            handler.terminator = ''
+        fileHandler = handler
+        if self.shared_writer:
+            handler = self.SharedWriterHandler(handler, *self._shared_writer_paths())
+        if self.thread_buffer_records:
+            handler = self.ThreadBufferHandler(
+                handler, buffer_records=self.thread_buffer_records,
+                interval_ms=self.flush_interval_ms or 100,
+            )
+        elif self.async_mode:
+            handler = self.AsyncQueueHandler(
+                handler, maxsize=self.async_queue_size, overflow=self.async_overflow,
+            )
+        if self.in_place_compression and self.compression_cpu_budget:
+            backlog = None
+            if isinstance(handler, (self.ThreadBufferHandler, self.AsyncQueueHandler)):
+                backlog = handler.queue.qsize
+            fileHandler.set_adaptive_level(self.compression_cpu_budget, backlog=backlog)
+        if self.dedup_window:
+            handler = self.DedupHandler(handler, window=self.dedup_window)
+        self.logHandler = handler
         self.logger.addHandler(handler)
         self._link_latest_log(latest_log_name, compressed_suffix)
         printWithColor('Log file: ' + self.logFileName, 'info', disable_colors=self.disable_colors)
-        self.cleanup_old_logs()
+        self.start_maintenance()
+
+    def start_maintenance(self, wait=False):
+        """Run ``cleanup_old_logs`` on a daemon thread and return the thread.
+
+        Called automatically when file logging starts and after a midnight
+        rollover, so constructing a logger never waits on archival. Work that
+        is cut short by interpreter exit is picked up by the next run.
+
+        Args:
+            wait: Join the thread before returning.
+
+        Returns:
+            The ``threading.Thread`` (also stored as ``maintenanceThread``), or
+            ``None`` when file logging is disabled.
+        """
+        if self.noLog:
+            return None
+        thread = threading.Thread(target=self._run_maintenance, name='teeLogger-maintenance', daemon=True)
+        self.maintenanceThread = thread
+        thread.start()
+        if wait:
+            thread.join()
+        return thread
+
+    def _run_maintenance(self):
+        # maintenance thread target: report failures instead of letting the thread die with a traceback
+        try:
+            self.cleanup_old_logs()
+        except Exception as e:
+            if sys.is_finalizing():
+                # the interpreter is tearing down modules under the daemon thread
+                return
+            with contextlib.suppress(Exception):
+                printWithColor(f'Log maintenance failed due to {e}', 'error', disable_colors=self.disable_colors)
 
     def cleanup_old_logs(self):
-        """Compress or delete day-folders under ``logsDir`` based on age settings."""
+        """Compress or delete day-folders under ``logsDir`` based on age settings.
+
+        Runs synchronously; use ``start_maintenance()`` to run it in the
+        background. A lock file in ``logsDir`` ensures only one process or
+        thread maintains a log tree at a time; others return immediately.
+        """
         if self.noLog:
             return
         if not os.path.isdir(self.logsDir):
             return
+        try:
+            lock_fd = _try_lock_file(os.path.join(self.logsDir, f'.{self.name}_maintenance.lock'))
+        except OSError as e:
+            printWithColor(f'Failed to lock {self.logsDir} for maintenance due to {e}', 'error', disable_colors=self.disable_colors)
+            return
+        if lock_fd is None:
+            return
+        try:
+            self._cleanup_old_logs()
+        finally:
+            os.close(lock_fd)
+
+    def _cleanup_old_logs(self):
         pending_tasks = []
+        pending_folders = []
         for dirName in os.listdir(self.logsDir):
             dir_key = _log_dir_date_key(dirName)
             if not re.match(r'^\d{4}-\d{2}-\d{2}$', dir_key):
@@ -727,6 +3889,11 @@ class teeLogger:
             try:
                 dirTime = dateutil.parser.parse(dir_key).timestamp()
             except Exception:
+                try:
+                    dirTime = datetime.datetime.strptime(dir_key, '%Y-%m-%d').timestamp()
+                except Exception:
+                    dirTime = None
+            if dirTime is None:
                 try:
                     mtime = os.path.getmtime(currentPath)
                     ctime = os.path.getctime(currentPath)
@@ -742,90 +3909,412 @@ class teeLogger:
                 self.teelog(f'Deleting log dir {dirName} as it is older than {self.deleteLogAfterYears} years', 'info')
                 remove_function = shutil.rmtree if os.path.isdir(currentPath) else os.remove
                 pending_tasks.append((remove_function, (currentPath,), {}))
-            elif self.compressLogAfterMonths != 0 and not dirName.endswith('.tar.xz') and datetime.datetime.now().timestamp() - dirTime > self.compressLogAfterMonths * 30 * 24 * 3600:
+            elif self.compressLogAfterMonths != 0 and dir_key == dirName and datetime.datetime.now().timestamp() - dirTime > self.compressLogAfterMonths * 30 * 24 * 3600:
                 self.teelog(f'Compressing log dir {dirName} as it is older than {self.compressLogAfterMonths} months', 'info')
-                pending_tasks.append((
-                    compress_folder,
-                    (currentPath,),
-                    {'disable_colors': self.disable_colors},
-                ))
-        if not pending_tasks:
+                pending_folders.append(currentPath)
+        for func, args, kwargs in pending_tasks:
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                printWithColor(f'Log maintenance on {args[0]} failed due to {e}', 'error', disable_colors=self.disable_colors)
+        compress_folders(
+            pending_folders,
+            max_workers=self.archive_workers,
+            threads=self.archive_threads,
+            disable_colors=self.disable_colors,
+            archive_format=self.archive_format,
+            level=self.archive_level,
+        )
+
+
+    def log_with_caller_info(self, level, msg, callerStackDepth=..., sample_rate=..., rate_limit=...):
+        """Write ``msg`` at ``level`` with abbreviated caller file/line metadata.
+
+        Records below the logger level return before the stack is walked, and
+        the ``filename:line`` label is only abbreviated when the record is
+        formatted. With ``fast_path`` the record goes straight to
+        ``logHandler`` instead of through ``logging.Logger``. ``sample_rate``
+        and ``rate_limit`` override the logger-wide call-site limits for
+        this call.
+        """
+        if self.noLog:
             return
-        from concurrent.futures import ProcessPoolExecutor
-        with ProcessPoolExecutor(max_workers=1) as executor:
-            for func, args, kwargs in pending_tasks:
-                executor.submit(func, *args, **kwargs)
+        levelno = _LOG_LEVELS.get(level, logging.INFO)
+        if not self.logger.isEnabledFor(levelno):
+            return
+        if callerStackDepth == ...:
+            callerStackDepth = self.callerStackDepth
+        location = _lazy_caller_location(i=callerStackDepth, target_length=self.fileDescriptorLength)
+        if self._limits_enabled or sample_rate is not ... or rate_limit is not ...:
+            if not self._allow(levelno, location, sample_rate, rate_limit):
+                return
+        self._emit(levelno, location, msg)
+
+    def _allow(self, levelno, location, sample_rate, rate_limit):
+        # apply the call-site limits, writing any summaries that are due first
+        allowed = self._limiter.allow((location.filename, location.lineno), levelno, sample_rate, rate_limit)
+        summaries = self._limiter.take_summaries()
+        if summaries:
+            self._log_limit_summaries(summaries)
+        return allowed
+
+    def _log_limit_summaries(self, summaries):
+        elapsed, sites = summaries
+        for (filename, lineno), suppressed, levelno in sites:
+            self._emit(
+                levelno, _CallerFileLocation(filename, lineno, self.fileDescriptorLength),
+                f'{suppressed} records from this call site suppressed by sampling/rate limits in the last {elapsed:.1f}s',
+            )
 
+    def _emit(self, levelno, location, msg):
+        pending = getattr(self._batch_local, 'entries', None)
+        if pending is not None or (self.fast_path and self.logHandler is not None):
+            if self.output_format == 'text':
+                entry = (self.logger.name, time.time(), levelno, location, msg, None, None)
+            else:
+                entry = (self.logger.name, time.time(), levelno, location, msg, os.getpid(), threading.current_thread().name)
+            if pending is not None:
+                pending.append(entry)
+            else:
+                self.logHandler.emit_fast(entry)
+            return
+        self.logger.log(levelno, msg, extra={'callerFileLocation': location})
 
-    def log_with_caller_info(self, level, msg, callerStackDepth=...):
-        """Write ``msg`` at ``level`` with abbreviated caller file/line metadata."""
+    def _log_batch(self, level, msgs, callerStackDepth):
         if self.noLog:
             return
+        levelno = _LOG_LEVELS.get(level, logging.INFO)
+        if not self.logger.isEnabledFor(levelno):
+            return
         if callerStackDepth == ...:
             callerStackDepth = self.callerStackDepth
-        filename, lineno = getCallerInfo(i=callerStackDepth)
-        extra = {'callerFileLocation': abbreviate_filename(filename, lineno, target_length=self.fileDescriptorLength)}
-        logger = self.logger
-        if level == 'info':
-            logger.info(msg, extra=extra)
-        elif level == 'debug':
-            logger.debug(msg, extra=extra)
-        elif level == 'warning':
-            logger.warning(msg, extra=extra)
-        elif level == 'error':
-            logger.error(msg, extra=extra)
-        elif level == 'critical':
-            logger.critical(msg, extra=extra)
+        location = _lazy_caller_location(i=callerStackDepth, target_length=self.fileDescriptorLength)
+        name = self.logger.name
+        created = time.time()
+        if self.output_format == 'text':
+            process = threadName = None
         else:
-            logger.info(msg, extra=extra)
+            process, threadName = os.getpid(), threading.current_thread().name
+        entries = [(name, created, levelno, location, msg, process, threadName) for msg in msgs]
+        pending = getattr(self._batch_local, 'entries', None)
+        if pending is not None:
+            pending.extend(entries)
+        else:
+            self._emit_entries(entries)
+
+    def _emit_entries(self, entries):
+        handler = self.logHandler
+        if handler is not None:
+            handler.emit_entries(entries)
+            return
+        for entry in entries:
+            self.logger.log(entry[2], entry[4], extra={'callerFileLocation': entry[3]})
+
+    def log_batch(self, level, msgs, callerStackDepth=...):
+        """Log every message in ``msgs`` at ``level`` as one batch.
+
+        The caller is resolved once and all lines share one timestamp. The
+        lines are formatted into a single buffer and written to ``logHandler``
+        under one lock acquisition with one flush check, bypassing
+        ``logging.Logger`` like ``fast_path``.
+
+        Args:
+            level: Level name, as for ``log``.
+            msgs: Iterable of messages; each becomes one log line.
+            callerStackDepth: Same as for ``log``.
+        """
+        self._log_batch(level, msgs, callerStackDepth)
+
+    def info_many(self, msgs, callerStackDepth=...):
+        """Log every message in ``msgs`` at info level as one batch; see ``log_batch``."""
+        self._log_batch('info', msgs, callerStackDepth)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Collect records logged by this thread and write them as one batch on exit.
 
-    def teeok(self, msg, callerStackDepth=...):
+        Each call keeps its own level, caller and timestamp; console output
+        is not delayed. Nested ``batch()`` blocks write once, when the
+        outermost block exits.
+
+        Examples:
+            >>> tl = teeLogger(noLog=True, suppressPrintout=True, programName='batch_doc')
+            >>> with tl.batch():
+            ...     tl.info('first')
+            ...     tl.error('second')
+        """
+        local = self._batch_local
+        if getattr(local, 'entries', None) is not None:
+            yield
+            return
+        local.entries = []
+        try:
+            yield
+        finally:
+            entries = local.entries
+            local.entries = None
+            if entries:
+                self._emit_entries(entries)
+
+    def _print(self, msg, level):
+        console = self._console
+        if console is not None:
+            console.write(msg, level)
+        else:
+            printWithColor(msg, level, disable_colors=self.disable_colors)
+
+    def teeok(self, msg, callerStackDepth=..., sample_rate=..., rate_limit=...):
         """Print ``msg`` in green and log it at info level."""
         if not self.suppressPrintout:
-            printWithColor(msg, 'okgreen',disable_colors=self.disable_colors)
-        self.log_with_caller_info('info', msg=msg, callerStackDepth=callerStackDepth)
+            self._print(msg, 'okgreen')
+        self.log_with_caller_info('info', msg=msg, callerStackDepth=callerStackDepth,
+                                  sample_rate=sample_rate, rate_limit=rate_limit)
 
-    def printTable(self, data, callerStackDepth=..., header=None):
+    def printTable(self, data, callerStackDepth=..., header=None, sample_rate=..., rate_limit=...):
         """Format ``data`` as a table, print it, and log it at info level."""
         tableStr = pretty_format_table(data, header=header)
         if not self.suppressPrintout:
-            printWithColor(tableStr, 'info',disable_colors=self.disable_colors)
-        self.log_with_caller_info('info', msg='\n' + tableStr, callerStackDepth=callerStackDepth)
+            self._print(tableStr, 'info')
+        self.log_with_caller_info('info', msg='\n' + tableStr, callerStackDepth=callerStackDepth,
+                                  sample_rate=sample_rate, rate_limit=rate_limit)
 
-    def ok(self, msg, callerStackDepth=...):
+    def ok(self, msg, callerStackDepth=..., sample_rate=..., rate_limit=...):
         """Log ``msg`` at info level without printing to stdout."""
-        self.log_with_caller_info('info', msg=msg, callerStackDepth=callerStackDepth)
+        self.log_with_caller_info('info', msg=msg, callerStackDepth=callerStackDepth,
+                                  sample_rate=sample_rate, rate_limit=rate_limit)
 
-    def teeprint(self, msg, callerStackDepth=...):
+    def teeprint(self, msg, callerStackDepth=..., sample_rate=..., rate_limit=...):
         """Print ``msg`` and log it at info level."""
         if not self.suppressPrintout:
-            printWithColor(msg, 'info',disable_colors=self.disable_colors)
-        self.log_with_caller_info('info', msg=msg, callerStackDepth=callerStackDepth)
+            self._print(msg, 'info')
+        self.log_with_caller_info('info', msg=msg, callerStackDepth=callerStackDepth,
+                                  sample_rate=sample_rate, rate_limit=rate_limit)
 
-    def info(self, msg, callerStackDepth=...):
+    def info(self, msg, callerStackDepth=..., sample_rate=..., rate_limit=...):
         """Log ``msg`` at info level (file only unless ``suppressPrintout`` is False)."""
-        self.log_with_caller_info('info', msg=msg, callerStackDepth=callerStackDepth)
+        self.log_with_caller_info('info', msg=msg, callerStackDepth=callerStackDepth,
+                                  sample_rate=sample_rate, rate_limit=rate_limit)
 
-    def teeerror(self, msg, callerStackDepth=...):
+    def teeerror(self, msg, callerStackDepth=..., sample_rate=..., rate_limit=...):
         """Print ``msg`` as an error and log it at error level."""
         if not self.suppressPrintout:
-            printWithColor(msg, 'error',disable_colors=self.disable_colors)
-        self.log_with_caller_info('error', msg, callerStackDepth=callerStackDepth)
+            self._print(msg, 'error')
+        self.log_with_caller_info('error', msg, callerStackDepth=callerStackDepth,
+                                  sample_rate=sample_rate, rate_limit=rate_limit)
 
-    def error(self, msg, callerStackDepth=...):
+    def error(self, msg, callerStackDepth=..., sample_rate=..., rate_limit=...):
         """Log ``msg`` at error level without printing to stdout."""
-        self.log_with_caller_info('error', msg, callerStackDepth=callerStackDepth)
+        self.log_with_caller_info('error', msg, callerStackDepth=callerStackDepth,
+                                  sample_rate=sample_rate, rate_limit=rate_limit)
 
-    def teelog(self, msg, level, callerStackDepth=...):
+    def teelog(self, msg, level, callerStackDepth=..., sample_rate=..., rate_limit=...):
         """Print ``msg`` with ``level`` styling and log at ``level``."""
         if not self.suppressPrintout:
-            printWithColor(msg, level,disable_colors=self.disable_colors)
-        self.log_with_caller_info(level, msg, callerStackDepth=callerStackDepth)
+            self._print(msg, level)
+        self.log_with_caller_info(level, msg, callerStackDepth=callerStackDepth,
+                                  sample_rate=sample_rate, rate_limit=rate_limit)
+
+
+    def log(self, msg, level, callerStackDepth=..., sample_rate=..., rate_limit=...):
+        """Log ``msg`` at the given ``level`` without printing to stdout."""
+        self.log_with_caller_info(level, msg, callerStackDepth=callerStackDepth,
+                                  sample_rate=sample_rate, rate_limit=rate_limit)
+
+def _resolve_future(loop, future):
+    # complete ``future`` on its loop from the writer thread
+    def resolve():
+        if not future.done():
+            future.set_result(None)
+    try:
+        loop.call_soon_threadsafe(resolve)
+    except RuntimeError:
+        # the loop was closed while we were flushing
+        pass
+
+class AsyncTeeLogger:
+    """asyncio-friendly facade over a ``teeLogger``, usually reached as ``tl.aio``.
+
+    The logging methods mirror ``teeLogger``'s and never block the event
+    loop: the caller is resolved on the calling coroutine, so the logged
+    ``file:line`` is the statement that logged even when the coroutine
+    later resumes elsewhere. Console output, formatting, compression and
+    disk writes then happen on a writer thread, in call order. The queue to
+    the writer thread is unbounded. ``await flush()`` and ``await aclose()``
+    wait for the writer thread without blocking the loop. Records still
+    queued are written at interpreter exit.
+
+    Args:
+        tl: The ``teeLogger`` to write through.
+
+    Examples:
+        >>> tl = teeLogger(noLog=True, suppressPrintout=True, programName='aio_doc')
+        >>> async def main():
+        ...     tl.aio.info('from a coroutine')
+        ...     await tl.aio.aclose()
+        >>> loop = asyncio.new_event_loop()
+        >>> loop.run_until_complete(main())
+        >>> loop.close()
+    """
+
+    def __init__(self, tl):
+        self.tl = tl
+        self.queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name=f'teeLogger-aio-writer-{id(self):x}', daemon=True,
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        q = self.queue
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            func, args = item
+            try:
+                func(*args)
+            except Exception:
+                # handlers report their own errors; a broken stdout must not stop the writer
+                pass
+
+    def _submit(self, func, *args):
+        with self._lock:
+            if not self._closed:
+                self.queue.put((func, args))
+                return
+        func(*args)
 
+    def _log(self, level, msg, callerStackDepth, printLevel=None, sample_rate=..., rate_limit=...):
+        tl = self.tl
+        if tl.suppressPrintout:
+            printLevel = None
+        entry = None
+        levelno = _LOG_LEVELS.get(level, logging.INFO)
+        if not tl.noLog and tl.logger.isEnabledFor(levelno):
+            if callerStackDepth == ...:
+                callerStackDepth = tl.callerStackDepth
+            location = _lazy_caller_location(i=callerStackDepth, target_length=tl.fileDescriptorLength)
+            allowed = True
+            if tl._limits_enabled or sample_rate is not ... or rate_limit is not ...:
+                allowed = tl._limiter.allow((location.filename, location.lineno), levelno, sample_rate, rate_limit)
+                summaries = tl._limiter.take_summaries()
+                if summaries:
+                    self._submit(tl._log_limit_summaries, summaries)
+            if allowed:
+                entry = (tl.logger.name, time.time(), levelno, location, msg, os.getpid(), threading.current_thread().name)
+        if entry is not None or printLevel is not None:
+            self._submit(self._write, entry, msg, printLevel)
 
-    def log(self, msg, level, callerStackDepth=...):
+    def _write(self, entry, msg, printLevel):
+        tl = self.tl
+        if printLevel is not None:
+            tl._print(msg, printLevel)
+        if entry is None:
+            return
+        handler = tl.logHandler
+        if tl.fast_path and handler is not None:
+            handler.emit_fast(entry)
+        else:
+            tl.logger.handle(_entry_record(entry))
+
+    def _write_entries(self, entries):
+        handler = self.tl.logHandler
+        if handler is not None:
+            handler.emit_entries(entries)
+            return
+        for entry in entries:
+            self.tl.logger.handle(_entry_record(entry))
+
+    def teeok(self, msg, callerStackDepth=..., sample_rate=..., rate_limit=...):
+        """Print ``msg`` in green and log it at info level."""
+        self._log('info', msg, callerStackDepth, 'okgreen', sample_rate=sample_rate, rate_limit=rate_limit)
+
+    def printTable(self, data, callerStackDepth=..., header=None, sample_rate=..., rate_limit=...):
+        """Format ``data`` as a table, print it, and log it at info level."""
+        tableStr = pretty_format_table(data, header=header)
+        self._log('info', '\n' + tableStr, callerStackDepth, 'info', sample_rate=sample_rate, rate_limit=rate_limit)
+
+    def ok(self, msg, callerStackDepth=..., sample_rate=..., rate_limit=...):
+        """Log ``msg`` at info level without printing to stdout."""
+        self._log('info', msg, callerStackDepth, sample_rate=sample_rate, rate_limit=rate_limit)
+
+    def teeprint(self, msg, callerStackDepth=..., sample_rate=..., rate_limit=...):
+        """Print ``msg`` and log it at info level."""
+        self._log('info', msg, callerStackDepth, 'info', sample_rate=sample_rate, rate_limit=rate_limit)
+
+    def info(self, msg, callerStackDepth=..., sample_rate=..., rate_limit=...):
+        """Log ``msg`` at info level."""
+        self._log('info', msg, callerStackDepth, sample_rate=sample_rate, rate_limit=rate_limit)
+
+    def teeerror(self, msg, callerStackDepth=..., sample_rate=..., rate_limit=...):
+        """Print ``msg`` as an error and log it at error level."""
+        self._log('error', msg, callerStackDepth, 'error', sample_rate=sample_rate, rate_limit=rate_limit)
+
+    def error(self, msg, callerStackDepth=..., sample_rate=..., rate_limit=...):
+        """Log ``msg`` at error level without printing to stdout."""
+        self._log('error', msg, callerStackDepth, sample_rate=sample_rate, rate_limit=rate_limit)
+
+    def teelog(self, msg, level, callerStackDepth=..., sample_rate=..., rate_limit=...):
+        """Print ``msg`` with ``level`` styling and log at ``level``."""
+        self._log(level, msg, callerStackDepth, level, sample_rate=sample_rate, rate_limit=rate_limit)
+
+    def log(self, msg, level, callerStackDepth=..., sample_rate=..., rate_limit=...):
         """Log ``msg`` at the given ``level`` without printing to stdout."""
-        self.log_with_caller_info(level, msg, callerStackDepth=callerStackDepth)
+        self._log(level, msg, callerStackDepth, sample_rate=sample_rate, rate_limit=rate_limit)
+
+    def log_batch(self, level, msgs, callerStackDepth=...):
+        """Log every message in ``msgs`` at ``level`` as one batch; see ``teeLogger.log_batch``."""
+        tl = self.tl
+        levelno = _LOG_LEVELS.get(level, logging.INFO)
+        if tl.noLog or not tl.logger.isEnabledFor(levelno):
+            return
+        if callerStackDepth == ...:
+            callerStackDepth = tl.callerStackDepth
+        location = _lazy_caller_location(i=callerStackDepth, target_length=tl.fileDescriptorLength)
+        name, created = tl.logger.name, time.time()
+        process, threadName = os.getpid(), threading.current_thread().name
+        entries = [(name, created, levelno, location, msg, process, threadName) for msg in msgs]
+        if entries:
+            self._submit(self._write_entries, entries)
+
+    def info_many(self, msgs, callerStackDepth=...):
+        """Log every message in ``msgs`` at info level as one batch."""
+        self.log_batch('info', msgs, callerStackDepth)
+
+    def _flush(self, loop=None, future=None):
+        try:
+            handler = self.tl.logHandler
+            if handler is not None:
+                handler.flush()
+            sys.stdout.flush()
+        finally:
+            if future is not None:
+                _resolve_future(loop, future)
+
+    async def flush(self):
+        """Wait until everything logged so far is written and flushed."""
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._submit(self._flush, loop, future)
+        await future
+
+    def close(self):
+        """Write everything still queued and stop the writer thread (blocking)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self.queue.put(None)
+            self._thread.join()
+        atexit.unregister(self.close)
+
+    async def aclose(self):
+        """Drain the queue and close the ``teeLogger`` without blocking the loop."""
+        await asyncio.get_event_loop().run_in_executor(None, self.tl.close)
 
 if __name__ == '__main__':
     import argparse
@@ -835,8 +4324,43 @@ if __name__ == '__main__':
     parser.add_argument('-V', '--version', action='version',
                         version=f'Tee_Logger {version} by {__author__}')
     parser.add_argument('--test', action='store_true', help='run doctests')
+    subparsers = parser.add_subparsers(dest='command')
+    queryParser = subparsers.add_parser('query', help='search the logs teeLogger wrote for a program')
+    queryParser.add_argument('programName', help='programName the logs were written with')
+    queryParser.add_argument('-d', '--dir', dest='systemLogFileDir', default='.',
+                             help='systemLogFileDir the logs were written to (default: .)')
+    queryParser.add_argument('-s', '--start', help='earliest time, YYYY-MM-DD[ HH:MM[:SS]]')
+    queryParser.add_argument('-e', '--end', help='latest time, YYYY-MM-DD[ HH:MM[:SS]]')
+    queryParser.add_argument('-l', '--level', help='minimum level, e.g. WARNING')
+    queryParser.add_argument('-c', '--caller', help='regex matched against the [file:line] caller label')
+    queryParser.add_argument('-g', '--grep', dest='pattern', help='regex matched against the record text')
+    queryParser.add_argument('-j', '--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    trainParser = subparsers.add_parser('train-dict', help='train a zstd dictionary on the logs of a program')
+    trainParser.add_argument('programName', help='programName the logs were written with')
+    trainParser.add_argument('-d', '--dir', dest='systemLogFileDir', default='.',
+                             help='systemLogFileDir the logs were written to (default: .)')
+    trainParser.add_argument('--size', type=int, default=112640, help='maximum dictionary size in bytes')
+    trainParser.add_argument('--samples', type=int, default=100000, help='maximum number of log lines to train on')
     args = parser.parse_args()
     if args.test:
         results = doctest.testmod(verbose='-v')
         raise SystemExit(1 if results.failed else 0)
+    if args.command == 'query':
+        try:
+            for record in query_logs(args.programName, args.systemLogFileDir, start=args.start, end=args.end,
+                                     level=args.level, caller=args.caller, pattern=args.pattern,
+                                     max_workers=args.jobs):
+                print(record)
+        except BrokenPipeError:
+            # output piped into head / less that exited early
+            sys.stderr.close()
+        raise SystemExit(0)
+    if args.command == 'train-dict':
+        try:
+            print(train_zstd_dictionary(args.programName, args.systemLogFileDir,
+                                        dict_size=args.size, max_samples=args.samples))
+        except (RuntimeError, ValueError) as e:
+            printWithColor(str(e), 'error')
+            raise SystemExit(1)
+        raise SystemExit(0)
     print(f'Tee_Logger {version} by {__author__}')
\ No newline at end of file
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import Tee_Logger
+from Tee_Logger import abbreviate_filename
+
+
+class TestAbbreviateFilenameCache(unittest.TestCase):
+    def setUp(self):
+        abbreviate_filename.cache_clear()
+
+    def test_line_numbers_share_one_name_entry(self):
+        for line in range(10, 100):
+            abbreviate_filename('my_long_module_name.py', line)
+        info = abbreviate_filename.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 89)
+        self.assertEqual(info.currsize, 1)
+
+    def test_cache_is_capped(self):
+        original = Tee_Logger._ABBREVIATED_NAME_CACHE_MAXSIZE
+        Tee_Logger._ABBREVIATED_NAME_CACHE_MAXSIZE = 8
+        self.addCleanup(setattr, Tee_Logger, '_ABBREVIATED_NAME_CACHE_MAXSIZE', original)
+        for i in range(20):
+            abbreviate_filename(f'module_{i}.py', 1)
+        self.assertLessEqual(abbreviate_filename.cache_info().currsize, 8)
+        self.assertEqual(abbreviate_filename('module_19.py', 1), 'module_19:1    ')
+
+    def test_long_line_numbers_still_shortened(self):
+        self.assertEqual(abbreviate_filename('Tee_Logger.py', 123456789, 15), 'TeeL:123456789 ')
+        self.assertEqual(len(abbreviate_filename('Tee_Logger.py', 10**30, 15)), 15)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import Tee_Logger
+from Tee_Logger import teeLogger
+
+
+class TestAdaptiveCompression(unittest.TestCase):
+    def setUp(self):
+        self.logDir = tempfile.mkdtemp(prefix='tl_adaptive_')
+        self.addCleanup(shutil.rmtree, self.logDir, True)
+
+    def _handler(self, name, cpu_budget, level=9, backlog=None):
+        handler = teeLogger.GZipFileHandler(os.path.join(self.logDir, name), mode='ab', encoding='utf-8', compresslevel=level)
+        handler.set_frame_policy(frame_every_n_records=10)
+        handler.set_adaptive_level(cpu_budget, backlog=backlog)
+        self.addCleanup(handler.close)
+        return handler
+
+    def _write(self, handler, records):
+        for i in range(records):
+            handler.write_message(f'adaptive record {i} ' + 'x' * 100)
+
+    def test_steps_down_over_budget(self):
+        handler = self._handler('down.log.gz', cpu_budget=1e-9)
+        self._write(handler, 200)
+        self.assertEqual(handler.compresslevel, 1)
+        handler.close()
+        with gzip.open(handler.baseFilename, 'rt') as fh:
+            self.assertEqual(len(fh.read().splitlines()), 200)
+
+    def test_steps_up_to_configured_level_with_headroom(self):
+        handler = self._handler('up.log.gz', cpu_budget=1e9, level=6)
+        handler.compresslevel = 1
+        self._write(handler, 200)
+        self.assertEqual(handler.compresslevel, 6)
+
+    def test_process_clock_without_thread_time(self):
+        # Python 3.6 has no time.thread_time
+        with mock.patch.object(Tee_Logger, '_thread_time', time.process_time):
+            handler = self._handler('process_clock.log.gz', cpu_budget=1e-9)
+            self._write(handler, 200)
+        self.assertEqual(handler.compresslevel, 1)
+
+    def test_backlog_steps_down_within_budget(self):
+        handler = self._handler('backlog.log.gz', cpu_budget=1e9, backlog=lambda: 1000)
+        self._write(handler, 50)
+        self.assertLess(handler.compresslevel, 9)
+
+    def test_plain_handler_ignores_adaptive_level(self):
+        handler = teeLogger.BinFileHandler(os.path.join(self.logDir, 'plain.log'), mode='ab')
+        handler.set_adaptive_level(0.5)
+        self.assertEqual(handler.cpu_budget, 0)
+        handler.close()
+
+    def test_teelogger_option_frames_and_adapts(self):
+        tl = teeLogger(programName='adaptive', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       in_place_compression='xz', compression_level=6, compression_cpu_budget=0.25,
+                       async_mode=True)
+        fileHandler = tl.logHandler.target
+        self.assertEqual(fileHandler.cpu_budget, 0.25)
+        self.assertEqual(fileHandler.max_level, 6)
+        self.assertEqual(fileHandler.frame_every_n_bytes, 1024 * 1024)
+        self.assertIsNotNone(fileHandler.backlog)
+        tl.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+import asyncio
+import contextlib
+import gzip
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Tee_Logger import AsyncTeeLogger, teeLogger
+
+
+def _run(coroutine):
+    # asyncio.run needs Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class _SlowStdout(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.writers = set()
+
+    def write(self, s):
+        self.writers.add(threading.current_thread().name)
+        self.gate.wait(5)
+        return super().write(s)
+
+
+class TestAsyncTeeLogger(unittest.TestCase):
+    def setUp(self):
+        self.logDir = tempfile.mkdtemp(prefix='tl_aio_')
+        self.addCleanup(shutil.rmtree, self.logDir, True)
+
+    def _read(self, tl):
+        with open(tl.logFileName) as fh:
+            return fh.read().splitlines()
+
+    def test_caller_lines_survive_await(self):
+        for fast_path in (False, True):
+            with self.subTest(fast_path=fast_path):
+                tl = teeLogger(programName=f'aio_caller_{fast_path}', systemLogFileDir=self.logDir,
+                               suppressPrintout=True, fast_path=fast_path)
+                self.assertIsInstance(tl.aio, AsyncTeeLogger)
+                self.assertIs(tl.aio, tl.aio)
+                expected = []
+
+                async def handler(n):
+                    expected.append((n, 'before', sys._getframe().f_lineno + 1))
+                    tl.aio.info(f'task {n} before')
+                    await asyncio.sleep(0)
+                    expected.append((n, 'after', sys._getframe().f_lineno + 1))
+                    tl.aio.error(f'task {n} after')
+
+                async def main():
+                    await asyncio.gather(*(handler(n) for n in range(3)))
+                    await tl.aio.flush()
+
+                _run(main())
+                lines = self._read(tl)
+                for n, when, lineno in expected:
+                    line = next(line for line in lines if line.endswith(f'task {n} {when}'))
+                    self.assertIn(f':{lineno}', line)
+                    self.assertIn('test_aio', line)
+                tl.close()
+
+    def test_console_output_does_not_block_loop(self):
+        tl = teeLogger(programName='aio_console', systemLogFileDir=self.logDir, suppressPrintout=False,
+                       disable_colors=True)
+        stdout = _SlowStdout()
+
+        async def main():
+            tl.aio.teeprint('slow console line')
+            # the loop keeps running while the writer thread waits on stdout
+            await asyncio.sleep(0)
+            stdout.gate.set()
+            await tl.aio.flush()
+
+        with contextlib.redirect_stdout(stdout):
+            _run(main())
+        self.assertIn('[INFO] slow console line', stdout.getvalue())
+        self.assertNotIn('MainThread', stdout.writers)
+        tl.close()
+
+    def test_aclose_drains_and_closes(self):
+        tl = teeLogger(programName='aio_aclose', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       in_place_compression='gzip')
+
+        async def main():
+            tl.aio.info_many(f'batch {i}' for i in range(100))
+            for i in range(100):
+                tl.aio.info(f'single {i}')
+            await tl.aio.aclose()
+
+        _run(main())
+        self.assertIsNone(tl.logHandler)
+        with gzip.open(tl.logFileName, 'rt') as fh:
+            content = fh.read()
+        self.assertIn('batch 99\n', content)
+        self.assertTrue(content.endswith('single 99\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+import io
+import lzma
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import Tee_Logger
+from Tee_Logger import _ParallelXZWriter, compress_folder, compress_folders
+
+
+class TestParallelArchival(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='tl_archive_')
+        self.addCleanup(shutil.rmtree, self.root, True)
+
+    def _make_day_folder(self, day, lines=200):
+        folder = os.path.join(self.root, day)
+        os.makedirs(folder)
+        with open(os.path.join(folder, f'app_{day}.log'), 'w') as fh:
+            for i in range(lines):
+                fh.write(f'{day} line {i}\n')
+        return folder
+
+    def _archived_log(self, folder, suffix='.tar.xz', mode='r:xz'):
+        day = os.path.basename(folder)
+        with tarfile.open(folder + suffix, mode) as tar:
+            return tar.extractfile(f'{day}/app_{day}.log').read().decode()
+
+    def test_parallel_writer_emits_independent_streams(self):
+        data = os.urandom(1000) * 50
+        out = io.BytesIO()
+        writer = _ParallelXZWriter(out, preset=0, threads=4, chunk_size=4096)
+        writer.write(data)
+        writer.close()
+        self.assertEqual(lzma.decompress(out.getvalue()), data)
+        first = lzma.LZMADecompressor()
+        self.assertEqual(len(first.decompress(out.getvalue())), 4096)
+        self.assertTrue(first.unused_data)
+
+    def test_python_fallback_archive(self):
+        folder = self._make_day_folder('2020-01-01')
+        with mock.patch.object(Tee_Logger.shutil, 'which', return_value=None):
+            self.assertTrue(compress_folder(folder, threads=2))
+        self.assertFalse(os.path.exists(folder))
+        self.assertFalse(os.path.exists(folder + '.tar.xz.part'))
+        self.assertIn('2020-01-01 line 199', self._archived_log(folder))
+
+    def test_compress_folders_runs_all(self):
+        folders = [self._make_day_folder(f'2020-02-0{d}') for d in range(1, 5)]
+        results = compress_folders(folders, max_workers=3)
+        self.assertEqual(results, {folder: True for folder in folders})
+        for folder in folders:
+            self.assertIn('line 0', self._archived_log(folder))
+
+    def test_gzip_format_with_level(self):
+        folder = self._make_day_folder('2020-03-01')
+        self.assertTrue(compress_folder(folder, archive_format='gzip', level=1))
+        self.assertIn('line 5', self._archived_log(folder, '.tar.gz', 'r:gz'))
+
+    def test_bz2_python_fallback(self):
+        folder = self._make_day_folder('2020-03-02')
+        with mock.patch.object(Tee_Logger.shutil, 'which', return_value=None):
+            self.assertTrue(compress_folder(folder, archive_format='bz2', level=9))
+        self.assertIn('line 5', self._archived_log(folder, '.tar.bz2', 'r:bz2'))
+
+    @unittest.skipUnless(shutil.which('zstd') and shutil.which('tar'), 'zstd CLI not available')
+    def test_zstd_format_with_cli(self):
+        folder = self._make_day_folder('2020-03-03')
+        self.assertTrue(compress_folder(folder, archive_format='zst', level=3, threads=2))
+        self.assertTrue(os.path.exists(folder + '.tar.zst'))
+        self.assertFalse(os.path.exists(folder))
+
+    def test_invalid_format_falls_back_to_xz(self):
+        folder = self._make_day_folder('2020-03-04')
+        self.assertTrue(compress_folder(folder, archive_format='rar', disable_colors=True))
+        self.assertIn('line 5', self._archived_log(folder))
+
+    def test_leftover_folder_does_not_replace_archive(self):
+        folder = self._make_day_folder('2020-03-05')
+        with open(os.path.join(folder, 'app_2020-03-05_1.log'), 'w') as fh:
+            fh.write('second file\n')
+        self.assertTrue(compress_folder(folder))
+        # a run cut short after the rename, while removing the folder
+        self._make_day_folder('2020-03-05', lines=1)
+        self.assertTrue(compress_folder(folder, archive_format='gz'))
+        self.assertFalse(os.path.exists(folder))
+        self.assertFalse(os.path.exists(folder + '.tar.gz'))
+        with tarfile.open(folder + '.tar.xz', 'r:xz') as tar:
+            self.assertEqual(sorted(os.path.basename(name) for name in tar.getnames() if name.endswith('.log')),
+                             ['app_2020-03-05.log', 'app_2020-03-05_1.log'])
+        self.assertIn('line 199', self._archived_log(folder))
+
+    @unittest.skipUnless(shutil.which('tar') and shutil.which('sleep'), 'tar and sleep not available')
+    def test_exit_stops_compressor_processes(self):
+        folder = self._make_day_folder('2020-03-06')
+        self.addCleanup(Tee_Logger._ARCHIVE_EXITING.clear)
+        results = []
+        with mock.patch.object(Tee_Logger, '_archive_command', return_value=['sleep', '30']):
+            worker = threading.Thread(target=lambda: results.append(compress_folder(folder)))
+            worker.start()
+            deadline = time.monotonic() + 10
+            while len(Tee_Logger._ARCHIVE_PROCESSES) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            started = time.monotonic()
+            Tee_Logger._stop_archive_processes()
+            worker.join(10)
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertEqual(results, [False])
+        self.assertEqual(Tee_Logger._ARCHIVE_PROCESSES, set())
+        self.assertTrue(os.path.isdir(folder))
+        self.assertFalse(os.path.exists(folder + '.tar.xz'))
+        self.assertFalse(os.path.exists(folder + '.tar.xz.part'))
+
+
+if __name__ == '__main__':
+    unittest.main()
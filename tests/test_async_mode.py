@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+import logging
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Tee_Logger import teeLogger
+
+
+class _BlockingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.messages = []
+
+    def emit(self, record):
+        self.gate.wait()
+        self.messages.append(record.getMessage())
+
+
+class TestAsyncMode(unittest.TestCase):
+    def test_close_drains_queue(self):
+        tl = teeLogger(programName='async_drain', systemLogFileDir='/tmp', suppressPrintout=True, async_mode=True)
+        self.assertIsInstance(tl.logHandler, teeLogger.AsyncQueueHandler)
+        for i in range(500):
+            tl.info(f'async record {i}')
+        log_file = tl.logFileName
+        tl.close()
+        with open(log_file) as fh:
+            content = fh.read()
+        self.assertIn('async record 0\n', content)
+        self.assertIn('async record 499\n', content)
+        self.assertFalse(tl.logger.handlers)
+
+    def test_drop_newest_counts_dropped(self):
+        target = _BlockingHandler()
+        handler = teeLogger.AsyncQueueHandler(target, maxsize=2, overflow='drop_newest')
+        logger = logging.getLogger('async_drop_newest')
+        for i in range(10):
+            handler.handle(logger.makeRecord(logger.name, logging.INFO, __file__, 0, f'm{i}', (), None))
+        target.gate.set()
+        handler.close()
+        self.assertGreater(handler.dropped, 0)
+        self.assertEqual(len(target.messages) + handler.dropped, 10)
+        self.assertEqual(target.messages[0], 'm0')
+
+    def test_drop_oldest_keeps_latest(self):
+        target = _BlockingHandler()
+        handler = teeLogger.AsyncQueueHandler(target, maxsize=2, overflow='drop_oldest')
+        logger = logging.getLogger('async_drop_oldest')
+        for i in range(10):
+            handler.handle(logger.makeRecord(logger.name, logging.INFO, __file__, 0, f'm{i}', (), None))
+        target.gate.set()
+        handler.close()
+        self.assertEqual(target.messages[-1], 'm9')
+        self.assertEqual(len(target.messages) + handler.dropped, 10)
+
+    def test_invalid_overflow_falls_back_to_block(self):
+        tl = teeLogger(noLog=True, suppressPrintout=True, programName='async_invalid',
+                       async_overflow='bogus', disable_colors=True)
+        self.assertEqual(tl.async_overflow, 'block')
+
+
+if __name__ == '__main__':
+    unittest.main()
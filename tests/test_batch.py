@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import gzip
+import os
+import sys
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Tee_Logger import teeLogger
+
+
+def _tail(path, n):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as fh:
+        return fh.read().splitlines()[-n:]
+
+
+class TestBatchLogging(unittest.TestCase):
+    def test_log_batch_single_write_and_flush(self):
+        tl = teeLogger(programName='batch_single', systemLogFileDir='/tmp', suppressPrintout=True)
+        handler = tl.logHandler
+        with mock.patch.object(handler, 'flush', wraps=handler.flush) as flush, \
+                mock.patch.object(handler.stream, 'write', wraps=handler.stream.write) as write:
+            tl.log_batch('warning', (f'item {i}' for i in range(1000)))
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(flush.call_count, 1)
+        log_file = tl.logFileName
+        tl.close()
+        lines = _tail(log_file, 1000)
+        self.assertTrue(lines[0].endswith('item 0'))
+        self.assertTrue(lines[-1].endswith('item 999'))
+        self.assertTrue(all('[WARNING ]' in line for line in lines))
+        self.assertEqual(len({line.split('] [')[1].split(']')[0] for line in lines}), 1)
+
+    def test_info_many_compressed_and_async(self):
+        tl = teeLogger(programName='batch_gzip', systemLogFileDir='/tmp', suppressPrintout=True,
+                       in_place_compression='gzip', async_mode=True)
+        tl.info_many(['alpha', 'beta', 'gamma'])
+        log_file = tl.logFileName
+        tl.close()
+        self.assertEqual([line.rsplit(' ', 1)[1] for line in _tail(log_file, 3)], ['alpha', 'beta', 'gamma'])
+
+    def test_batch_context_collects_per_thread(self):
+        tl = teeLogger(programName='batch_context', systemLogFileDir='/tmp', suppressPrintout=True)
+        handler = tl.logHandler
+        with mock.patch.object(handler.stream, 'write', wraps=handler.stream.write) as write:
+            with tl.batch():
+                tl.info('first')
+                with tl.batch():
+                    tl.error('second')
+                tl.info_many(['third', 'fourth'])
+                other = threading.Thread(target=tl.info, args=('from other thread',))
+                other.start()
+                other.join()
+                self.assertEqual(write.call_count, 1)
+            self.assertEqual(write.call_count, 2)
+        log_file = tl.logFileName
+        tl.close()
+        lines = _tail(log_file, 5)
+        self.assertTrue(lines[0].endswith('from other thread'))
+        self.assertEqual([line.rsplit(' ', 1)[1] for line in lines[1:]], ['first', 'second', 'third', 'fourth'])
+        self.assertIn('[ERROR   ]', lines[2])
+
+    def test_level_threshold_and_no_log(self):
+        tl = teeLogger(programName='batch_level', systemLogFileDir='/tmp', suppressPrintout=True, level='ERROR')
+        tl.log_batch('info', ['skipped'])
+        log_file = tl.logFileName
+        tl.close()
+        self.assertNotIn('skipped', '\n'.join(_tail(log_file, 5)))
+        teeLogger(noLog=True, suppressPrintout=True, programName='batch_nolog').log_batch('info', ['x'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,11 +4,16 @@ import os
 import re
 import sys
 import unittest
+from unittest import mock
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+import Tee_Logger
 from Tee_Logger import (
+    _CODE_INFO_CACHE,
     _log_dir_date_key,
+    abbreviate_filename,
+    getCallerFileLocation,
     getCallerInfo,
     teeLogger,
 )
@@ -33,6 +38,10 @@ class TestLogDirDateKey(unittest.TestCase):
     def test_tar_xz_suffix(self):
         self.assertEqual(_log_dir_date_key('2020-01-01.tar.xz'), '2020-01-01')
 
+    def test_other_archive_suffixes(self):
+        for suffix in ('.tar.zst', '.tar.gz', '.tar.bz2'):
+            self.assertEqual(_log_dir_date_key('2020-01-01' + suffix), '2020-01-01')
+
     def test_txt_not_stripped(self):
         self.assertEqual(_log_dir_date_key('2020-01-01.txt'), '2020-01-01.txt')
         self.assertIsNone(re.match(r'^\d{4}-\d{2}-\d{2}$', _log_dir_date_key('2020-01-01.txt')))
@@ -68,6 +77,40 @@ class TestGetCallerInfo(unittest.TestCase):
         self.assertIn(f':{log_at}', content)
 
 
+class TestGetCallerFileLocation(unittest.TestCase):
+    def test_matches_abbreviated_caller_info(self):
+        filename, lineno = getCallerInfo()
+        label = getCallerFileLocation(target_length=20)
+        self.assertEqual(label, abbreviate_filename(filename, lineno + 1, target_length=20))
+
+    def test_code_object_verdict_is_cached(self):
+        code = sys._getframe().f_code
+        getCallerFileLocation()
+        self.assertIs(_CODE_INFO_CACHE[id(code)][0], code)
+        self.assertFalse(_CODE_INFO_CACHE[id(code)][1])
+
+    def test_depth_beyond_stack_uses_outermost_frame(self):
+        frame = sys._getframe()
+        while frame.f_back is not None:
+            frame = frame.f_back
+        filename, lineno = getCallerInfo(10000)
+        self.assertEqual(filename, os.path.basename(frame.f_code.co_filename))
+        self.assertEqual(lineno, frame.f_lineno)
+
+    def test_without_sys_getframe(self):
+        for currentframe in (Tee_Logger.inspect.currentframe, lambda: None):
+            with self.subTest(currentframe=currentframe), \
+                    mock.patch.object(Tee_Logger, '_getframe', Tee_Logger._legacy_getframe), \
+                    mock.patch.object(Tee_Logger.inspect, 'currentframe', currentframe):
+                call_at = sys._getframe().f_lineno + 1
+                self.assertEqual(getCallerInfo(), (os.path.basename(__file__), call_at))
+                self.assertEqual(getCallerInfo(1)[0], os.path.basename(__file__))
+                frame = sys._getframe()
+                while frame.f_back is not None:
+                    frame = frame.f_back
+                self.assertEqual(getCallerInfo(10000), (os.path.basename(frame.f_code.co_filename), frame.f_lineno))
+
+
 class TestDuplicateHandlers(unittest.TestCase):
     def test_same_program_name_replaces_file_handler(self):
         tl1 = teeLogger(programName='dup_handlers', systemLogFileDir='/tmp', suppressPrintout=True)
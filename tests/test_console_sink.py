@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import contextlib
+import io
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Tee_Logger import _ConsoleSink, printWithColor, teeLogger
+
+
+def _stdout():
+    raw = io.BytesIO()
+    return raw, io.TextIOWrapper(raw, encoding='utf-8')
+
+
+class TestConsoleSink(unittest.TestCase):
+    def test_matches_print_with_color(self):
+        for disable_colors in (False, True):
+            for level in ('info', 'error', 'okgreen', 'okcyan', 'critical', 'unknown'):
+                with self.subTest(disable_colors=disable_colors, level=level):
+                    expected = io.StringIO()
+                    with contextlib.redirect_stdout(expected):
+                        printWithColor('same text', level, disable_colors=disable_colors)
+                    raw, stdout = _stdout()
+                    sink = _ConsoleSink(refresh_ms=10000, disable_colors=disable_colors)
+                    with contextlib.redirect_stdout(stdout):
+                        sink.write('same text', level)
+                        self.assertEqual(raw.getvalue(), b'')
+                        sink.close()
+                    self.assertEqual(raw.getvalue().decode(), expected.getvalue())
+
+    def test_repeated_lines_are_coalesced(self):
+        raw, stdout = _stdout()
+        sink = _ConsoleSink(refresh_ms=10000, disable_colors=True)
+        with contextlib.redirect_stdout(stdout):
+            for _ in range(5):
+                sink.write('tick')
+            sink.write('tock', 'warning')
+            sink.write('tock', 'warning')
+            sink.close()
+        self.assertEqual(raw.getvalue().decode(), (
+            '[INFO] tick\n[INFO] (repeated 4 times)\n'
+            '[WARNING] tock\n[WARNING] (repeated 1 times)\n'
+        ))
+
+    def test_refresh_interval_writes_buffer(self):
+        raw, stdout = _stdout()
+        sink = _ConsoleSink(refresh_ms=20, disable_colors=True)
+        with contextlib.redirect_stdout(stdout):
+            sink.write('soon')
+            deadline = time.monotonic() + 5
+            while not raw.getvalue() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            sink.close()
+        self.assertEqual(raw.getvalue(), b'[INFO] soon\n')
+
+    def test_tee_methods_use_sink(self):
+        raw, stdout = _stdout()
+        with contextlib.redirect_stdout(stdout):
+            tl = teeLogger(programName='console_sink', systemLogFileDir='/tmp', suppressPrintout=False,
+                           disable_colors=True, console_refresh_ms=10000)
+            stdout.flush()
+            raw.seek(0)
+            raw.truncate()
+            for i in range(3):
+                tl.teeprint('progress')
+            tl.teeok('done')
+            tl.close()
+        self.assertEqual(raw.getvalue().decode(), (
+            '[INFO] progress\n[INFO] (repeated 2 times)\n[OKGREEN] done\n'
+        ))
+
+
+if __name__ == '__main__':
+    unittest.main()
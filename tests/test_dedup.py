@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+import gzip
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Tee_Logger import teeLogger
+
+
+class TestDedup(unittest.TestCase):
+    def setUp(self):
+        self.logDir = tempfile.mkdtemp(prefix='tl_dedup_')
+        self.addCleanup(shutil.rmtree, self.logDir, True)
+
+    def _messages(self, tl):
+        opener = gzip.open if tl.logFileName.endswith('.gz') else open
+        with opener(tl.logFileName, 'rt') as fh:
+            return [line.split('] ', 2)[2] for line in fh.read().splitlines()[1:]]
+
+    def test_consecutive_repeats_collapse(self):
+        for fast_path in (False, True):
+            with self.subTest(fast_path=fast_path):
+                tl = teeLogger(programName=f'dedup_consecutive_{fast_path}', systemLogFileDir=self.logDir,
+                               suppressPrintout=True, in_place_compression='gzip', dedup_window=1,
+                               fast_path=fast_path)
+                for _ in range(100):
+                    tl.info('health check ok')
+                tl.error('health check failed')
+                for _ in range(2):
+                    tl.info('health check ok')
+                tl.close()
+                self.assertEqual(self._messages(tl), [
+                    'health check ok',
+                    'last message repeated 99 times',
+                    'health check failed',
+                    'health check ok',
+                    'last message repeated 1 times',
+                ])
+
+    def test_window_catches_interleaved_repeats(self):
+        tl = teeLogger(programName='dedup_window', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       dedup_window=2)
+        for _ in range(10):
+            tl.info('retry connect')
+            tl.info('retry read')
+        tl.info('connected')
+        self.assertEqual(tl.logHandler.suppressed, 18)
+        tl.close()
+        self.assertEqual(self._messages(tl), [
+            'retry connect',
+            'retry read',
+            'message repeated 9 times: retry connect',
+            'message repeated 9 times: retry read',
+            'connected',
+        ])
+
+    def test_summary_names_message_unless_it_is_the_line_above(self):
+        tl = teeLogger(programName='dedup_line_above', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       dedup_window=4)
+        for _ in range(3):
+            for msg in ('A', 'B'):
+                tl.info(msg)
+        for _ in range(4):
+            tl.info('C')
+        tl.close()
+        self.assertEqual(self._messages(tl), [
+            'A',
+            'B',
+            'message repeated 2 times: A',
+            'message repeated 2 times: B',
+            'C',
+            'last message repeated 3 times',
+        ])
+
+    def test_level_and_caller_are_part_of_the_key(self):
+        tl = teeLogger(programName='dedup_key', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       dedup_window=1)
+        for _ in range(3):
+            tl.info('same text')
+            tl.error('same text')
+        for _ in range(2):
+            tl.info('same text')
+        tl.close()
+        messages = self._messages(tl)
+        self.assertEqual(messages.count('same text'), 7)
+        self.assertEqual(messages[-1], 'last message repeated 1 times')
+
+    def test_batch_and_exceptions(self):
+        tl = teeLogger(programName='dedup_batch', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       dedup_window=1)
+        tl.info_many(['spam'] * 50 + ['eggs'])
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            for _ in range(2):
+                tl.logger.error('failed', exc_info=True, extra={'callerFileLocation': 'test'})
+        tl.close()
+        with open(tl.logFileName) as fh:
+            content = fh.read()
+        self.assertEqual(content.count('] spam\n'), 1)
+        self.assertIn('last message repeated 49 times\n', content)
+        self.assertEqual(content.count('ValueError: boom'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+import logging
+import os
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Tee_Logger import teeLogger
+
+_LINE = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} \[(?P<level>[A-Z]+) *\] \[(?P<loc>[^\]]*)\] (?P<msg>.*)$')
+
+
+def _read_lines(path):
+    with open(path, encoding='utf-8') as fh:
+        return fh.read().splitlines()
+
+
+class TestFastPath(unittest.TestCase):
+    def _log_both_ways(self, name, **kwargs):
+        results = []
+        for fast in (False, True):
+            tl = teeLogger(programName=f'{name}_{fast}', systemLogFileDir='/tmp', suppressPrintout=True,
+                           fast_path=fast, **kwargs)
+            tl.info('hello fast path')
+            tl.error('an error')
+            tl.log('a warning', 'warning')
+            tl.info(42)
+            log_file = tl.logFileName
+            tl.close()
+            results.append([_LINE.match(line).groupdict() for line in _read_lines(log_file)[-4:]])
+        return results
+
+    def test_same_lines_as_logging_path(self):
+        standard, fast = self._log_both_ways('fast_path_lines')
+        self.assertEqual(
+            [(entry['level'], entry['msg']) for entry in fast],
+            [('INFO', 'hello fast path'), ('ERROR', 'an error'), ('WARNING', 'a warning'), ('INFO', '42')],
+        )
+        self.assertEqual(standard, fast)
+
+    def test_text_mode_and_async(self):
+        standard, fast = self._log_both_ways('fast_path_async', binary_mode=False, async_mode=True)
+        self.assertEqual(standard, fast)
+
+    def test_level_threshold_and_no_record_creation(self):
+        tl = teeLogger(programName='fast_path_level', systemLogFileDir='/tmp', suppressPrintout=True,
+                       fast_path=True, level=logging.WARNING)
+        factory = logging.getLogRecordFactory()
+        created = []
+        logging.setLogRecordFactory(lambda *args, **kwargs: created.append(args) or factory(*args, **kwargs))
+        try:
+            tl.info('filtered')
+            tl.error('kept')
+        finally:
+            logging.setLogRecordFactory(factory)
+        log_file = tl.logFileName
+        tl.close()
+        self.assertEqual(created, [])
+        content = '\n'.join(_read_lines(log_file))
+        self.assertNotIn('filtered', content)
+        self.assertIn('kept', content)
+
+
+if __name__ == '__main__':
+    unittest.main()
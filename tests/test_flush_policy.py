@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import logging
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Tee_Logger import teeLogger
+
+
+class _CountingFlushHandler(teeLogger.BinFileHandler):
+    flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+class TestFlushPolicy(unittest.TestCase):
+    def _handler(self, name, **policy):
+        path = f'/tmp/flush_policy_{name}.log'
+        if os.path.exists(path):
+            os.remove(path)
+        handler = _CountingFlushHandler(path, mode='ab', encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        handler.set_flush_policy(**policy)
+        self.addCleanup(handler.close)
+        return handler
+
+    def _emit(self, handler, level, msg):
+        record = logging.makeLogRecord({'levelno': level, 'levelname': logging.getLevelName(level), 'msg': msg})
+        handler.handle(record)
+
+    def test_default_flushes_every_record(self):
+        handler = self._handler('default')
+        for i in range(5):
+            self._emit(handler, logging.INFO, f'line {i}')
+        self.assertEqual(handler.flushes, 5)
+
+    def test_batched_flush_with_level_override(self):
+        handler = self._handler('batched', flush_every_n_records=10, flush_on_level=logging.WARNING)
+        for i in range(9):
+            self._emit(handler, logging.INFO, f'line {i}')
+        self.assertEqual(handler.flushes, 0)
+        self._emit(handler, logging.ERROR, 'boom')
+        self.assertEqual(handler.flushes, 1)
+        with open(handler.baseFilename) as fh:
+            self.assertTrue(fh.read().endswith('boom\n'))
+
+    def test_interval_timer_flushes_idle_buffer(self):
+        handler = self._handler('interval', flush_every_n_records=0, flush_interval_ms=20, flush_on_level=None)
+        self._emit(handler, logging.INFO, 'idle line')
+        self.assertEqual(handler.flushes, 0)
+        timer = handler._flush_timer
+        self.assertIsNotNone(timer)
+        timer.join(1)
+        self.assertEqual(handler.flushes, 1)
+        with open(handler.baseFilename) as fh:
+            self.assertEqual(fh.read(), 'idle line\n')
+
+    def test_teelogger_applies_policy(self):
+        tl = teeLogger(programName='flush_policy_tl', systemLogFileDir='/tmp', suppressPrintout=True,
+                       in_place_compression='gzip', flush_every_n_records=100)
+        self.addCleanup(tl.close)
+        self.assertEqual(tl.logHandler.flush_every_n_records, 100)
+        self.assertEqual(tl.logHandler.flush_on_level, logging.WARNING)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+import logging
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Tee_Logger import _CallerFileLocation, _TEE_LOG_FORMAT, _TeeFormatter, teeLogger
+
+
+def _record(msg, level=logging.INFO, args=(), created=None, **kwargs):
+    record = logging.makeLogRecord({
+        'name': 'fmt', 'msg': msg, 'args': args, 'levelno': level,
+        'levelname': logging.getLevelName(level),
+        'callerFileLocation': _CallerFileLocation('/srv/app/worker_module.py', 1234),
+        **kwargs,
+    })
+    if created is not None:
+        record.created = created
+        record.msecs = int((created - int(created)) * 1000) + 0.0
+    return record
+
+
+class TestTeeFormatter(unittest.TestCase):
+    def setUp(self):
+        self.fast = _TeeFormatter()
+        self.reference = logging.Formatter(_TEE_LOG_FORMAT)
+
+    def assertSameOutput(self, record):
+        expected = self.reference.format(record)
+        self.assertEqual(self.fast.format(record), expected)
+        for encoding in ('utf-8', 'latin-1', 'utf-16'):
+            self.assertEqual(
+                self.fast.format_bytes(record, encoding),
+                expected.encode(encoding, errors='namereplace'),
+            )
+
+    def test_matches_logging_formatter(self):
+        for level in (logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR, logging.CRITICAL, 25):
+            self.assertSameOutput(_record('plain message', level))
+        self.assertSameOutput(_record('value %s and %d', args=('x', 3)))
+        self.assertSameOutput(_record('non-ascii ✓ ü 日本', logging.WARNING))
+
+    def test_timestamp_cache_tracks_seconds_and_millis(self):
+        for created in (1700000000.001, 1700000000.999, 1700000001.5, 1700000000.25):
+            self.assertSameOutput(_record('tick', created=created))
+
+    def test_exception_falls_back_to_logging_formatter(self):
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            record = _record('failed', logging.ERROR, exc_info=sys.exc_info())
+        self.assertSameOutput(record)
+        self.assertIn('ValueError: boom', self.fast.format(record))
+
+    def test_binary_log_file_matches_reference(self):
+        tl = teeLogger(programName='fast_formatter', systemLogFileDir='/tmp', suppressPrintout=True, binary_mode=True)
+        self.assertIsInstance(tl.logHandler.formatter, _TeeFormatter)
+        record = _record('written through handler ✓')
+        tl.logHandler.handle(record)
+        log_file = tl.logFileName
+        tl.close()
+        with open(log_file, 'rb') as fh:
+            lines = fh.read().splitlines()
+        self.assertEqual(lines[-1], self.reference.format(record).encode('utf-8'))
+
+
+if __name__ == '__main__':
+    unittest.main()
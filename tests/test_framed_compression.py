@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+import bz2
+import lzma
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Tee_Logger import teeLogger
+
+DECOMPRESSORS = {
+    'gzip': lambda: zlib.decompressobj(wbits=31),
+    'bz2': bz2.BZ2Decompressor,
+    'xz': lzma.LZMADecompressor,
+}
+
+
+def _frames(raw, make_decompressor):
+    # decode complete frames one at a time, stopping at a truncated tail
+    frames = []
+    while raw:
+        decompressor = make_decompressor()
+        try:
+            data = decompressor.decompress(raw)
+        except (OSError, EOFError, lzma.LZMAError, zlib.error):
+            break
+        if not decompressor.eof:
+            break
+        frames.append(data.decode())
+        raw = decompressor.unused_data
+    return frames
+
+
+class TestFramedCompression(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='tl_frames_')
+        self.addCleanup(shutil.rmtree, self.root, True)
+
+    def _log(self, compression, count, **kwargs):
+        tl = teeLogger(programName=f'frames_{compression}', systemLogFileDir=self.root, suppressPrintout=True,
+                       in_place_compression=compression, **kwargs)
+        for i in range(count):
+            tl.info(f'framed line {i}')
+        tl.close()
+        with open(tl.logFileName, 'rb') as fh:
+            return fh.read()
+
+    def test_frames_every_n_records_decode_independently(self):
+        for compression, make_decompressor in DECOMPRESSORS.items():
+            with self.subTest(compression=compression):
+                raw = self._log(compression, 999, frame_every_n_records=100)
+                frames = _frames(raw, make_decompressor)
+                # the start-up record plus 999 lines, 100 per frame
+                self.assertEqual(len(frames), 10)
+                self.assertEqual(frames[0].count('\n'), 100)
+                self.assertTrue(frames[-1].endswith('framed line 998\n'))
+
+    def test_truncated_tail_loses_only_last_frame(self):
+        for compression, make_decompressor in DECOMPRESSORS.items():
+            with self.subTest(compression=compression):
+                raw = self._log(compression, 999, frame_every_n_records=100)
+                frames = _frames(raw[:-5], make_decompressor)
+                self.assertEqual(len(frames), 9)
+                self.assertTrue(frames[-1].endswith('framed line 898\n'))
+
+    def test_byte_and_interval_triggers(self):
+        raw = self._log('gzip', 200, frame_every_n_bytes=1000)
+        frames = _frames(raw, DECOMPRESSORS['gzip'])
+        self.assertGreater(len(frames), 5)
+        self.assertTrue(all(len(frame.encode()) < 1000 + 200 for frame in frames))
+
+        tl = teeLogger(programName='frames_interval', systemLogFileDir=self.root, suppressPrintout=True,
+                       in_place_compression='gzip', frame_interval_ms=50)
+        tl.info('first frame')
+        time.sleep(0.1)
+        tl.info('closes the first frame')
+        tl.info('second frame')
+        tl.close()
+        with open(tl.logFileName, 'rb') as fh:
+            frames = _frames(fh.read(), DECOMPRESSORS['gzip'])
+        self.assertEqual(len(frames), 2)
+        self.assertIn('closes the first frame', frames[0])
+
+    def test_uncompressed_logs_ignore_frame_policy(self):
+        tl = teeLogger(programName='frames_plain', systemLogFileDir=self.root, suppressPrintout=True,
+                       frame_every_n_records=1)
+        stream = tl.logHandler.stream
+        tl.info('still the same stream')
+        self.assertIs(tl.logHandler.stream, stream)
+        tl.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+import logging
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import Tee_Logger
+from Tee_Logger import _CallerFileLocation, abbreviate_filename, teeLogger
+
+
+class TestLevelThreshold(unittest.TestCase):
+    def test_disabled_debug_skips_caller_resolution(self):
+        tl = teeLogger(programName='level_skip', systemLogFileDir='/tmp', suppressPrintout=True, level='info')
+        self.addCleanup(tl.close)
+        self.assertEqual(tl.level, logging.INFO)
+        with mock.patch.object(Tee_Logger, '_resolve_caller', side_effect=AssertionError('walked stack')):
+            tl.log('hidden', 'debug')
+        tl.log('shown', 'warning')
+        tl.close()
+        with open(tl.logFileName) as fh:
+            content = fh.read()
+        self.assertNotIn('hidden', content)
+        self.assertIn('[WARNING ]', content)
+
+    def test_set_level_at_runtime(self):
+        tl = teeLogger(programName='level_runtime', systemLogFileDir='/tmp', suppressPrintout=True)
+        self.addCleanup(tl.close)
+        tl.setLevel(logging.ERROR)
+        tl.info('dropped info')
+        tl.error('kept error')
+        tl.close()
+        with open(tl.logFileName) as fh:
+            content = fh.read()
+        self.assertNotIn('dropped info', content)
+        self.assertIn('kept error', content)
+
+
+class TestLazyCallerFileLocation(unittest.TestCase):
+    def test_label_is_abbreviated_on_first_str(self):
+        location = _CallerFileLocation('my_long_module_name.py', 42, 15)
+        self.assertIsNone(location._label)
+        self.assertEqual(str(location), abbreviate_filename('my_long_module_name.py', 42, 15))
+        self.assertEqual('%s' % location, 'MyLongMN:42    ')
+
+
+if __name__ == '__main__':
+    unittest.main()
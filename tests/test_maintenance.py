@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import Tee_Logger
+from Tee_Logger import _try_lock_file, teeLogger
+
+
+class TestBackgroundMaintenance(unittest.TestCase):
+    def setUp(self):
+        self.logDir = tempfile.mkdtemp(prefix='tl_maint_')
+        self.addCleanup(shutil.rmtree, self.logDir, True)
+        self.logsDir = os.path.join(self.logDir, 'maint_log')
+        for day in ('2020-01-01', '2020-01-02', '2020-01-03'):
+            os.makedirs(os.path.join(self.logsDir, day))
+            with open(os.path.join(self.logsDir, day, f'maint_{day}.log'), 'w') as fh:
+                fh.write('old log line\n')
+
+    def test_constructor_hands_cleanup_to_thread(self):
+        tl = teeLogger(programName='maint', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       compressLogAfterMonths=1, deleteLogAfterYears=0)
+        self.addCleanup(tl.close)
+        self.assertIsNotNone(tl.maintenanceThread)
+        self.assertTrue(tl.maintenanceThread.daemon)
+        tl.maintenanceThread.join(60)
+        entries = set(os.listdir(self.logsDir))
+        for day in ('2020-01-01', '2020-01-02', '2020-01-03'):
+            self.assertIn(f'{day}.tar.xz', entries)
+            self.assertNotIn(day, entries)
+
+    def test_failure_does_not_escape_thread(self):
+        tl = teeLogger(programName='maint', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       compressLogAfterMonths=0, deleteLogAfterYears=0)
+        self.addCleanup(tl.close)
+        tl.maintenanceThread.join(60)
+        failures = []
+        with mock.patch.object(tl, '_cleanup_old_logs', side_effect=ImportError('shutting down')), \
+                mock.patch.object(Tee_Logger, 'printWithColor', lambda msg, *args, **kwargs: failures.append(msg)):
+            # the maintenance thread's target reports the failure instead of raising
+            tl._run_maintenance()
+            tl.start_maintenance(wait=True)
+        self.assertEqual(failures, ['Log maintenance failed due to shutting down'] * 2)
+
+    def test_held_lock_skips_cleanup(self):
+        lock_fd = _try_lock_file(os.path.join(self.logsDir, '.maint_maintenance.lock'))
+        self.addCleanup(os.close, lock_fd)
+        tl = teeLogger(programName='maint', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       compressLogAfterMonths=1, deleteLogAfterYears=0)
+        self.addCleanup(tl.close)
+        tl.maintenanceThread.join(60)
+        entries = set(os.listdir(self.logsDir))
+        self.assertIn('2020-01-01', entries)
+        self.assertNotIn('2020-01-01.tar.xz', entries)
+
+
+if __name__ == '__main__':
+    unittest.main()
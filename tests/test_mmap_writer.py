@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Tee_Logger import _MMapStream, teeLogger
+
+EXTENT = mmap.ALLOCATIONGRANULARITY
+
+
+class TestMMapWriter(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='tl_mmap_')
+        self.addCleanup(shutil.rmtree, self.root, True)
+
+    def test_stream_spans_windows_and_truncates(self):
+        path = os.path.join(self.root, 'spans.log')
+        stream = _MMapStream(path, EXTENT)
+        chunks = [b'a' * 100 + b'\n', b'b' * (EXTENT * 2 + 7), b'tail\n']
+        for chunk in chunks:
+            self.assertEqual(stream.write(chunk), len(chunk))
+        self.assertGreater(os.path.getsize(path), stream.tell())
+        stream.close()
+        with open(path, 'rb') as fh:
+            self.assertEqual(fh.read(), b''.join(chunks))
+
+    def test_reopen_after_crash_strips_padding(self):
+        path = os.path.join(self.root, 'crash.log')
+        stream = _MMapStream(path, EXTENT)
+        stream.write(b'before crash\n')
+        # simulate a crash: the mapping goes away without truncating the file
+        stream._map.close()
+        os.close(stream._fd)
+        self.assertEqual(os.path.getsize(path), EXTENT)
+        stream = _MMapStream(path, EXTENT)
+        stream.write(b'after restart\n')
+        stream.close()
+        with open(path, 'rb') as fh:
+            self.assertEqual(fh.read(), b'before crash\nafter restart\n')
+
+    def test_tee_logger_mmap_mode_with_size_rollover(self):
+        tl = teeLogger(programName='mmap_logger', systemLogFileDir=self.root, suppressPrintout=True,
+                       mmap_extent_bytes=EXTENT, max_log_bytes=EXTENT * 3, binary_mode=False)
+        self.assertIsInstance(tl.logHandler, teeLogger.MMapFileHandler)
+        first_file = tl.logFileName
+        for i in range(2000):
+            tl.info(f'mmap line {i} ' + 'x' * 100)
+        tl.close()
+        self.assertNotEqual(tl.logFileName, first_file)
+        content = b''
+        day_dir = os.path.dirname(first_file)
+        for name in sorted(os.listdir(day_dir)):
+            with open(os.path.join(day_dir, name), 'rb') as fh:
+                data = fh.read()
+            self.assertNotIn(b'\0', data)
+            content += data
+        lines = content.decode().splitlines()
+        self.assertEqual(sum(1 for line in lines if ' mmap line ' in line), 2000)
+        with open(tl.logFileName, 'rb') as fh:
+            self.assertTrue(fh.read().endswith(b'mmap line 1999 ' + b'x' * 100 + b'\n'))
+
+    def test_second_writer_does_not_overwrite_records(self):
+        path = os.path.join(self.root, 'shared.log')
+        first = teeLogger.MMapFileHandler(path, encoding='utf-8', extent_size=EXTENT)
+        second = teeLogger.MMapFileHandler(path, encoding='utf-8', extent_size=EXTENT)
+        for i in range(3000):
+            first.write_message(f'first {i}')
+            second.write_message(f'second {i}')
+        self.assertNotIsInstance(second.stream, _MMapStream)
+        first.close()
+        second.close()
+        with open(path, 'rb') as fh:
+            lines = [line for line in fh.read().decode().splitlines() if line]
+        self.assertEqual([line for line in lines if line.startswith('first ')], [f'first {i}' for i in range(3000)])
+        self.assertEqual([line for line in lines if line.startswith('second ')], [f'second {i}' for i in range(3000)])
+        self.assertEqual(len(lines), 6000)
+
+    def test_rejected_with_shared_log_files(self):
+        for options in ({'collapse_single_day_logs': True}, {'shared_writer': True}):
+            with self.subTest(**options):
+                tl = teeLogger(programName='mmap_shared', systemLogFileDir=self.root, suppressPrintout=True,
+                               mmap_extent_bytes=EXTENT, **options)
+                self.addCleanup(tl.close)
+                self.assertEqual(tl.mmap_extent_bytes, 0)
+                handler = tl.logHandler
+                while not isinstance(handler, teeLogger.BinFileHandler):
+                    handler = handler.target
+                self.assertNotIsInstance(handler, teeLogger.MMapFileHandler)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Tee_Logger import (_BINARY_RECORD_HEADER, _CallerFileLocation, _TeeBinaryFormatter, _TeeJsonFormatter,
+                        _iter_binary_records, query_logs, read_log_range, teeLogger)
+
+
+def _record(msg, **kwargs):
+    return logging.makeLogRecord({
+        'msg': msg, 'levelno': logging.WARNING, 'levelname': 'WARNING', 'created': 1700000000.123456,
+        'process': 42, 'threadName': 'worker-1',
+        'callerFileLocation': _CallerFileLocation('service_module.py', 77), **kwargs,
+    })
+
+
+class TestStructuredFormatters(unittest.TestCase):
+    def test_json_formatter_matches_json_dumps(self):
+        line = _TeeJsonFormatter().format(_record('table\n| a | "b" | ✓'))
+        self.assertNotIn('\n', line)
+        self.assertEqual(json.loads(line), {
+            'ts': 1700000000123456, 'level': 'WARNING', 'file': 'service_module.py', 'line': 77,
+            'pid': 42, 'thread': 'worker-1', 'msg': 'table\n| a | "b" | ✓',
+        })
+
+    def test_json_formatter_includes_exception(self):
+        try:
+            raise KeyError('missing')
+        except KeyError:
+            record = _record('failed', exc_info=sys.exc_info())
+        self.assertIn("KeyError: 'missing'", json.loads(_TeeJsonFormatter().format(record))['exc'])
+
+    def test_binary_round_trip_and_resync(self):
+        formatter = _TeeBinaryFormatter()
+        first = formatter.format_bytes(_record('first\nrecord'))
+        second = formatter.format_bytes(_record('second', levelno=logging.ERROR, levelname='ERROR'))
+        self.assertEqual(len(first), _BINARY_RECORD_HEADER.size + len('worker-1service_module.pyfirst\nrecord'))
+        records = list(_iter_binary_records([first[:10], first[10:] + b'garbage' + second]))
+        self.assertEqual([(r['msg'], r['level'], r['line'], r['pid']) for r in records],
+                         [('first\nrecord', 'WARNING', 77, 42), ('second', 'ERROR', 77, 42)])
+
+
+class TestStructuredLogs(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='tl_structured_')
+        self.addCleanup(shutil.rmtree, self.root, True)
+
+    def _write(self, name, **kwargs):
+        tl = teeLogger(programName=name, systemLogFileDir=self.root, suppressPrintout=True, **kwargs)
+        tl.info('plain record')
+        tl.printTable([['a', 'b'], ['1', '2']])
+        thread = threading.Thread(target=tl.error, args=('from thread',), name='side-thread')
+        thread.start()
+        thread.join()
+        tl.info_many(['batch one', 'batch two'])
+        tl.close()
+        return tl.logFileName
+
+    def test_formats_through_every_path(self):
+        for output_format in ('jsonl', 'binary'):
+            for options in ({}, {'fast_path': True}, {'in_place_compression': 'gzip', 'async_mode': True}):
+                with self.subTest(output_format=output_format, **options):
+                    name = f'structured_{output_format}_{len(os.listdir(self.root))}'
+                    path = self._write(name, output_format=output_format, **options)
+                    records = [json.loads(line) for line in read_log_range(path)]
+                    self.assertEqual([r['msg'] for r in records][1:], [
+                        'plain record', '\na | b\n--+--\n1 | 2\n', 'from thread', 'batch one', 'batch two',
+                    ])
+                    self.assertEqual(records[3]['thread'], 'side-thread')
+                    self.assertEqual(records[3]['level'], 'ERROR')
+                    self.assertEqual(records[1]['file'], 'test_output_format.py')
+                    self.assertTrue(all(r['pid'] == os.getpid() for r in records))
+                    errors = [json.loads(r) for r in query_logs(name, self.root, level='ERROR', max_workers=1)]
+                    self.assertEqual([r['msg'] for r in errors], ['from thread'])
+                    caller = list(query_logs(name, self.root, caller=r'^test_output_format\.py:', max_workers=1))
+                    self.assertEqual(len(caller), 5)
+
+    def test_invalid_format_falls_back_to_text(self):
+        tl = teeLogger(noLog=True, suppressPrintout=True, programName='structured_invalid',
+                       output_format='xml', disable_colors=True)
+        self.assertEqual(tl.output_format, 'text')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+import gzip
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+import Tee_Logger
+from Tee_Logger import compress_folder, query_logs
+
+
+def _line(day, hh, level, caller, msg):
+    return f'{day} {hh}:00:00,000 [{level:<8}] [{caller}] {msg}\n'
+
+
+class TestQueryLogs(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='tl_query_')
+        self.addCleanup(shutil.rmtree, self.root, True)
+        self.logsDir = os.path.join(self.root, 'app_log')
+        # archived day, gzip day with two files, plain day
+        self._day('2020-01-01', 'app_2020-01-01.log', open, [
+            _line('2020-01-01', '10', 'INFO', 'old_job:1', 'archived hello'),
+            _line('2020-01-01', '11', 'ERROR', 'old_job:2', 'archived failure'),
+        ])
+        compress_folder(os.path.join(self.logsDir, '2020-01-01'))
+        self._day('2020-01-02', 'app_2020-01-02.log.gz', gzip.open, [
+            _line('2020-01-02', '09', 'INFO', 'worker:10', 'gzip hello'),
+            _line('2020-01-02', '12', 'WARNING', 'worker:11', 'gzip table\n| a | b |\n| 1 | 2 |'),
+        ])
+        self._day('2020-01-02', 'app_2020-01-02_1.log.gz', gzip.open, [
+            _line('2020-01-02', '23', 'ERROR', 'main:5', 'gzip late failure'),
+        ])
+        self._day('2020-01-03', 'app_2020-01-03_08-00-00.log', open, [
+            _line('2020-01-03', '08', 'DEBUG', 'main:1', 'plain debug'),
+            _line('2020-01-03', '09', 'ERROR', 'worker:12', 'plain failure'),
+        ])
+        with open(os.path.join(self.logsDir, 'app_2020-01-03.log.idx'), 'w'):
+            pass
+
+    def _day(self, day, name, opener, lines):
+        folder = os.path.join(self.logsDir, day)
+        os.makedirs(folder, exist_ok=True)
+        with opener(os.path.join(folder, name), 'wt') as fh:
+            fh.write(''.join(lines))
+
+    def _messages(self, **kwargs):
+        return [record.split('] ', 2)[2] for record in query_logs('app', self.root, max_workers=1, **kwargs)]
+
+    def test_all_sources_in_day_order(self):
+        self.assertEqual(self._messages(), [
+            'archived hello', 'archived failure', 'gzip hello',
+            'gzip table\n| a | b |\n| 1 | 2 |', 'gzip late failure', 'plain debug', 'plain failure',
+        ])
+
+    def test_filters(self):
+        self.assertEqual(self._messages(level='ERROR'), ['archived failure', 'gzip late failure', 'plain failure'])
+        self.assertEqual(self._messages(caller=r'^worker'), ['gzip hello', 'gzip table\n| a | b |\n| 1 | 2 |', 'plain failure'])
+        self.assertEqual(self._messages(pattern=r'\| 1 \|'), ['gzip table\n| a | b |\n| 1 | 2 |'])
+        self.assertEqual(self._messages(start='2020-01-02 10:00', end='2020-01-03'),
+                         ['gzip table\n| a | b |\n| 1 | 2 |', 'gzip late failure', 'plain debug', 'plain failure'])
+
+    def test_parallel_matches_serial(self):
+        serial = list(query_logs('app', self.root, max_workers=1, level='warning'))
+        self.assertEqual(list(query_logs('app', self.root, max_workers=3, level='warning')), serial)
+
+    def test_archive_members_out_of_name_order(self):
+        # tar run on an unsorted directory listing stores files in any order
+        day = '2020-01-04'
+        self._day(day, 'app_2020-01-04_1.log.gz', gzip.open, [_line(day, '12', 'INFO', 'main:2', 'second file')])
+        self._day(day, 'app_2020-01-04.log', open, [_line(day, '10', 'INFO', 'main:1', 'first file')])
+        folder = os.path.join(self.logsDir, day)
+        with tarfile.open(folder + '.tar.xz', 'w:xz') as tar:
+            for name in ('app_2020-01-04_1.log.gz', 'app_2020-01-04.log'):
+                tar.add(os.path.join(folder, name), arcname=f'{day}/{name}')
+        shutil.rmtree(folder)
+        self.assertEqual(self._messages(start=day), ['first file', 'second file'])
+        self.assertEqual(list(query_logs('app', self.root, max_workers=2)),
+                         list(query_logs('app', self.root, max_workers=1)))
+
+    def test_size_rollover_parts_in_numeric_order(self):
+        day = '2020-01-05'
+        names = ['app_2020-01-05.log'] + [f'app_2020-01-05_{n}.log' for n in range(1, 12)]
+        for n, name in enumerate(names):
+            self._day(day, name, open, [_line(day, f'{n:02d}', 'INFO', 'main:1', f'part {n}')])
+        expected = [f'part {n}' for n in range(12)]
+        self.assertEqual(self._messages(start=day), expected)
+        with mock.patch.object(Tee_Logger.shutil, 'which', return_value=None):
+            self.assertTrue(compress_folder(os.path.join(self.logsDir, day)))
+        self.assertEqual(self._messages(start=day), expected)
+
+    @unittest.skipUnless(shutil.which('zstd') and shutil.which('tar'), 'zstd CLI not available')
+    def test_zstd_archive(self):
+        before = self._messages(start='2020-01-03')
+        self.assertTrue(compress_folder(os.path.join(self.logsDir, '2020-01-03'), archive_format='zst'))
+        self.assertEqual(self._messages(start='2020-01-03'), before)
+
+    def test_command_line(self):
+        output = subprocess.run(
+            [sys.executable, os.path.join(SRC_DIR, 'Tee_Logger.py'), 'query', 'app', '--dir', self.root,
+             '--level', 'ERROR', '--grep', 'failure', '--start', '2020-01-02'],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, check=True,
+        ).stdout
+        self.assertEqual([line.split('] ', 2)[2] for line in output.splitlines()], ['gzip late failure', 'plain failure'])
+
+
+if __name__ == '__main__':
+    unittest.main()
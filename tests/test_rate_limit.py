@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Tee_Logger import _CallSiteLimiter, teeLogger
+
+
+class TestCallSiteLimiter(unittest.TestCase):
+    def test_sampling_keeps_first_and_every_nth(self):
+        limiter = _CallSiteLimiter(sample_rate=0.25)
+        kept = [i for i in range(12) if limiter.allow(('a.py', 1), 20)]
+        self.assertEqual(kept, [0, 4, 8])
+        elapsed, sites = limiter.take_summaries(force=True)
+        self.assertEqual(sites, [(('a.py', 1), 9, 20)])
+
+    def test_token_bucket_refills(self):
+        limiter = _CallSiteLimiter(rate_limit=100, burst=5)
+        self.assertEqual(sum(limiter.allow(('a.py', 1), 20) for _ in range(20)), 5)
+        time.sleep(0.05)
+        self.assertGreaterEqual(sum(limiter.allow(('a.py', 1), 20) for _ in range(20)), 3)
+
+    def test_sites_are_independent(self):
+        limiter = _CallSiteLimiter(rate_limit=1)
+        self.assertTrue(limiter.allow(('a.py', 1), 20))
+        self.assertFalse(limiter.allow(('a.py', 1), 20))
+        self.assertTrue(limiter.allow(('a.py', 2), 20))
+        self.assertTrue(limiter.allow(('a.py', 1), 20, rate_limit=0))
+
+    def test_summaries_wait_for_interval(self):
+        limiter = _CallSiteLimiter(sample_rate=0.5, summary_interval_ms=60000)
+        for _ in range(4):
+            limiter.allow(('a.py', 1), 30)
+        self.assertIsNone(limiter.take_summaries())
+        self.assertEqual(limiter.take_summaries(force=True)[1], [(('a.py', 1), 2, 30)])
+        self.assertIsNone(limiter.take_summaries(force=True))
+
+
+class TestTeeLoggerLimits(unittest.TestCase):
+    def setUp(self):
+        self.logDir = tempfile.mkdtemp(prefix='tl_rate_limit_')
+        self.addCleanup(shutil.rmtree, self.logDir, True)
+
+    def _lines(self, tl):
+        with open(tl.logFileName) as fh:
+            return fh.read().splitlines()
+
+    def test_sampled_site_writes_summary_on_close(self):
+        for fast_path in (False, True):
+            with self.subTest(fast_path=fast_path):
+                tl = teeLogger(programName=f'rate_limit_sample_{fast_path}', systemLogFileDir=self.logDir,
+                               suppressPrintout=True, sample_rate=0.01, fast_path=fast_path)
+                log_at = sys._getframe().f_lineno + 2
+                for i in range(1000):
+                    tl.info(f'hot {i}')
+                tl.close()
+                lines = self._lines(tl)
+                self.assertEqual(len([line for line in lines if '] hot ' in line]), 10)
+                summary = [line for line in lines if 'suppressed by sampling' in line]
+                self.assertEqual(len(summary), 1)
+                self.assertIn('990 records', summary[0])
+                self.assertRegex(summary[0], r'in the last \d+\.\ds$')
+                self.assertIn(f':{log_at}', summary[0])
+
+    def test_per_call_override(self):
+        tl = teeLogger(programName='rate_limit_override', systemLogFileDir=self.logDir, suppressPrintout=True)
+        for i in range(50):
+            tl.info(f'limited {i}', rate_limit=1)
+            tl.info(f'free {i}')
+        tl.close()
+        lines = self._lines(tl)
+        self.assertEqual(len([line for line in lines if '] limited ' in line]), 1)
+        self.assertEqual(len([line for line in lines if '] free ' in line]), 50)
+        self.assertTrue(any('49 records' in line for line in lines))
+
+    def test_summary_written_after_interval(self):
+        tl = teeLogger(programName='rate_limit_interval', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       rate_limit=1, limit_summary_interval_ms=20)
+        for i in range(5):
+            tl.error(f'burst {i}')
+        time.sleep(0.05)
+        tl.error('later')
+        lines = self._lines(tl)
+        self.assertTrue(any('4 records' in line and '[ERROR   ]' in line for line in lines))
+        tl.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+import types
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import Tee_Logger
+from Tee_Logger import teeLogger
+
+
+class _Tomorrow(datetime.datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return datetime.datetime.now(tz) + datetime.timedelta(days=1)
+
+
+class TestRollover(unittest.TestCase):
+    def setUp(self):
+        self.logDir = tempfile.mkdtemp(prefix='tl_rollover_')
+        self.addCleanup(shutil.rmtree, self.logDir, True)
+
+    def test_rollover_at_is_next_midnight(self):
+        tl = teeLogger(programName='rollover_midnight', systemLogFileDir=self.logDir, suppressPrintout=True)
+        self.addCleanup(tl.close)
+        midnight = datetime.datetime.fromtimestamp(tl.logHandler.rollover_at)
+        self.assertEqual(midnight.time(), datetime.time.min)
+        self.assertEqual(midnight.date(), datetime.date.today() + datetime.timedelta(days=1))
+
+    def test_day_change_moves_to_new_folder(self):
+        tl = teeLogger(programName='rollover_day', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       in_place_compression='gzip', compressLogAfterMonths=0, deleteLogAfterYears=0)
+        self.addCleanup(tl.close)
+        firstLogFile = tl.logFileName
+        tl.info('before midnight')
+        tl.logHandler.rollover_at = time.time() - 1
+        fakeDatetime = types.SimpleNamespace(
+            datetime=_Tomorrow, date=datetime.date, timedelta=datetime.timedelta, time=datetime.time,
+        )
+        with mock.patch.object(Tee_Logger, 'datetime', fakeDatetime):
+            tl.info('after midnight')
+        tl.close()
+        tomorrow = (datetime.date.today() + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+        self.assertNotEqual(tl.logFileName, firstLogFile)
+        self.assertEqual(os.path.basename(tl.logFileDir), tomorrow)
+        self.assertEqual(os.path.basename(tl.logFileName), f'rollover_day_{tomorrow}.log.gz')
+        latest = os.path.join(tl.logsDir, 'rollover_day_latest.log.gz')
+        self.assertEqual(os.path.realpath(latest), os.path.realpath(tl.logFileName))
+        import gzip
+        with gzip.open(tl.logFileName, 'rt') as fh:
+            self.assertIn('after midnight', fh.read())
+        with gzip.open(firstLogFile, 'rt') as fh:
+            self.assertNotIn('after midnight', fh.read())
+
+    def test_size_rollover_creates_numbered_files(self):
+        tl = teeLogger(programName='rollover_size', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       collapse_single_day_logs=True, max_log_bytes=1000)
+        self.addCleanup(tl.close)
+        for i in range(50):
+            tl.info(f'line {i} ' + 'x' * 50)
+        tl.close()
+        files = sorted(os.listdir(tl.logFileDir))
+        self.assertGreater(len(files), 2)
+        contents = ''
+        for name in files:
+            with open(os.path.join(tl.logFileDir, name)) as fh:
+                contents += fh.read()
+        for i in range(50):
+            self.assertIn(f'line {i} ', contents)
+        self.assertTrue(os.path.basename(tl.logFileName).startswith('rollover_size_'))
+
+    def test_failing_callback_keeps_record_and_retries_later(self):
+        path = os.path.join(self.logDir, 'failing.log')
+        handler = teeLogger.BinFileHandler(path, mode='ab', encoding='utf-8')
+        self.addCleanup(handler.close)
+        calls = []
+
+        def callback(h):
+            calls.append(h.baseFilename)
+            raise OSError('disk full')
+
+        handler.rollover_callback = callback
+        handler.rollover_at = time.time() - 1
+        for i in range(3):
+            handler.write_message(f'record {i}')
+        self.assertEqual(len(calls), 1)
+        with open(path) as fh:
+            self.assertEqual(fh.read().splitlines(), ['record 0', 'record 1', 'record 2'])
+        handler._rollover_retry_at = time.time() - 1
+        handler.rollover_callback = lambda h: os.path.join(self.logDir, 'next.log')
+        handler.write_message('after retry')
+        with open(os.path.join(self.logDir, 'next.log')) as fh:
+            self.assertEqual(fh.read(), 'after retry\n')
+
+    def test_size_limit_counts_appended_file(self):
+        tl = teeLogger(programName='rollover_append', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       collapse_single_day_logs=True, max_log_bytes=1000)
+        for i in range(8):
+            tl.info(f'first run {i} ' + 'x' * 50)
+        tl.close()
+        firstFile = tl.logFileName
+        tl = teeLogger(programName='rollover_append', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       collapse_single_day_logs=True, max_log_bytes=1000)
+        self.addCleanup(tl.close)
+        self.assertEqual(tl.logFileName, firstFile)
+        for i in range(8):
+            tl.info(f'second run {i} ' + 'x' * 50)
+        tl.close()
+        self.assertNotEqual(tl.logFileName, firstFile)
+        self.assertLess(os.path.getsize(firstFile), 1000 + 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
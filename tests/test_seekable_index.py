@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import Tee_Logger
+from Tee_Logger import _CallerFileLocation, read_log_range, teeLogger
+
+# after the start-up record every teeLogger writes, on a whole second
+BASE = float(int(time.time()) + 100000)
+
+
+class TestSeekableIndex(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='tl_index_')
+        self.addCleanup(shutil.rmtree, self.root, True)
+
+    def _write(self, compression, count=1000, first=0, **kwargs):
+        tl = teeLogger(programName=f'index_{compression}', systemLogFileDir=self.root, suppressPrintout=True,
+                       in_place_compression=compression, **kwargs)
+        handler = tl.logHandler
+        for i in range(first, first + count):
+            msg = f'record {i}' + ('\ncontinuation of record 305' if i == 305 else '')
+            record = logging.makeLogRecord({
+                'msg': msg, 'levelno': logging.INFO, 'levelname': 'INFO',
+                'created': BASE + i, 'msecs': 0.0,
+                'callerFileLocation': _CallerFileLocation('index_test.py', i),
+            })
+            handler.handle(record)
+        tl.close()
+        return tl.logFileName
+
+    def test_range_read_decodes_only_covering_frames(self):
+        for compression in ('gzip', 'bz2', 'xz'):
+            with self.subTest(compression=compression):
+                path = self._write(compression, seekable_index=True, frame_every_n_records=50)
+                with open(path + '.idx') as fh:
+                    index = [line.split('\t') for line in fh.read().splitlines()]
+                self.assertGreater(len(index), 19)
+                self.assertEqual(index[0][0], '0')
+                calls = []
+                real_iter = Tee_Logger._iter_frame_data
+
+                def spy(fh, make_decompressor, stop=None, **kwargs):
+                    calls.append((fh.tell(), stop))
+                    return real_iter(fh, make_decompressor, stop=stop, **kwargs)
+
+                with mock.patch.object(Tee_Logger, '_iter_frame_data', spy):
+                    lines = list(read_log_range(path, BASE + 300, BASE + 310))
+                self.assertEqual(lines[0].rsplit(' ', 2)[1:], ['record', '300'])
+                self.assertEqual(lines[-1].rsplit(' ', 2)[1:], ['record', '310'])
+                self.assertIn('continuation of record 305', lines)
+                self.assertEqual(len(lines), 12)
+                start, stop = calls[0]
+                self.assertGreater(start, 0)
+                self.assertLess(stop, os.path.getsize(path))
+
+    def test_default_frames_and_open_ended_ranges(self):
+        path = self._write('gzip', seekable_index=True)
+        lines = list(read_log_range(path, start=BASE + 995))
+        self.assertEqual([line.rsplit(' ', 1)[1] for line in lines], ['995', '996', '997', '998', '999'])
+        self.assertEqual(len(list(read_log_range(path))), 1000 + 2)
+
+    def test_truncated_tail_and_unindexed_files(self):
+        path = self._write('gzip', seekable_index=True, frame_every_n_records=100)
+        with open(path, 'r+b') as fh:
+            fh.truncate(os.path.getsize(path) - 5)
+        lines = list(read_log_range(path, BASE + 850))
+        # the damaged last frame is decoded as far as it goes
+        numbers = [int(line.rsplit(' ', 1)[1]) for line in lines]
+        self.assertEqual(numbers, list(range(850, 850 + len(numbers))))
+        self.assertGreaterEqual(numbers[-1], 899)
+        plain = self._write(None, count=20)
+        self.assertEqual(len(list(read_log_range(plain, BASE + 5, BASE + 9))), 5)
+
+    def test_index_started_on_existing_file(self):
+        # a day file first written without an index, then appended to with one
+        path = self._write('gzip', count=5, first=0)
+        self.assertFalse(os.path.exists(path + '.idx'))
+        self.assertEqual(self._write('gzip', count=20, first=5, seekable_index=True, frame_every_n_records=5), path)
+        self.assertTrue(os.path.exists(path + '.idx'))
+        numbers = [int(line.rsplit(' ', 1)[1]) for line in read_log_range(path) if ' record ' in line]
+        self.assertEqual(numbers, list(range(25)))
+        self.assertEqual(sum('Starting' in line for line in read_log_range(path)), 2)
+        numbers = [int(line.rsplit(' ', 1)[1]) for line in read_log_range(path, BASE + 15, BASE + 17)]
+        self.assertEqual(numbers, [15, 16, 17])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+import gzip
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import zlib
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+from Tee_Logger import read_log_range, teeLogger
+
+WORKER = '''
+import sys
+sys.path.insert(0, sys.argv[1])
+from Tee_Logger import teeLogger
+tl = teeLogger(programName='shared_writer', systemLogFileDir=sys.argv[2], suppressPrintout=True,
+               in_place_compression='gzip', shared_writer=True, fast_path=sys.argv[3] in ('2', '3'),
+               output_format=sys.argv[4] if len(sys.argv) > 4 else 'text')
+assert not tl.logHandler.isOwner
+for i in range(300):
+    tl.info(f'worker {sys.argv[3]} line {i} ' + 'x' * 200)
+tl.close()
+'''
+
+
+@unittest.skipUnless(teeLogger.SharedWriterHandler.available(), 'needs Unix domain sockets')
+class TestSharedWriter(unittest.TestCase):
+    def setUp(self):
+        self.logDir = tempfile.mkdtemp(prefix='tl_shared_')
+        self.addCleanup(shutil.rmtree, self.logDir, True)
+
+    def test_workers_funnel_into_one_gzip_stream(self):
+        tl = teeLogger(programName='shared_writer', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       in_place_compression='gzip', shared_writer=True)
+        self.assertTrue(tl.logHandler.isOwner)
+        workers = [
+            subprocess.Popen([sys.executable, '-c', WORKER, SRC_DIR, self.logDir, str(w)])
+            for w in range(4)
+        ]
+        for worker in workers:
+            self.assertEqual(worker.wait(timeout=60), 0)
+        tl.close()
+        with open(tl.logFileName, 'rb') as fh:
+            raw = fh.read()
+        decompressor = zlib.decompressobj(wbits=31)
+        decompressor.decompress(raw)
+        self.assertEqual(decompressor.unused_data, b'')
+        lines = gzip.decompress(raw).decode().splitlines()
+        for w in range(4):
+            worker_lines = [line for line in lines if f'worker {w} line ' in line]
+            self.assertEqual(len(worker_lines), 300)
+            self.assertTrue(all(line.endswith('x' * 200) for line in worker_lines))
+
+    def test_binary_records_from_workers(self):
+        tl = teeLogger(programName='shared_writer', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       in_place_compression='gzip', shared_writer=True, output_format='binary')
+        workers = [
+            subprocess.Popen([sys.executable, '-c', WORKER, SRC_DIR, self.logDir, str(w), 'binary'])
+            for w in range(1, 3)
+        ]
+        for worker in workers:
+            self.assertEqual(worker.wait(timeout=60), 0)
+        tl.close()
+        records = [json.loads(line) for line in read_log_range(tl.logFileName)]
+        for w, worker in zip(range(1, 3), workers):
+            worker_records = [r for r in records if r['msg'].startswith(f'worker {w} line ')]
+            self.assertEqual(len(worker_records), 300)
+            self.assertEqual({r['pid'] for r in worker_records}, {worker.pid})
+
+    def test_client_takes_over_after_owner_closes(self):
+        path = os.path.join(self.logDir, 'takeover.log')
+        paths = (os.path.join(self.logDir, 'w.sock'), os.path.join(self.logDir, 'w.lock'))
+        first = teeLogger.SharedWriterHandler(teeLogger.BinFileHandler(path, mode='ab', encoding='utf-8', delay=True), *paths)
+        second = teeLogger.SharedWriterHandler(teeLogger.BinFileHandler(path, mode='ab', encoding='utf-8', delay=True), *paths)
+        self.assertTrue(first.isOwner)
+        self.assertFalse(second.isOwner)
+        second.handle(logging.makeLogRecord({'msg': 'via owner', 'levelno': logging.INFO}))
+        first.close()
+        second.handle(logging.makeLogRecord({'msg': 'after takeover', 'levelno': logging.INFO}))
+        self.assertTrue(second.isOwner)
+        second.close()
+        with open(path) as fh:
+            self.assertEqual(fh.read(), 'via owner\nafter takeover\n')
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs os.fork')
+    def test_forked_child_exiting_without_logging(self):
+        for name, options in (('plain', {}), ('dedup', {'dedup_window': 4}),
+                              ('async', {'async_mode': True, 'dedup_window': 4})):
+            with self.subTest(name):
+                tl = teeLogger(programName=f'shared_fork_{name}', systemLogFileDir=self.logDir,
+                               suppressPrintout=True, in_place_compression='gzip', shared_writer=True, **options)
+                for i in range(100):
+                    tl.info(f'before fork {i}')
+                pid = os.fork()
+                if pid == 0:
+                    # what logging.shutdown does at the end of a worker that never logged
+                    try:
+                        tl.close()
+                    finally:
+                        os._exit(0)
+                self.assertEqual(os.waitpid(pid, 0)[1], 0)
+                shared = tl.logHandler
+                while not isinstance(shared, teeLogger.SharedWriterHandler):
+                    shared = shared.target
+                self.assertTrue(os.path.exists(shared.socketPath))
+                for i in range(100):
+                    tl.info(f'after fork {i}')
+                tl.close()
+                with gzip.open(tl.logFileName, 'rt') as fh:
+                    lines = fh.read().splitlines()
+                self.assertEqual(len([line for line in lines if 'before fork' in line]), 100)
+                self.assertEqual(len([line for line in lines if 'after fork' in line]), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
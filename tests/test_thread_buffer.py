@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Tee_Logger import teeLogger
+
+
+class TestThreadBuffer(unittest.TestCase):
+    def setUp(self):
+        self.logDir = tempfile.mkdtemp(prefix='tl_thread_buffer_')
+        self.addCleanup(shutil.rmtree, self.logDir, True)
+
+    def _log_from_threads(self, tl, threads=8, records=500):
+        def worker(n):
+            for i in range(records):
+                tl.info(f'thread {n} record {i}')
+
+        workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+
+    def test_threads_keep_their_order_in_compressed_log(self):
+        for fast_path in (False, True):
+            with self.subTest(fast_path=fast_path):
+                tl = teeLogger(programName=f'thread_buffer_gzip_{fast_path}', systemLogFileDir=self.logDir,
+                               suppressPrintout=True, in_place_compression='gzip',
+                               thread_buffer_records=64, fast_path=fast_path)
+                self.assertIsInstance(tl.logHandler, teeLogger.ThreadBufferHandler)
+                self._log_from_threads(tl)
+                tl.close()
+                with gzip.open(tl.logFileName, 'rt') as fh:
+                    lines = fh.read().splitlines()
+                self.assertEqual(len(lines), 8 * 500 + 1)
+                for n in range(8):
+                    numbers = [int(line.rsplit(' ', 1)[1]) for line in lines if f'] thread {n} record ' in line]
+                    self.assertEqual(numbers, list(range(500)))
+
+    def test_error_writes_other_threads_buffers(self):
+        tl = teeLogger(programName='thread_buffer_error', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       thread_buffer_records=1000, flush_interval_ms=60000)
+        self._log_from_threads(tl, threads=4, records=10)
+        tl.error('after the workers')
+        tl.logHandler.queue.join()
+        with open(tl.logFileName) as fh:
+            lines = fh.read().splitlines()
+        self.assertEqual(len(lines), 4 * 10 + 2)
+        self.assertTrue(lines[-1].endswith('after the workers'))
+        tl.close()
+
+    def test_idle_buffers_are_written_after_interval(self):
+        tl = teeLogger(programName='thread_buffer_idle', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       thread_buffer_records=1000, flush_interval_ms=20)
+        tl.info('idle record')
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            with open(tl.logFileName) as fh:
+                if 'idle record' in fh.read():
+                    break
+            time.sleep(0.01)
+        else:
+            self.fail('buffered record was not written')
+        tl.close()
+
+    def test_shared_writer_disables_thread_buffer(self):
+        tl = teeLogger(programName='thread_buffer_shared', systemLogFileDir=self.logDir, suppressPrintout=True,
+                       thread_buffer_records=64, shared_writer=True)
+        self.assertEqual(tl.thread_buffer_records, 0)
+        self.assertNotIsInstance(tl.logHandler, teeLogger.ThreadBufferHandler)
+        tl.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from Tee_Logger import _import_zstd, read_log_range, teeLogger, train_zstd_dictionary
+
+HAVE_ZSTD = _import_zstd() is not None
+
+
+class TestZstdDictionary(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix='tl_zdict_')
+        self.addCleanup(shutil.rmtree, self.root, True)
+        self.logsDir = os.path.join(self.root, 'app_log')
+        folder = os.path.join(self.logsDir, '2020-01-01')
+        os.makedirs(folder)
+        with open(os.path.join(folder, 'app_2020-01-01.log'), 'w', encoding='utf-8') as fh:
+            for i in range(2000):
+                fh.write(f'2020-01-01 10:{i // 60 % 60:02d}:{i % 60:02d},000 [INFO    ] [worker.py:{i % 40}] '
+                         f'request {i} served in {i % 97} ms status={200 + i % 3}\n')
+
+    @unittest.skipIf(HAVE_ZSTD, 'compression.zstd is available')
+    def test_train_needs_zstd(self):
+        with self.assertRaises(RuntimeError):
+            train_zstd_dictionary('app', self.root)
+
+    @unittest.skipUnless(HAVE_ZSTD, 'compression.zstd is not available')
+    def test_train_saves_dictionary_in_log_tree(self):
+        path = train_zstd_dictionary('app', self.root, dict_size=4096)
+        self.assertEqual(os.path.dirname(path), self.logsDir)
+        self.assertRegex(os.path.basename(path), r'^app_\d+\.zdict$')
+        self.assertLessEqual(os.path.getsize(path), 4096)
+
+    @unittest.skipUnless(HAVE_ZSTD, 'compression.zstd is not available')
+    def test_train_without_logs(self):
+        with self.assertRaises(ValueError):
+            train_zstd_dictionary('missing', self.root)
+
+    @unittest.skipUnless(HAVE_ZSTD, 'compression.zstd is not available')
+    def test_round_trip_with_dictionary(self):
+        from compression import zstd
+        dictPath = train_zstd_dictionary('app', self.root, dict_size=4096)
+        with open(dictPath, 'rb') as fh:
+            zstdDict = zstd.ZstdDict(fh.read())
+        logPath = os.path.join(self.logsDir, '2020-01-02', 'app_2020-01-02.log.zst')
+        os.makedirs(os.path.dirname(logPath))
+        handler = teeLogger.ZSTDFileHandler(logPath, mode='ab', encoding='utf-8')
+        handler.zstd_dict = zstdDict
+        handler.set_frame_policy(frame_every_n_records=10)
+        lines = [f'2020-01-02 10:00:{i % 60:02d},000 [INFO    ] [worker.py:{i}] request {i}' for i in range(50)]
+        for line in lines:
+            handler.write_message(line)
+        handler.close()
+        with open(logPath + '.dictid', encoding='utf-8') as fh:
+            self.assertEqual(fh.read().split(), [str(zstdDict.dict_id)])
+        self.assertEqual(list(read_log_range(logPath)), lines)
+        # a frame cannot be read without the dictionary it was written with
+        os.remove(dictPath)
+        with self.assertRaises(RuntimeError):
+            list(read_log_range(logPath))
+
+    @unittest.skipUnless(HAVE_ZSTD, 'compression.zstd is not available')
+    def test_teelogger_loads_newest_dictionary(self):
+        dictPath = train_zstd_dictionary('app', self.root, dict_size=4096)
+        tl = teeLogger(programName='app', systemLogFileDir=self.root, suppressPrintout=True,
+                       in_place_compression='zstd', zstd_dictionary=True)
+        self.addCleanup(tl.close)
+        handler = next(h for h in tl.logger.handlers if isinstance(h, teeLogger.ZSTDFileHandler))
+        self.assertEqual(handler.zstd_dict.dict_id, int(os.path.basename(dictPath)[4:-6]))
+
+
+if __name__ == '__main__':
+    unittest.main()